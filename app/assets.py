@@ -0,0 +1,153 @@
+"""
+Statische Dateien aus static/ mit Fingerabdruck und vorkomprimiert.
+
+Beim Start wird jede Datei einmal gelesen, per SHA-256 gehasht und (falls
+komprimierbar) als gzip und brotli vorkomprimiert. Jede Datei ist danach
+zusätzlich unter einem Namen mit Fingerabdruck erreichbar, z.B.
+js/script.3f2a9c1d0b7e.js; diese Antworten ändern sich nie und werden mit
+Cache-Control: immutable ausgeliefert. In den HTML-Seiten werden lokale
+src-/href-Verweise auf diese Namen umgeschrieben.
+
+Ausgeliefert wird direkt aus der Tabelle im Speicher, ohne Zugriff auf
+das Dateisystem. Dateien, die erst nach dem Start hinzukommen, liefert
+die aufrufende Route wie bisher über send_from_directory aus.
+
+HELPTOOL_ASSET_PIPELINE=0 schaltet die Tabelle ab (z.B. während der
+Entwicklung am Frontend, da Änderungen sonst erst nach einem Neustart
+sichtbar werden).
+"""
+import os
+import re
+import hashlib
+import mimetypes
+import posixpath
+from typing import Dict, Optional
+
+from flask import Response, request
+
+import compression
+
+HTML_PAGES = ('index.html', 'telefonbuch.html', 'netzwerk.html', 'kalender.html')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+_REFERENCE = re.compile(r'''(\b(?:src|href)\s*=\s*)(["'])([^"'#?]+)\2''', re.IGNORECASE)
+
+
+class Asset:
+    """Inhalt einer Datei samt vorkomprimierten Varianten."""
+
+    __slots__ = ('body', 'mimetype', 'etag', 'variants', 'immutable')
+
+    def __init__(self, body: bytes, mimetype: str, immutable: bool = False):
+        self.body = body
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants: Dict[str, bytes] = {}
+        self.immutable = immutable
+        if compression.compressible(mimetype) and len(body) >= compression.DEFAULT_MIN_SIZE:
+            for encoding in compression.ENCODINGS:
+                level = 11 if encoding == 'br' else 9
+                compressed = compression.compress(body, encoding, level)
+                if len(compressed) < len(body):
+                    self.variants[encoding] = compressed
+
+    def fingerprinted(self) -> 'Asset':
+        twin = Asset.__new__(Asset)
+        twin.body, twin.mimetype, twin.etag = self.body, self.mimetype, self.etag
+        twin.variants, twin.immutable = self.variants, True
+        return twin
+
+
+def _fingerprint_name(path: str, etag: str) -> str:
+    stem, ext = posixpath.splitext(path)
+    return f"{stem}.{etag[:12]}{ext}"
+
+
+def _mimetype(path: str) -> str:
+    if path.endswith('.js'):
+        return 'application/javascript'
+    return mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+class AssetTable:
+    """Alle Dateien unter static_dir, adressiert über ihren relativen Pfad."""
+
+    def __init__(self, static_dir: str, pages=HTML_PAGES):
+        self.static_dir = static_dir
+        self.assets: Dict[str, Asset] = {}
+        self.fingerprints: Dict[str, str] = {}
+        self.enabled = os.environ.get('HELPTOOL_ASSET_PIPELINE', '1').lower() not in ('0', 'false', 'no')
+        if self.enabled:
+            self.build(pages)
+
+    def build(self, pages=HTML_PAGES):
+        assets: Dict[str, Asset] = {}
+        fingerprints: Dict[str, str] = {}
+        for root, _dirs, files in os.walk(self.static_dir):
+            for filename in files:
+                full = os.path.join(root, filename)
+                path = os.path.relpath(full, self.static_dir).replace(os.sep, '/')
+                if path in pages:
+                    continue
+                with open(full, 'rb') as f:
+                    asset = Asset(f.read(), _mimetype(path))
+                assets[path] = asset
+                fingerprints[path] = _fingerprint_name(path, asset.etag)
+                assets[fingerprints[path]] = asset.fingerprinted()
+
+        for page in pages:
+            full = os.path.join(self.static_dir, page)
+            try:
+                with open(full, 'r', encoding='utf-8') as f:
+                    html = f.read()
+            except FileNotFoundError:
+                continue
+            html = self._rewrite(page, html, fingerprints)
+            assets[page] = Asset(html.encode('utf-8'), 'text/html')
+
+        self.assets, self.fingerprints = assets, fingerprints
+
+    @staticmethod
+    def _rewrite(page: str, html: str, fingerprints: Dict[str, str]) -> str:
+        """Ersetzt lokale Verweise durch Namen mit Fingerabdruck (relativ wie im Original)."""
+        base = posixpath.dirname(page)
+
+        def replace(match):
+            url = match.group(3)
+            if re.match(r'^(?:[a-z]+:|//|/api/)', url, re.IGNORECASE):
+                return match.group(0)
+            target = posixpath.normpath(posixpath.join(base, url.lstrip('/')))
+            fingerprint = fingerprints.get(target)
+            if fingerprint is None:
+                return match.group(0)
+            new_url = posixpath.relpath(fingerprint, base or '.')
+            if url.startswith('/'):
+                new_url = '/' + fingerprint
+            return f"{match.group(1)}{match.group(2)}{new_url}{match.group(2)}"
+
+        return _REFERENCE.sub(replace, html)
+
+    def url_for(self, path: str) -> str:
+        """Name mit Fingerabdruck zu einem Pfad (oder der Pfad selbst)."""
+        return self.fingerprints.get(path, path)
+
+    def response(self, path: str) -> Optional[Response]:
+        """Antwort aus der Tabelle oder None, wenn die Datei dort nicht liegt."""
+        asset = self.assets.get(path) if self.enabled else None
+        if asset is None:
+            return None
+
+        encoding = request.accept_encodings.best_match(tuple(asset.variants)) if asset.variants else None
+        tag = f"{asset.etag}-{encoding}" if encoding else asset.etag
+        headers = {'Cache-Control': IMMUTABLE if asset.immutable else 'no-cache'}
+        if asset.variants:
+            headers['Vary'] = 'Accept-Encoding'
+        if request.if_none_match.contains(tag):
+            response = Response(status=304, headers=headers)
+        else:
+            response = Response(asset.variants[encoding] if encoding else asset.body,
+                                mimetype=asset.mimetype, headers=headers)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(tag)
+        return response
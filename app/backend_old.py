@@ -32,6 +32,15 @@ for path in [LIB_DIR, OFFLINE_LIB_DIR]:
     if os.path.exists(path) and path not in sys.path:
         sys.path.insert(0, path)
 
+# Geschwister-Module (storage, ...) auch beim Start als Skript importierbar machen
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import netscan
+import prober
+import storage
+from resolver import Resolver
+from ttlcache import TTLCache
+from usage_journal import UsageJournal
+
 # Create fake _strptime module for pylance static analysis
 if not os.path.exists(os.path.join(BASE_DIR, '_strptime.py')):
     with open(os.path.join(BASE_DIR, '_strptime.py'), 'w') as f:
@@ -102,7 +111,7 @@ except Exception:
 # Flask import with fallback
 OFFLINE_MODE = False
 try:
-    from flask import Flask, jsonify, request, send_from_directory, send_file, abort
+    from flask import Flask, Response, jsonify, request, send_from_directory, send_file, abort
     from werkzeug.utils import secure_filename
     from flask_cors import CORS  # type: ignore
     print("Flask erfolgreich importiert.")
@@ -163,35 +172,24 @@ os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
 os.makedirs(SHORTCUTS_DIR, exist_ok=True)
 os.makedirs(WORKSPACES_BASE_DIR, exist_ok=True)
+storage.configure(DATA_DIR)
+
+# Tool-Nutzung als Append-only-Journal (ersetzt tool_usage_log.json)
+usage_log = UsageJournal(
+    os.path.join(DATA_DIR, 'tool_usage_journal'),
+    legacy_file=os.path.join(DATA_DIR, 'tool_usage_log.json'),
+)
 
 # Logge die Tool-Nutzung
 def log_tool_usage(tool):
-    """Protokolliert die Nutzung eines Tools in der Log-Datei."""
-    log_file = os.path.join(DATA_DIR, 'tool_usage_log.json')
-    
+    """Protokolliert die Nutzung eines Tools im Nutzungs-Journal."""
     try:
-        # Lade existierende Log-Einträge
-        entries = []
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    entries = json.load(f)
-            except json.JSONDecodeError:
-                # Wenn die JSON-Datei beschädigt ist, starte mit einer leeren Liste
-                entries = []
-        
-        # Füge neuen Eintrag hinzu
-        entries.append({
+        usage_log.append({
             "timestamp": get_timestamp_iso(),
             "tool_id": tool.get('id'),
             "tool_name": tool.get('name', 'Unbekanntes Tool'),
             "tool_path": tool.get('path', '')
         })
-        
-        # Speichere aktualisierte Log-Einträge (maximal die letzten 1000 Einträge)
-        with open(log_file, 'w', encoding='utf-8') as f:
-            json.dump(entries[-1000:], f, ensure_ascii=False, indent=2)
-            
     except Exception as e:
         print(f"Fehler beim Loggen der Tool-Nutzung: {e}")
 
@@ -274,20 +272,20 @@ TOOL_NAME={shortcut_name}
 
 # Hilfsfunktionen für Dateizugriff
 def load_json(name):
-    """Lädt oder initialisiert ein JSON-Modul."""
-    path = os.path.join(DATA_DIR, f"{name}.json")
+    """Lädt oder initialisiert ein JSON-Modul (über den Sammlungs-Cache)."""
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        return storage.load(name)
+    except FileNotFoundError:
         save_json(name, [])
         return []
+    except json.JSONDecodeError as e:
+        # Beschädigte Dateien nicht mit [] überschreiben
+        print(f"Warnung: {name}.json ist beschädigt: {e}")
+        return []
 
 def save_json(name, data):
     """Speichert ein Python-Objekt als JSON."""
-    path = os.path.join(DATA_DIR, f"{name}.json")
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    storage.save(name, data)
 
 # Offline-Modus: Minimalserver bei Flask-Import-Fehler
 if OFFLINE_MODE:
@@ -633,16 +631,16 @@ if OFFLINE_MODE:
                             item_id = int(parts[3])  # Konvertiere immer zu int 
                             
                             if method == 'DELETE':
-                                items = load_json(module)
-                                idx = next((i for i, it in enumerate(items) if it.get('id') == item_id), None)
-                                if idx is not None:
-                                    items.pop(idx)
-                                    save_json(module, items)
-                                    response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
-                                    response += json.dumps({"success": True}).encode()
-                                    client_conn.sendall(response)
-                                    client_conn.close()
-                                    continue
+                                with storage.transaction(module) as items:
+                                    idx = next((i for i, it in enumerate(items) if it.get('id') == item_id), None)
+                                    if idx is not None:
+                                        items.pop(idx)
+                                        save_json(module, items)
+                                        response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
+                                        response += json.dumps({"success": True}).encode()
+                                        client_conn.sendall(response)
+                                        client_conn.close()
+                                        continue
                             
                             elif method == 'PUT' and b'Content-Length:' in request:
                                 # Bodydaten extrahieren
@@ -673,39 +671,38 @@ if OFFLINE_MODE:
                                         client_conn.close()
                                         continue
                                     
-                                    items = load_json(module)
-                                    
-                                    # Ausführliches Logging
-                                    print(f"PUT {module}/{item_id}: Aktualisiere Eintrag mit: {json.dumps(updated_item)}")
-                                    
-                                    # Immer die numerische ID verwenden
-                                    idx = next((i for i, it in enumerate(items) if it.get('id') == item_id), None)
-                                    if idx is None:
-                                        response = "HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n\r\n".encode()
-                                        response += json.dumps({"error": f"Eintrag mit ID {item_id} nicht gefunden"}).encode()
+                                    with storage.transaction(module) as items:
+                                        # Ausführliches Logging
+                                        print(f"PUT {module}/{item_id}: Aktualisiere Eintrag mit: {json.dumps(updated_item)}")
+
+                                        # Immer die numerische ID verwenden
+                                        idx = next((i for i, it in enumerate(items) if it.get('id') == item_id), None)
+                                        if idx is None:
+                                            response = "HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n\r\n".encode()
+                                            response += json.dumps({"error": f"Eintrag mit ID {item_id} nicht gefunden"}).encode()
+                                            client_conn.sendall(response)
+                                            client_conn.close()
+                                            continue
+
+                                        # ID beibehalten
+                                        updated_item['id'] = item_id
+
+                                        # Debugging-Ausgabe vor dem Update
+                                        print(f"Aktualisiere {module}/{item_id}: Altes Element: {json.dumps(items[idx])}")
+                                        print(f"Aktualisiere {module}/{item_id}: Neues Element: {json.dumps(updated_item)}")
+
+                                        # Aktualisiere das Element
+                                        items[idx] = updated_item
+                                        save_json(module, items)
+
+                                        # Erfolgsmeldung
+                                        print(f"PUT {module}/{item_id}: Eintrag erfolgreich aktualisiert")
+
+                                        response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
+                                        response += json.dumps(updated_item).encode()
                                         client_conn.sendall(response)
                                         client_conn.close()
                                         continue
-                                    
-                                    # ID beibehalten
-                                    updated_item['id'] = item_id
-                                    
-                                    # Debugging-Ausgabe vor dem Update
-                                    print(f"Aktualisiere {module}/{item_id}: Altes Element: {json.dumps(items[idx])}")
-                                    print(f"Aktualisiere {module}/{item_id}: Neues Element: {json.dumps(updated_item)}")
-                                    
-                                    # Aktualisiere das Element
-                                    items[idx] = updated_item
-                                    save_json(module, items)
-                                    
-                                    # Erfolgsmeldung
-                                    print(f"PUT {module}/{item_id}: Eintrag erfolgreich aktualisiert")
-                                    
-                                    response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
-                                    response += json.dumps(updated_item).encode()
-                                    client_conn.sendall(response)
-                                    client_conn.close()
-                                    continue
                                 except Exception as e:
                                     error_msg = f"Fehler bei PUT-Anfrage für {module}/{item_id}: {str(e)}"
                                     print(error_msg)
@@ -721,15 +718,12 @@ if OFFLINE_MODE:
                         
                         # GET und POST für Listen
                         if method == 'GET':
-                            json_path = os.path.join(DATA_DIR, f"{module}.json")
                             content_type = 'application/json'
                             
                             try:
-                                if os.path.exists(json_path):
-                                    with open(json_path, 'rb') as f:
-                                        content = f.read()
-                                else:
-                                    content = b"[]"  # Leeres JSON-Array zurückgeben
+                                # Über storage lesen: Dateiformat (records) und SQLite-Engine werden berücksichtigt
+                                with storage.reading(module) as items:
+                                    content = json.dumps(items, ensure_ascii=False).encode('utf-8')
                                     
                                 response = f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n\r\n".encode()
                                 response += content
@@ -748,70 +742,60 @@ if OFFLINE_MODE:
                             try:
                                 # JSON-Body deserialisieren
                                 new_item = json.loads(body_data)
-                                items = load_json(module)
-                                
-                                # Ausführliches Logging
-                                print(f"POST {module}: Neuer Eintrag wird erstellt: {json.dumps(new_item)}")
-                                
-                                # Wenn es sich um Tools handelt, prüfe auf Duplikate basierend auf dem Pfad
-                                if module == 'tools' and 'path' in new_item:
-                                    # Prüfe, ob bereits ein Tool mit diesem Pfad existiert
-                                    existing_tool = next((t for t in items if t.get('path') == new_item.get('path')), None)
-                                    if existing_tool:
-                                        print(f"POST tools: Tool mit Pfad {new_item.get('path')} existiert bereits mit ID {existing_tool.get('id')}")
-                                        
-                                        # Aktualisiere das bestehende Tool anstatt ein neues zu erstellen
-                                        for key, value in new_item.items():
-                                            if key != 'id':  # ID nicht überschreiben
-                                                existing_tool[key] = value
-                                        
-                                        # Speichere die aktualisierte Liste
-                                        save_json(module, items)
-                                        
-                                        response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
-                                        response += json.dumps(existing_tool).encode()
-                                        client_conn.sendall(response)
-                                        client_conn.close()
-                                        continue
-                                
-                                # Generiere eine eindeutige ID für das neue Element
-                                if module == 'tools':
-                                    # Stelle sicher, dass wir lückenlose IDs haben (1, 2, 3, ...)
-                                    existing_ids = [item.get('id', 0) for item in items if isinstance(item.get('id'), (int, float))]
-                                    next_id = 1
-                                    while next_id in existing_ids:
-                                        next_id += 1
-                                    new_item['id'] = next_id
-                                else:
-                                    # Für andere Module verwenden wir die bestehende Methode
-                                    new_item['id'] = max((i.get('id', 0) for i in items), default=0) + 1
-                                
-                                # Timestamps hinzufügen
-                                if 'created_at' not in new_item:
-                                    new_item['created_at'] = get_timestamp_iso()
-                                
-                                # Standardwerte für Tools setzen
-                                if module == 'tools':
-                                    if 'admin' not in new_item:
-                                        new_item['admin'] = False
-                                    if 'autostart' not in new_item:
-                                        new_item['autostart'] = False
-                                    if 'tags' not in new_item:
-                                        new_item['tags'] = []
-                                    if 'favorite' not in new_item:
-                                        new_item['favorite'] = False
-                                
-                                # Element zur Liste hinzufügen und speichern
-                                items.append(new_item)
-                                save_json(module, items)
-                                
-                                print(f"POST {module}: Eintrag erfolgreich erstellt mit ID {new_item.get('id')}")
-                                
-                                response = "HTTP/1.1 201 Created\r\nContent-Type: application/json\r\n\r\n".encode()
-                                response += json.dumps(new_item).encode()
-                                client_conn.sendall(response)
-                                client_conn.close()
-                                continue
+                                with storage.transaction(module) as items:
+                                    # Ausführliches Logging
+                                    print(f"POST {module}: Neuer Eintrag wird erstellt: {json.dumps(new_item)}")
+
+                                    # Wenn es sich um Tools handelt, prüfe auf Duplikate basierend auf dem Pfad
+                                    if module == 'tools' and 'path' in new_item:
+                                        # Prüfe, ob bereits ein Tool mit diesem Pfad existiert
+                                        existing_tool = next((t for t in items if t.get('path') == new_item.get('path')), None)
+                                        if existing_tool:
+                                            print(f"POST tools: Tool mit Pfad {new_item.get('path')} existiert bereits mit ID {existing_tool.get('id')}")
+
+                                            # Aktualisiere das bestehende Tool anstatt ein neues zu erstellen
+                                            for key, value in new_item.items():
+                                                if key != 'id':  # ID nicht überschreiben
+                                                    existing_tool[key] = value
+
+                                            # Speichere die aktualisierte Liste
+                                            save_json(module, items)
+
+                                            response = "HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n\r\n".encode()
+                                            response += json.dumps(existing_tool).encode()
+                                            client_conn.sendall(response)
+                                            client_conn.close()
+                                            continue
+
+                                    # Generiere eine eindeutige ID aus der Sequenz des Moduls
+                                    new_item['id'] = storage.next_id(module, items)
+
+                                    # Timestamps hinzufügen
+                                    if 'created_at' not in new_item:
+                                        new_item['created_at'] = get_timestamp_iso()
+
+                                    # Standardwerte für Tools setzen
+                                    if module == 'tools':
+                                        if 'admin' not in new_item:
+                                            new_item['admin'] = False
+                                        if 'autostart' not in new_item:
+                                            new_item['autostart'] = False
+                                        if 'tags' not in new_item:
+                                            new_item['tags'] = []
+                                        if 'favorite' not in new_item:
+                                            new_item['favorite'] = False
+
+                                    # Element zur Liste hinzufügen und speichern
+                                    items.append(new_item)
+                                    save_json(module, items)
+
+                                    print(f"POST {module}: Eintrag erfolgreich erstellt mit ID {new_item.get('id')}")
+
+                                    response = "HTTP/1.1 201 Created\r\nContent-Type: application/json\r\n\r\n".encode()
+                                    response += json.dumps(new_item).encode()
+                                    client_conn.sendall(response)
+                                    client_conn.close()
+                                    continue
                             except Exception as e:
                                 error_msg = f"Fehler bei POST-Anfrage: {str(e)}"
                                 print(error_msg)
@@ -931,6 +915,35 @@ else:
     FAQ_ATTACHMENTS_DIR = os.path.join(DATA_DIR, 'faq_attachments')
     os.makedirs(FAQ_ATTACHMENTS_DIR, exist_ok=True)
 
+    def stream_collection(name):
+        """Liefert eine Sammlung als JSON-Array Eintrag für Eintrag aus."""
+        def encode(obj):
+            return app.json.dumps(obj, separators=(',', ':'))
+
+        return Response(storage.iter_json(name, encode), mimetype='application/json')
+
+    def paginate(name, items=None):
+        """Antwort für ?limit=&cursor= (optional &total=1), sonst None.
+
+        items ist eine bereits gefilterte Liste statt der ganzen Sammlung.
+        """
+        args = request.args
+        if 'limit' not in args and 'cursor' not in args:
+            return None
+        try:
+            limit = int(args.get('limit', storage.PAGE_LIMIT_DEFAULT))
+        except ValueError:
+            return jsonify({"error": "Ungültiges limit"}), 400
+        with_total = args.get('total', '').lower() in ('1', 'true')
+        try:
+            if items is not None:
+                result = storage.paginate_list(items, limit, args.get('cursor') or None, with_total)
+            else:
+                result = storage.page(name, limit, args.get('cursor') or None, with_total=with_total)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(result)
+
     @app.route('/')
     def index():
         """Startseite: liefert das Frontend aus."""
@@ -949,10 +962,13 @@ else:
                 return api_get_workspace_tools()
             return jsonify({"error": "Methode nicht erlaubt"}), 405
 
-        items = load_json(module)
-        
+        if module == 'tool_usage_log':
+            if request.method == 'GET':
+                return jsonify(usage_log.tail(1000))
+            return jsonify({"error": "Methode nicht erlaubt"}), 405
+
         if request.method == 'GET':
-            return jsonify(items)
+            return paginate(module) or stream_collection(module)
         
         # POST-Anfrage für neuen Eintrag
         try:
@@ -969,93 +985,84 @@ else:
             # Ausführliches Logging
             print(f"POST {module}: Neuer Eintrag wird erstellt: {json.dumps(new_item)}")
             print(f"DEBUG: module={module}, type={new_item.get('type')}")
-            
-            # Wenn es sich um Tools handelt, prüfe auf Duplikate basierend auf dem Pfad
-            if module == 'tools' and 'path' in new_item:
-                # Prüfe, ob bereits ein Tool mit diesem Pfad existiert
-                existing_tool = next((t for t in items if t.get('path') == new_item.get('path')), None)
-                if existing_tool:
-                    print(f"POST tools: Tool mit Pfad {new_item.get('path')} existiert bereits mit ID {existing_tool.get('id')}")
+
+            with storage.transaction(module) as items:
+                # Wenn es sich um Tools handelt, prüfe auf Duplikate basierend auf dem Pfad
+                if module == 'tools' and 'path' in new_item:
+                    # Prüfe, ob bereits ein Tool mit diesem Pfad existiert
+                    existing_tool = next((t for t in items if t.get('path') == new_item.get('path')), None)
+                    if existing_tool:
+                        print(f"POST tools: Tool mit Pfad {new_item.get('path')} existiert bereits mit ID {existing_tool.get('id')}")
                     
-                    # Aktualisiere das bestehende Tool anstatt ein neues zu erstellen
-                    for key, value in new_item.items():
-                        if key != 'id':  # ID nicht überschreiben
-                            existing_tool[key] = value
+                        # Aktualisiere das bestehende Tool anstatt ein neues zu erstellen
+                        for key, value in new_item.items():
+                            if key != 'id':  # ID nicht überschreiben
+                                existing_tool[key] = value
                     
-                    # Speichere die aktualisierte Liste
-                    save_json(module, items)
-                    return jsonify(existing_tool), 200
+                        # Speichere das aktualisierte Tool
+                        storage.update_item(module, items, existing_tool)
+                        return jsonify(existing_tool), 200
             
-            # Generiere eine eindeutige ID für das neue Element
-            if module == 'tools':
-                # Stelle sicher, dass wir lückenlose IDs haben (1, 2, 3, ...)
-                existing_ids = [item.get('id', 0) for item in items if isinstance(item.get('id'), (int, float))]
-                next_id = 1
-                while next_id in existing_ids:
-                    next_id += 1
-                new_item['id'] = next_id
-            else:
-                # Für andere Module verwenden wir die bestehende Methode
-                new_item['id'] = max((i.get('id', 0) for i in items), default=0) + 1
+                # Generiere eine eindeutige ID aus der Sequenz des Moduls
+                new_item['id'] = storage.next_id(module, items)
             
-            # Spezielle Behandlung für Workspaces (nach ID-Generierung)
-            if module == 'tools' and new_item.get('type') == 'workspace':
-                print(f"DEBUG: Workspace-Logik wird ausgeführt für {new_item.get('name')}")
-                # Erstelle automatisch einen Ordner in Documents
-                try:
-                    import os
-                    from pathlib import Path
+                # Spezielle Behandlung für Workspaces (nach ID-Generierung)
+                if module == 'tools' and new_item.get('type') == 'workspace':
+                    print(f"DEBUG: Workspace-Logik wird ausgeführt für {new_item.get('name')}")
+                    # Erstelle automatisch einen Ordner in Documents
+                    try:
+                        import os
+                        from pathlib import Path
                     
-                    workspace_name = new_item.get('name', 'Unbenannt')
+                        workspace_name = new_item.get('name', 'Unbenannt')
 
-                    safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    if not safe_name:
-                        safe_name = f"Workspace_{new_item['id']}"
+                        safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                        if not safe_name:
+                            safe_name = f"Workspace_{new_item['id']}"
 
-                    workspace_path = os.path.join(WORKSPACES_BASE_DIR, safe_name)
+                        workspace_path = os.path.join(WORKSPACES_BASE_DIR, safe_name)
                     
-                    # Erstelle den Ordner (rekursiv)
-                    os.makedirs(workspace_path, exist_ok=True)
+                        # Erstelle den Ordner (rekursiv)
+                        os.makedirs(workspace_path, exist_ok=True)
                     
-                    # Setze den Pfad im Tool
-                    new_item['path'] = workspace_path
+                        # Setze den Pfad im Tool
+                        new_item['path'] = workspace_path
                     
-                    print(f"Workspace-Ordner erstellt: {workspace_path}")
+                        print(f"Workspace-Ordner erstellt: {workspace_path}")
                     
-                except Exception as e:
-                    print(f"Fehler beim Erstellen des Workspace-Ordners: {e}")
-                    # Fortfahren ohne den Ordner zu erstellen - Tool wird trotzdem gespeichert
+                    except Exception as e:
+                        print(f"Fehler beim Erstellen des Workspace-Ordners: {e}")
+                        # Fortfahren ohne den Ordner zu erstellen - Tool wird trotzdem gespeichert
             
-            # Timestamps hinzufügen
-            if 'created_at' not in new_item:
-                new_item['created_at'] = get_timestamp_iso()
+                # Timestamps hinzufügen
+                if 'created_at' not in new_item:
+                    new_item['created_at'] = get_timestamp_iso()
             
-            # Standardwerte für Tools setzen
-            if module == 'tools':
-                if 'admin' not in new_item:
-                    new_item['admin'] = False
-                if 'autostart' not in new_item:
-                    new_item['autostart'] = False
-                if 'tags' not in new_item:
-                    new_item['tags'] = []
-                if 'favorite' not in new_item:
-                    new_item['favorite'] = False
+                # Standardwerte für Tools setzen
+                if module == 'tools':
+                    if 'admin' not in new_item:
+                        new_item['admin'] = False
+                    if 'autostart' not in new_item:
+                        new_item['autostart'] = False
+                    if 'tags' not in new_item:
+                        new_item['tags'] = []
+                    if 'favorite' not in new_item:
+                        new_item['favorite'] = False
             
-            # Standardwerte für FAQ-Elemente
-            if module == 'faq':
-                if 'tags' not in new_item:
-                    new_item['tags'] = []
-                if 'favorite' not in new_item:
-                    new_item['favorite'] = False
-                if 'attachments' not in new_item:
-                    new_item['attachments'] = []
+                # Standardwerte für FAQ-Elemente
+                if module == 'faq':
+                    if 'tags' not in new_item:
+                        new_item['tags'] = []
+                    if 'favorite' not in new_item:
+                        new_item['favorite'] = False
+                    if 'attachments' not in new_item:
+                        new_item['attachments'] = []
             
-            # Element zur Liste hinzufügen und speichern
-            items.append(new_item)
-            save_json(module, items)
+                # Element zur Liste hinzufügen und speichern
+                storage.insert_item(module, items, new_item)
             
-            print(f"POST {module}: Eintrag erfolgreich erstellt mit ID {new_item['id']}")
-            return jsonify(new_item), 201
+                print(f"POST {module}: Eintrag erfolgreich erstellt mit ID {new_item['id']}")
+                return jsonify(new_item), 201
         except Exception as e:
             error_msg = f"Fehler beim Erstellen eines neuen Eintrags in {module}: {str(e)}"
             print(error_msg)
@@ -1067,138 +1074,142 @@ else:
     @app.route('/api/<module>/<int:item_id>', methods=['GET', 'PUT', 'DELETE'])
     def module_item(module, item_id):
         """GET: Einzelnen Eintrag abrufen; PUT: Eintrag aktualisieren; DELETE: Eintrag löschen."""
-        items = load_json(module)
-        
         # Stelle sicher, dass item_id als Int behandelt wird
         item_id = int(item_id)
         
-        # Finde den Index des Elements mit dieser ID
-        idx = next((i for i, it in enumerate(items) if it.get('id') == item_id), None)
-        if idx is None:
-            return jsonify({"error": "Nicht gefunden"}), 404
-        
         # GET-Anfrage zum Abrufen eines einzelnen Elements
         if request.method == 'GET':
-            return jsonify(items[idx])
+            with storage.reading(module) as items:
+                item = storage.find_item(module, items, item_id)
+                if item is None:
+                    return jsonify({"error": "Nicht gefunden"}), 404
+                return jsonify(item)
         
-        # DELETE-Anfrage zum Löschen
-        if request.method == 'DELETE':
-            # Wenn es ein FAQ-Element ist und Anhänge hat, lösche diese ebenfalls
-            if module == 'faq' and 'attachments' in items[idx]:
-                for attachment in items[idx].get('attachments', []):
-                    if 'path' in attachment:
-                        # Extrahiere den Dateinamen aus dem Pfad
-                        filename = os.path.basename(attachment['path'])
-                        file_path = os.path.join(FAQ_ATTACHMENTS_DIR, filename)
-                        try:
-                            if os.path.exists(file_path):
-                                os.remove(file_path)
-                                print(f"Gelöschter Anhang: {file_path}")
-                        except Exception as e:
-                            print(f"Fehler beim Löschen des Anhangs {file_path}: {str(e)}")
+        with storage.transaction(module) as items:
+            # Finde den Index des Elements mit dieser ID
+            idx = storage.index_of(module, items, item_id)
+            if idx is None:
+                return jsonify({"error": "Nicht gefunden"}), 404
+        
+            # DELETE-Anfrage zum Löschen
+            if request.method == 'DELETE':
+                # Wenn es ein FAQ-Element ist und Anhänge hat, lösche diese ebenfalls
+                if module == 'faq' and 'attachments' in items[idx]:
+                    for attachment in items[idx].get('attachments', []):
+                        if 'path' in attachment:
+                            # Extrahiere den Dateinamen aus dem Pfad
+                            filename = os.path.basename(attachment['path'])
+                            file_path = os.path.join(FAQ_ATTACHMENTS_DIR, filename)
+                            try:
+                                if os.path.exists(file_path):
+                                    os.remove(file_path)
+                                    print(f"Gelöschter Anhang: {file_path}")
+                            except Exception as e:
+                                print(f"Fehler beim Löschen des Anhangs {file_path}: {str(e)}")
             
-            items.pop(idx)
-            save_json(module, items)
-            return jsonify({"success": True})
+                storage.delete_item(module, items, idx)
+                return jsonify({"success": True})
         
-        # PUT-Anfrage für Aktualisierung
-        try:
-            # Explizite Fehlerprüfung für JSON-Deserialisierung
-            if not request.data:
-                return jsonify({"error": "Leerer Request-Body"}), 400
+            # PUT-Anfrage für Aktualisierung
+            try:
+                # Explizite Fehlerprüfung für JSON-Deserialisierung
+                if not request.data:
+                    return jsonify({"error": "Leerer Request-Body"}), 400
                 
-            updated_item = request.get_json()
-            if updated_item is None:
-                return jsonify({"error": "Ungültiges JSON im Request-Body"}), 400
+                updated_item = request.get_json()
+                if updated_item is None:
+                    return jsonify({"error": "Ungültiges JSON im Request-Body"}), 400
                 
-            # Debug-Informationen
-            print(f"Aktualisiere {module}/{item_id}: {updated_item}")
+                # Debug-Informationen
+                print(f"Aktualisiere {module}/{item_id}: {updated_item}")
             
-            # ID beibehalten
-            updated_item['id'] = item_id
+                # ID beibehalten
+                updated_item['id'] = item_id
             
-            # Update durchführen und bestehende Eigenschaften erhalten
-            items[idx] = updated_item
-            save_json(module, items)
-            return jsonify(updated_item)
-        except Exception as e:
-            print(f"Fehler bei PUT-Anfrage für {module}/{item_id}: {str(e)}")
-            return jsonify({"error": f"Fehler beim Aktualisieren: {str(e)}"}), 500
+                # Update durchführen und bestehende Eigenschaften erhalten
+                items[idx] = updated_item
+                storage.update_item(module, items, updated_item)
+                return jsonify(updated_item)
+            except Exception as e:
+                print(f"Fehler bei PUT-Anfrage für {module}/{item_id}: {str(e)}")
+                return jsonify({"error": f"Fehler beim Aktualisieren: {str(e)}"}), 500
 
     @app.route('/api/tools/<int:item_id>', methods=['GET', 'PUT', 'DELETE'])
     def tool_item(item_id):
         """GET: Tool abrufen; PUT: Tool aktualisieren; DELETE: Tool löschen."""
-        tools = load_json('tools')
-        
-        # Finde das Tool mit dieser ID
-        idx = next((i for i, tool in enumerate(tools) if tool.get('id') == item_id), None)
-        if idx is None:
-            return jsonify({"error": "Tool nicht gefunden"}), 404
-        
         # GET-Anfrage zum Abrufen eines einzelnen Tools
         if request.method == 'GET':
-            return jsonify(tools[idx])
+            with storage.reading('tools') as tools:
+                tool = storage.find_item('tools', tools, item_id)
+                if tool is None:
+                    return jsonify({"error": "Tool nicht gefunden"}), 404
+                return jsonify(tool)
+        
+        with storage.transaction('tools') as tools:
+            # Finde das Tool mit dieser ID
+            idx = storage.index_of('tools', tools, item_id)
+            if idx is None:
+                return jsonify({"error": "Tool nicht gefunden"}), 404
         
-        # DELETE-Anfrage zum Löschen
-        if request.method == 'DELETE':
-            tool = tools[idx]
+            # DELETE-Anfrage zum Löschen
+            if request.method == 'DELETE':
+                tool = tools[idx]
             
-            # Lösche die Verknüpfung, wenn vorhanden
-            if tool.get('shortcut_path') and os.path.exists(tool.get('shortcut_path')):
-                try:
-                    os.remove(tool.get('shortcut_path'))
-                    print(f"Verknüpfung gelöscht: {tool.get('shortcut_path')}")
-                except Exception as e:
-                    print(f"Fehler beim Löschen der Verknüpfung: {e}")
+                # Lösche die Verknüpfung, wenn vorhanden
+                if tool.get('shortcut_path') and os.path.exists(tool.get('shortcut_path')):
+                    try:
+                        os.remove(tool.get('shortcut_path'))
+                        print(f"Verknüpfung gelöscht: {tool.get('shortcut_path')}")
+                    except Exception as e:
+                        print(f"Fehler beim Löschen der Verknüpfung: {e}")
             
-            # Tool aus der Liste entfernen
-            tools.pop(idx)
-            save_json('tools', tools)
+                # Tool aus der Liste entfernen
+                storage.delete_item('tools', tools, idx)
             
-            return jsonify({"success": True, "message": f"Tool '{tool.get('name')}' wurde gelöscht"})
+                return jsonify({"success": True, "message": f"Tool '{tool.get('name')}' wurde gelöscht"})
         
-        # PUT-Anfrage für Aktualisierung
-        try:
-            updated_tool = request.get_json()
-            if not updated_tool:
-                return jsonify({"error": "Ungültige Daten"}), 400
+            # PUT-Anfrage für Aktualisierung
+            try:
+                updated_tool = request.get_json()
+                if not updated_tool:
+                    return jsonify({"error": "Ungültige Daten"}), 400
             
-            # Original-Tool für Vergleiche speichern
-            original_tool = tools[idx]
+                # Original-Tool für Vergleiche speichern
+                original_tool = tools[idx]
             
-            # ID beibehalten
-            updated_tool['id'] = item_id
+                # ID beibehalten
+                updated_tool['id'] = item_id
             
-            # Prüfen, ob sich Name oder Pfad geändert haben - dann Verknüpfung aktualisieren
-            name_changed = original_tool.get('name') != updated_tool.get('name')
-            path_changed = original_tool.get('path') != updated_tool.get('path')
+                # Prüfen, ob sich Name oder Pfad geändert haben - dann Verknüpfung aktualisieren
+                name_changed = original_tool.get('name') != updated_tool.get('name')
+                path_changed = original_tool.get('path') != updated_tool.get('path')
             
-            if (name_changed or path_changed) and updated_tool.get('path'):
-                # Alte Verknüpfung löschen, wenn vorhanden
-                if original_tool.get('shortcut_path') and os.path.exists(original_tool.get('shortcut_path')):
-                    try:
-                        os.remove(original_tool.get('shortcut_path'))
-                        print(f"Alte Verknüpfung gelöscht: {original_tool.get('shortcut_path')}")
-                    except Exception as e:
-                        print(f"Fehler beim Löschen der alten Verknüpfung: {e}")
+                if (name_changed or path_changed) and updated_tool.get('path'):
+                    # Alte Verknüpfung löschen, wenn vorhanden
+                    if original_tool.get('shortcut_path') and os.path.exists(original_tool.get('shortcut_path')):
+                        try:
+                            os.remove(original_tool.get('shortcut_path'))
+                            print(f"Alte Verknüpfung gelöscht: {original_tool.get('shortcut_path')}")
+                        except Exception as e:
+                            print(f"Fehler beim Löschen der alten Verknüpfung: {e}")
                 
-                # Neue Verknüpfung erstellen
-                shortcut_name = updated_tool.get('name', f"Tool_{item_id}")
-                shortcut_path = create_shortcut(updated_tool.get('path'), shortcut_name)
+                    # Neue Verknüpfung erstellen
+                    shortcut_name = updated_tool.get('name', f"Tool_{item_id}")
+                    shortcut_path = create_shortcut(updated_tool.get('path'), shortcut_name)
                 
-                if shortcut_path:
-                    updated_tool['shortcut_path'] = shortcut_path
-                    print(f"Neue Verknüpfung erstellt: {shortcut_path}")
+                    if shortcut_path:
+                        updated_tool['shortcut_path'] = shortcut_path
+                        print(f"Neue Verknüpfung erstellt: {shortcut_path}")
             
-            # Tool in der Liste aktualisieren
-            tools[idx] = updated_tool
-            save_json('tools', tools)
+                # Tool in der Liste aktualisieren
+                tools[idx] = updated_tool
+                storage.update_item('tools', tools, updated_tool)
             
-            return jsonify(updated_tool)
-        except Exception as e:
-            error_msg = f"Fehler beim Aktualisieren des Tools: {str(e)}"
-            print(error_msg)
-            return jsonify({"error": error_msg}), 500
+                return jsonify(updated_tool)
+            except Exception as e:
+                error_msg = f"Fehler beim Aktualisieren des Tools: {str(e)}"
+                print(error_msg)
+                return jsonify({"error": error_msg}), 500
 
     @app.route('/api/start-tool', methods=['POST'])
     def start_tool():
@@ -1242,7 +1253,7 @@ else:
                     }), 500
 
             tools = load_json('tools')
-            tool = next((t for t in tools if t.get('id') == tool_id), None)
+            tool = storage.find_item('tools', tools, tool_id)
             if not tool:
                 return jsonify({"error": f"Tool mit ID {tool_id} nicht gefunden"}), 404
 
@@ -1593,6 +1604,13 @@ else:
             return send_file(os.path.join(app.static_folder, 'static/img/default-tool-icon.png'), mimetype='image/png')
 
     # Network module API endpoints
+
+    # Ping-Ergebnisse je Gerät (TTL: network_settings ping_cache_ttl); gleichzeitige Pings teilen sich eine Prüfung
+    ping_cache = TTLCache(ttl=10)
+
+    # Hostnamen der Geräte (Rückwärtsauflösung mit Cache und Zeitlimit, siehe resolver.py)
+    hostnames = Resolver()
+
     @app.route('/api/network/ping', methods=['POST'])
     def ping_device():
         """Ping a network device and return status information."""
@@ -1623,83 +1641,34 @@ else:
                     "error": "Ungültiges Format für Hostname oder IP-Adresse"
                 }), 200
             
-            # Use actual ping command for Windows
+            # In-process probe (ICMP, sonst TCP) statt ping.exe und Auswertung der Ausgabe
+            source = 'miss'
             try:
-                # Ping with 4 packets and timeout of 3 seconds per packet
-                # Use encoding='cp850' for German Windows command prompt
-                result = subprocess.run(['ping', '-n', '4', '-w', '3000', device_id], 
-                                        capture_output=True, text=True, encoding='cp850', errors='ignore', timeout=15)
-                
-                # Debug output
-                print(f"Ping result for {device_id}:")
-                print(f"Return code: {result.returncode}")
-                print(f"Stdout: {result.stdout}")
-                print(f"Stderr: {result.stderr}")
-                
-                # First check: return code must be 0 for success
-                is_online = result.returncode == 0
-                
-                # Additional validation - check ping output content
-                if result.stdout:
-                    # Check for failure indicators first (these override return code)
-                    failure_indicators = [
-                        'konnte nicht gefunden werden', 'could not find host',
-                        'Ping-Anforderung konnte Host', 'Ping request could not find host',
-                        'Zielhost nicht erreichbar', 'Destination host unreachable', 
-                        'Zeitüberschreitung', 'Request timeout', 'timed out',
-                        'Allgemeiner Fehler', 'General failure',
-                        'Überprüfen Sie den Namen', 'Check the name'
-                    ]
-                    has_failure = any(indicator in result.stdout for indicator in failure_indicators)
-                    
-                    if has_failure:
-                        is_online = False
-                        print(f"Ping failed due to error message in output")
-                    elif is_online:
-                        # Only if return code was 0, check for success indicators
-                        success_indicators = [
-                            'TTL=', 'Zeit=', 'time=', 'TTL ='
-                        ]
-                        has_valid_response = any(indicator in result.stdout for indicator in success_indicators)
-                        
-                        # Must have valid response to be considered online
-                        is_online = has_valid_response
-                        print(f"Valid response found: {has_valid_response}")
-                else:
-                    is_online = False
-                    print("No stdout output from ping command")
-                
-                # Try to extract IP address from ping result if device is online
-                ip_address = None
-                if is_online:
-                    # Look for IP address pattern in ping output (German and English)
-                    ip_match = re.search(r'Ping wird ausgeführt für .+ \[(\d+\.\d+\.\d+\.\d+)\]', result.stdout) or \
-                               re.search(r'Pinging .+ \[(\d+\.\d+\.\d+\.\d+)\]', result.stdout) or \
-                               re.search(r'Antwort von (\d+\.\d+\.\d+\.\d+)', result.stdout) or \
-                               re.search(r'Reply from (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                    if ip_match:
-                        ip_address = ip_match.group(1)
-                
+                with storage.reading('network_settings', default=dict) as settings:
+                    settings = settings if isinstance(settings, dict) else {}
+                    ports = settings.get('probe_ports', prober.DEFAULT_PORTS)
+                    cache_ttl = float(settings.get('ping_cache_ttl', 10))
+                # 4 Anfragen, bis zu 3 Sekunden Wartezeit (wie bisher ping -n 4 -w 3000)
+                result, source = ping_cache.fetch(
+                    device_id.lower(),
+                    lambda: prober.probe(device_id, count=4, timeout=3.0, ports=ports),
+                    ttl=cache_ttl)
+                print(f"Ping result for {device_id} ({source}): {prober.summary(result)}")
+                is_online = result["reachable"]
+                ip_address = result["address"] if is_online else None
+
                 # Try to get hostname
                 hostname = None
                 if is_online:
-                    try:
-                        hostname = socket.gethostbyaddr(ip_address if ip_address else device_id)[0]
-                    except:
-                        # If hostname lookup fails, use device_id
-                        hostname = device_id.upper()
-                        
-            except subprocess.TimeoutExpired:
-                print(f"Ping timeout for {device_id}")
-                is_online = False
-                hostname = None
-                ip_address = None
+                    # If hostname lookup fails or takes too long, use device_id
+                    hostname = hostnames.lookup(ip_address or device_id) or device_id.upper()
+
             except Exception as ping_error:
                 print(f"Ping error for {device_id}: {ping_error}")
                 is_online = False
                 hostname = None
                 ip_address = None
-            
+
             # Build a response with device details
             response = {
                 "device_id": device_id,
@@ -1711,28 +1680,27 @@ else:
             }
             
             # Try to save device to database if not exists
-            devices = load_json('network_devices')
-            existing_device = next((d for d in devices if d.get('id') == device_id), None)
-            
-            if not existing_device:
-                # Add new device
-                new_device = {
-                    "id": device_id,
-                    "name": f"Device {device_id}",
-                    "ip": response["ip_address"],
-                    "is_online": is_online,
-                    "last_seen": get_timestamp_iso() if is_online else None,
-                    "network_path": response["network_path"]
-                }
-                devices.append(new_device)
-                save_json('network_devices', devices)
-            else:
-                # Update existing device
-                existing_device["ip"] = response["ip_address"]
-                existing_device["is_online"] = is_online
-                if is_online:
-                    existing_device["last_seen"] = get_timestamp_iso()
-                save_json('network_devices', devices)
+            with storage.transaction('network_devices') as devices:
+                existing_device = storage.find_item('network_devices', devices, device_id)
+                
+                if not existing_device:
+                    # Add new device
+                    new_device = {
+                        "id": device_id,
+                        "name": f"Device {device_id}",
+                        "ip": response["ip_address"],
+                        "is_online": is_online,
+                        "last_seen": get_timestamp_iso() if is_online else None,
+                        "network_path": response["network_path"]
+                    }
+                    storage.insert_item('network_devices', devices, new_device)
+                elif source == 'miss':
+                    # Update existing device (Ergebnisse aus dem Cache sind schon gespeichert)
+                    existing_device["ip"] = response["ip_address"]
+                    existing_device["is_online"] = is_online
+                    if is_online:
+                        existing_device["last_seen"] = get_timestamp_iso()
+                    storage.update_item('network_devices', devices, existing_device)
             
             return jsonify(response)
             
@@ -1744,8 +1712,14 @@ else:
     def get_network_devices():
         """Get list of network devices from database."""
         try:
-            devices = load_json('network_devices')
-            return jsonify(devices)
+            with storage.reading('network_devices') as devices:
+                devices = [device for device in devices if isinstance(device, dict)] if isinstance(devices, list) else []
+                # Nur bereits bekannte Hostnamen; die übrigen werden im Hintergrund aufgelöst
+                names = hostnames.known(netscan.device_address(device) for device in devices)
+                return jsonify([
+                    {**device, "hostname": device.get('hostname') or names.get(netscan.device_address(device))}
+                    for device in devices
+                ])
         except Exception as e:
             print(f"Error in get_network_devices: {str(e)}")
             return jsonify({"error": str(e)}), 500
@@ -1754,26 +1728,23 @@ else:
     def network_settings():
         """Get or update network settings."""
         try:
-            settings_path = os.path.join(DATA_DIR, 'network_settings.json')
-            
             # Default settings if file doesn't exist
-            default_settings = {
-                "network_path_template": "\\\\{device_id}\\c$",
-                "install_folder_path": "\\\\server\\installs",
-                "ping_timeout": 5,
-                "scan_subnet": "192.168.1.0/24"
-            }
+            def default_settings():
+                return {
+                    "network_path_template": "\\\\{device_id}\\c$",
+                    "install_folder_path": "\\\\server\\installs",
+                    "ping_timeout": 5,
+                    "scan_subnet": "192.168.1.0/24"
+                }
             
             # GET: Return current settings
             if request.method == 'GET':
-                if os.path.exists(settings_path):
-                    with open(settings_path, 'r', encoding='utf-8') as f:
-                        settings = json.load(f)
-                else:
+                try:
+                    settings = storage.load('network_settings')
+                except FileNotFoundError:
                     # Create default settings file if it doesn't exist
-                    settings = default_settings
-                    with open(settings_path, 'w', encoding='utf-8') as f:
-                        json.dump(settings, f, indent=2)
+                    settings = default_settings()
+                    storage.save('network_settings', settings)
                 
                 return jsonify(settings)
             
@@ -1784,21 +1755,14 @@ else:
                     return jsonify({"error": "Keine Daten erhalten"}), 400
                 
                 # Load current settings if exists or use defaults
-                if os.path.exists(settings_path):
-                    with open(settings_path, 'r', encoding='utf-8') as f:
-                        settings = json.load(f)
-                else:
-                    settings = default_settings
-                
-                # Update settings
-                for key, value in data.items():
-                    settings[key] = value
-                
-                # Save updated settings
-                with open(settings_path, 'w', encoding='utf-8') as f:
-                    json.dump(settings, f, indent=2)
-                
-                return jsonify(settings)
+                with storage.transaction('network_settings', default=default_settings) as settings:
+                    # Update settings
+                    for key, value in data.items():
+                        settings[key] = value
+                    
+                    # Save updated settings
+                    storage.save('network_settings', settings)
+                    return jsonify(settings)
                 
         except Exception as e:
             print(f"Error in network_settings: {str(e)}")
@@ -1808,20 +1772,10 @@ else:
     def network_shortcuts():
         """Get or add network shortcuts."""
         try:
-            shortcuts_path = os.path.join(DATA_DIR, 'network_shortcuts.json')
-            
             # GET: Return current shortcuts
             if request.method == 'GET':
-                if os.path.exists(shortcuts_path):
-                    with open(shortcuts_path, 'r', encoding='utf-8') as f:
-                        shortcuts = json.load(f)
-                else:
-                    # Create default shortcuts file if it doesn't exist
-                    shortcuts = []
-                    with open(shortcuts_path, 'w', encoding='utf-8') as f:
-                        json.dump(shortcuts, f, indent=2)
-
-                return jsonify(shortcuts)
+                with storage.reading('network_shortcuts') as shortcuts:
+                    return jsonify(shortcuts)
             
             # POST: Add new shortcut
             elif request.method == 'POST':
@@ -1829,23 +1783,16 @@ else:
                 if not data or 'path' not in data:
                     return jsonify({"error": "Kein Pfad angegeben"}), 400
                 
-                # Load current shortcuts if exists
-                if os.path.exists(shortcuts_path):
-                    with open(shortcuts_path, 'r', encoding='utf-8') as f:
-                        shortcuts = json.load(f)
-                else:
-                    shortcuts = []
-                
-                # Add new shortcut
-                new_shortcut = {
-                    "path": data['path'],
-                    "created_at": get_timestamp_iso()
-                }
-                shortcuts.append(new_shortcut)
-                
-                # Save updated shortcuts
-                with open(shortcuts_path, 'w', encoding='utf-8') as f:
-                    json.dump(shortcuts, f, indent=2)
+                with storage.transaction('network_shortcuts') as shortcuts:
+                    # Add new shortcut
+                    new_shortcut = {
+                        "path": data['path'],
+                        "created_at": get_timestamp_iso()
+                    }
+                    shortcuts.append(new_shortcut)
+                    
+                    # Save updated shortcuts
+                    storage.save('network_shortcuts', shortcuts)
                 
                 return jsonify(new_shortcut), 201
                 
@@ -1857,44 +1804,33 @@ else:
     def network_shortcut_item(index):
         """Update or delete a specific network shortcut."""
         try:
-            shortcuts_path = os.path.join(DATA_DIR, 'network_shortcuts.json')
-            
-            # Check if shortcuts file exists
-            if not os.path.exists(shortcuts_path):
-                return jsonify({"error": "Keine Shortcuts gefunden"}), 404
-                
-            # Load shortcuts
-            with open(shortcuts_path, 'r', encoding='utf-8') as f:
-                shortcuts = json.load(f)
-            
-            # Check if index is valid
-            if index < 0 or index >= len(shortcuts):
-                return jsonify({"error": "Ungültiger Index"}), 404
-            
-            # PUT: Update shortcut
-            if request.method == 'PUT':
-                data = request.get_json()
-                if not data or 'path' not in data:
-                    return jsonify({"error": "Kein Pfad angegeben"}), 400
-                
-                shortcuts[index]['path'] = data['path']
-                shortcuts[index]['updated_at'] = get_timestamp_iso()
-                
-                # Save updated shortcuts
-                with open(shortcuts_path, 'w', encoding='utf-8') as f:
-                    json.dump(shortcuts, f, indent=2)
-                
-                return jsonify(shortcuts[index])
-            
-            # DELETE: Remove shortcut
-            elif request.method == 'DELETE':
-                removed = shortcuts.pop(index)
-                
-                # Save updated shortcuts
-                with open(shortcuts_path, 'w', encoding='utf-8') as f:
-                    json.dump(shortcuts, f, indent=2)
+            with storage.transaction('network_shortcuts') as shortcuts:
+                # Check if index is valid
+                if index < 0 or index >= len(shortcuts):
+                    return jsonify({"error": "Ungültiger Index"}), 404
+                
+                # PUT: Update shortcut
+                if request.method == 'PUT':
+                    data = request.get_json()
+                    if not data or 'path' not in data:
+                        return jsonify({"error": "Kein Pfad angegeben"}), 400
+                    
+                    shortcuts[index]['path'] = data['path']
+                    shortcuts[index]['updated_at'] = get_timestamp_iso()
+                    
+                    # Save updated shortcuts
+                    storage.save('network_shortcuts', shortcuts)
+                    
+                    return jsonify(shortcuts[index])
                 
-                return jsonify({"success": True, "removed": removed})
+                # DELETE: Remove shortcut
+                elif request.method == 'DELETE':
+                    removed = shortcuts.pop(index)
+                    
+                    # Save updated shortcuts
+                    storage.save('network_shortcuts', shortcuts)
+                    
+                    return jsonify({"success": True, "removed": removed})
                 
         except Exception as e:
             print(f"Error in network_shortcut_item: {str(e)}")
@@ -1902,27 +1838,73 @@ else:
             
     # --- Kalender/Termine API ---
 
+    def _termin_key(value):
+        value = str(value).strip()
+        return value or None
+
+    def _termin_start(termin):
+        return termin.get('start') or termin.get('date')
+
+    def _termin_end(termin):
+        # Eintägige Termine ohne end enden an ihrem Beginn
+        return termin.get('end') or _termin_start(termin)
+
+    # Termine nach Beginn und nach Ende sortiert (Bereichsabfragen per
+    # Binärsuche) und je Kontakt
+    storage.register_index('termine', 'start', 'sorted', key=_termin_start, normalize=_termin_key)
+    storage.register_index('termine', 'end', 'sorted', key=_termin_end, normalize=_termin_key)
+    storage.register_index('termine', 'contact_id', normalize=_termin_key)
+
+    def list_termine():
+        """Termine, optional ?from=&to= (ISO-Datum, inklusive) und ?contact_id=.
+
+        Geliefert wird jeder Termin, dessen Zeitraum [start, end] den
+        Bereich überschneidet, auch mehrtägige Termine, die vor from
+        beginnen. Gesucht wird über den Ende-Index (end >= from), danach
+        wird nach Beginn <= to gefiltert; vergangene Termine werden nicht
+        durchlaufen. Mit Filter nach Beginn sortiert.
+        """
+        args = request.args
+        start_from = _termin_key(args.get('from') or '')
+        start_to = _termin_key(args.get('to') or '')
+        if start_to and len(start_to) == 10:
+            # Reines Datum: der ganze Tag gehört dazu
+            start_to += 'T99'
+        equals = {'contact_id': args['contact_id']} if args.get('contact_id') else {}
+        if not equals and not start_from and not start_to:
+            paged = paginate('termine')
+            if paged is not None:
+                return paged
+            with storage.reading('termine') as termine:
+                return jsonify(termine)
+
+        if start_from:
+            termine = storage.select('termine', equals, {'end': (start_from, None)}, order_by='start')
+            if start_to:
+                termine = [termin for termin in termine
+                           if str(_termin_start(termin) or '').strip() <= start_to]
+        else:
+            between = {'start': (None, start_to)} if start_to else {}
+            termine = storage.select('termine', equals, between, order_by='start')
+        return paginate('termine', items=termine) or jsonify(termine)
+
     @app.route('/api/termine', methods=['GET'])
     def get_termine():
-        termine = load_json('termine')
-        return jsonify(termine)
+        return list_termine()
 
     # Alias-Endpunkt für Kalender im Telefonbuch
     @app.route('/api/telefonbuch/termine', methods=['GET'])
     def get_telefonbuch_termine():
-        termine = load_json('termine')
-        return jsonify(termine)
+        return list_termine()
 
     @app.route('/api/termine', methods=['POST'])
     def add_termin():
         data = request.get_json(force=True)
-        termine = load_json('termine')
-        new_id = max([t.get('id', 0) for t in termine], default=0) + 1
-        data['id'] = new_id
-        data['created_at'] = get_timestamp_iso()
-        termine.append(data)
-        save_json('termine', termine)
-        return jsonify(data), 201
+        with storage.transaction('termine') as termine:
+            data['id'] = storage.next_id('termine', termine)
+            data['created_at'] = get_timestamp_iso()
+            storage.insert_item('termine', termine, data)
+            return jsonify(data), 201
 
     # FAQ-Anhang-Endpunkte
     @app.route('/api/faq-attachments', methods=['POST'])
@@ -2005,7 +1987,7 @@ def api_create_shortcut():
             
         tool_id = data['tool_id']
         tools = load_json('tools')
-        tool = next((t for t in tools if t['id'] == tool_id), None)
+        tool = storage.find_item('tools', tools, tool_id)
         
         if not tool:
             return jsonify({"error": "Tool nicht gefunden"}), 404
@@ -2094,8 +2076,8 @@ def api_workspace_remove_tool(workspace_id):
             return jsonify({"error": "tool_id erforderlich"}), 400
 
         tools = load_json('tools')
-        workspace = next((t for t in tools if t.get('id') == workspace_id and t.get('type') == 'workspace'), None)
-        if not workspace:
+        workspace = storage.find_item('tools', tools, workspace_id)
+        if not workspace or workspace.get('type') != 'workspace':
             return jsonify({"error": "Workspace nicht gefunden"}), 404
 
         workspace_path = workspace.get('path')
@@ -2103,7 +2085,7 @@ def api_workspace_remove_tool(workspace_id):
             return jsonify({"error": "Workspace-Ordner nicht gefunden"}), 404
 
         # Versuche zuerst, das Tool anhand der ID in der Datenbank zu finden
-        tool = next((t for t in tools if t.get('id') == int(tool_id)), None)
+        tool = storage.find_item('tools', tools, int(tool_id))
         tool_name = None
 
         if tool:
@@ -2147,42 +2129,38 @@ def api_workspace_remove_tool(workspace_id):
 def api_get_workspace_tools_by_id(workspace_id):
     """Gibt alle Tools zurück, die in einem spezifischen Workspace enthalten sind."""
     try:
-        tools = load_json('tools')
-        workspace = next((t for t in tools if t.get('id') == workspace_id and t.get('type') == 'workspace'), None)
-        if not workspace:
-            print(f"DEBUG api_get_workspace_tools_by_id: Workspace mit ID {workspace_id} nicht gefunden")
-            return jsonify({"error": "Workspace nicht gefunden"}), 404
+        with storage.transaction('tools') as tools:
+            workspace = storage.find_item('tools', tools, workspace_id)
+            if not workspace or workspace.get('type') != 'workspace':
+                print(f"DEBUG api_get_workspace_tools_by_id: Workspace mit ID {workspace_id} nicht gefunden")
+                return jsonify({"error": "Workspace nicht gefunden"}), 404
+
+            workspace_path = workspace.get('path')
+            print(f"DEBUG api_get_workspace_tools_by_id: Workspace {workspace_id} ({workspace.get('name')}): Pfad = {workspace_path}")
+
+            # Erstelle Workspace-Pfad, wenn er fehlt (ähnlich wie in api_workspace_import)
+            documents_workspace_prefix = os.path.join(os.path.expanduser('~'), 'Documents', 'HelpTool_Workspaces')
+            needs_migration = (
+                not workspace_path or
+                os.path.normcase(workspace_path).startswith(os.path.normcase(documents_workspace_prefix))
+            )
+
+            if needs_migration:
+                try:
+                    workspace_name = workspace.get('name', f"Workspace_{workspace_id}")
+                    safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                    if not safe_name:
+                        safe_name = f"Workspace_{workspace_id}"
 
-        workspace_path = workspace.get('path')
-        print(f"DEBUG api_get_workspace_tools_by_id: Workspace {workspace_id} ({workspace.get('name')}): Pfad = {workspace_path}")
-        
-        # Erstelle Workspace-Pfad, wenn er fehlt (ähnlich wie in api_workspace_import)
-        documents_workspace_prefix = os.path.join(os.path.expanduser('~'), 'Documents', 'HelpTool_Workspaces')
-        needs_migration = (
-            not workspace_path or
-            os.path.normcase(workspace_path).startswith(os.path.normcase(documents_workspace_prefix))
-        )
-
-        if needs_migration:
-            try:
-                workspace_name = workspace.get('name', f"Workspace_{workspace_id}")
-                safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                if not safe_name:
-                    safe_name = f"Workspace_{workspace_id}"
-
-                workspace_path = os.path.join(WORKSPACES_BASE_DIR, safe_name)
-                os.makedirs(workspace_path, exist_ok=True)
-
-                workspace['path'] = workspace_path
-                for idx, existing_tool in enumerate(tools):
-                    if existing_tool.get('id') == workspace['id']:
-                        tools[idx]['path'] = workspace_path
-                        break
-                save_json('tools', tools)
-                print(f"DEBUG api_get_workspace_tools_by_id: Workspace-Pfad nachträglich gesetzt: {workspace_path}")
-            except Exception as path_error:
-                print(f"DEBUG api_get_workspace_tools_by_id: Fehler beim Erstellen des Workspace-Pfads: {path_error}")
-                return jsonify([])  # Leere Liste zurückgeben statt Fehler
+                    workspace_path = os.path.join(WORKSPACES_BASE_DIR, safe_name)
+                    os.makedirs(workspace_path, exist_ok=True)
+
+                    workspace['path'] = workspace_path
+                    storage.update_item('tools', tools, workspace)
+                    print(f"DEBUG api_get_workspace_tools_by_id: Workspace-Pfad nachträglich gesetzt: {workspace_path}")
+                except Exception as path_error:
+                    print(f"DEBUG api_get_workspace_tools_by_id: Fehler beim Erstellen des Workspace-Pfads: {path_error}")
+                    return jsonify([])  # Leere Liste zurückgeben statt Fehler
         
         if not workspace_path or not os.path.exists(workspace_path):
             print(f"DEBUG api_get_workspace_tools_by_id: Workspace-Ordner existiert nicht: {workspace_path}")
@@ -2257,43 +2235,39 @@ def api_workspace_import():
         if not workspace_id or not tool_id:
             return jsonify({"error": "workspace_id und tool_id erforderlich"}), 400
 
-        tools = load_json('tools')
-        workspace = next((t for t in tools if t.get('id') == int(workspace_id) and t.get('type') == 'workspace'), None)
-        if not workspace:
-            return jsonify({"error": "Workspace nicht gefunden"}), 404
+        with storage.transaction('tools') as tools:
+            workspace = storage.find_item('tools', tools, int(workspace_id))
+            if not workspace or workspace.get('type') != 'workspace':
+                return jsonify({"error": "Workspace nicht gefunden"}), 404
 
-        tool = next((t for t in tools if t.get('id') == int(tool_id)), None)
-        if not tool:
-            return jsonify({"error": "Tool nicht gefunden"}), 404
+            tool = storage.find_item('tools', tools, int(tool_id))
+            if not tool:
+                return jsonify({"error": "Tool nicht gefunden"}), 404
 
-        dest_folder = workspace.get('path')
-        print(f"DEBUG api_workspace_import: dest_folder={dest_folder}")
-        documents_workspace_prefix = os.path.join(os.path.expanduser('~'), 'Documents', 'HelpTool_Workspaces')
-        needs_migration = (
-            not dest_folder or
-            os.path.normcase(dest_folder).startswith(os.path.normcase(documents_workspace_prefix))
-        )
+            dest_folder = workspace.get('path')
+            print(f"DEBUG api_workspace_import: dest_folder={dest_folder}")
+            documents_workspace_prefix = os.path.join(os.path.expanduser('~'), 'Documents', 'HelpTool_Workspaces')
+            needs_migration = (
+                not dest_folder or
+                os.path.normcase(dest_folder).startswith(os.path.normcase(documents_workspace_prefix))
+            )
 
-        if needs_migration:
-            try:
-                workspace_name = workspace.get('name', f"Workspace_{workspace_id}")
-                safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                if not safe_name:
-                    safe_name = f"Workspace_{workspace_id}"
-
-                dest_folder = os.path.join(WORKSPACES_BASE_DIR, safe_name)
-                os.makedirs(dest_folder, exist_ok=True)
-
-                workspace['path'] = dest_folder
-                for idx, existing_tool in enumerate(tools):
-                    if existing_tool.get('id') == workspace['id']:
-                        tools[idx]['path'] = dest_folder
-                        break
-                save_json('tools', tools)
-                print(f"Workspace-Pfad nachträglich gesetzt: {dest_folder}")
-            except Exception as path_error:
-                print(f"Fehler beim Erstellen des Workspace-Pfads: {path_error}")
-                return jsonify({"error": "Workspace-Pfad konnte nicht erstellt werden"}), 500
+            if needs_migration:
+                try:
+                    workspace_name = workspace.get('name', f"Workspace_{workspace_id}")
+                    safe_name = "".join(c for c in workspace_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+                    if not safe_name:
+                        safe_name = f"Workspace_{workspace_id}"
+
+                    dest_folder = os.path.join(WORKSPACES_BASE_DIR, safe_name)
+                    os.makedirs(dest_folder, exist_ok=True)
+
+                    workspace['path'] = dest_folder
+                    storage.update_item('tools', tools, workspace)
+                    print(f"Workspace-Pfad nachträglich gesetzt: {dest_folder}")
+                except Exception as path_error:
+                    print(f"Fehler beim Erstellen des Workspace-Pfads: {path_error}")
+                    return jsonify({"error": "Workspace-Pfad konnte nicht erstellt werden"}), 500
 
         print(f"DEBUG api_workspace_import: Erstelle Verknüpfung für Tool '{tool.get('name')}' in {dest_folder}")
         created = create_shortcut_at(tool.get('path'), tool.get('name', f"Tool_{tool_id}"), dest_folder)
@@ -2328,8 +2302,8 @@ def api_workspace_remove_category(workspace_id):
             return jsonify({"error": "category erforderlich"}), 400
 
         tools = load_json('tools')
-        workspace = next((t for t in tools if t.get('id') == workspace_id and t.get('type') == 'workspace'), None)
-        if not workspace:
+        workspace = storage.find_item('tools', tools, workspace_id)
+        if not workspace or workspace.get('type') != 'workspace':
             return jsonify({"error": "Workspace nicht gefunden"}), 404
 
         workspace_path = workspace.get('path')
@@ -2390,19 +2364,19 @@ def api_update_workspace(workspace_id):
         if not data:
             return jsonify({"error": "Kein JSON im Request"}), 400
 
-        tools = load_json('tools')
-        workspace = next((t for t in tools if t.get('id') == workspace_id and t.get('type') == 'workspace'), None)
-        if not workspace:
-            return jsonify({"error": "Workspace nicht gefunden"}), 404
+        with storage.transaction('tools') as tools:
+            workspace = storage.find_item('tools', tools, workspace_id)
+            if not workspace or workspace.get('type') != 'workspace':
+                return jsonify({"error": "Workspace nicht gefunden"}), 404
 
-        # Aktualisiere die erlaubten Felder
-        if 'name' in data:
-            workspace['name'] = data['name']
-        if 'autostart' in data:
-            workspace['autostart'] = data['autostart']
+            # Aktualisiere die erlaubten Felder
+            if 'name' in data:
+                workspace['name'] = data['name']
+            if 'autostart' in data:
+                workspace['autostart'] = data['autostart']
 
-        save_json('tools', tools)
-        return jsonify({"success": True, "workspace": workspace})
+            storage.update_item('tools', tools, workspace)
+            return jsonify({"success": True, "workspace": workspace})
 
     except Exception as e:
         print(f"Fehler in api_update_workspace: {e}")
@@ -2416,8 +2390,8 @@ def api_get_workspaces():
         tools = load_json('tools')
         working_sets = load_json('working_sets')
         
-        # Filtere nur Workspaces
-        workspaces = [tool for tool in tools if tool.get('type') == 'workspace']
+        # Filtere nur Workspaces (Kopien, da die Tools aus dem Cache stammen)
+        workspaces = [dict(tool) for tool in tools if tool.get('type') == 'workspace']
         
         # Füge zugeordnete Tools zu jedem Workspace hinzu
         for workspace in workspaces:
@@ -2429,7 +2403,7 @@ def api_get_workspaces():
                 tool_ids = working_set['tools']
                 workspace_tools = []
                 for tool_id in tool_ids:
-                    tool = next((t for t in tools if t.get('id') == tool_id), None)
+                    tool = storage.find_item('tools', tools, tool_id)
                     if tool:
                         workspace_tools.append(tool)
                 workspace['tools'] = workspace_tools
@@ -2457,7 +2431,7 @@ def api_get_workset_tools(workset_id):
         tool_ids = working_set.get('tools', [])
         workset_tools = []
         for tool_id in tool_ids:
-            tool = next((t for t in tools if t.get('id') == tool_id), None)
+            tool = storage.find_item('tools', tools, tool_id)
             if tool:
                 workset_tools.append(tool)
         
@@ -2476,36 +2450,35 @@ def api_add_tool_to_workset(workset_id):
         if not tool_id:
             return jsonify({"error": "Tool-ID erforderlich"}), 400
         
-        # Überprüfe ob Tool existiert
-        tools = load_json('tools')
-        tool = next((t for t in tools if t.get('id') == tool_id), None)
-        if not tool:
-            return jsonify({"error": "Tool nicht gefunden"}), 404
-        
-        # Überprüfe ob Workspace existiert
-        workspace = next((t for t in tools if t.get('id') == workset_id and t.get('type') == 'workspace'), None)
-        if not workspace:
-            return jsonify({"error": "Workspace nicht gefunden"}), 404
-        
+        with storage.reading('tools') as tools:
+            # Überprüfe ob Tool existiert
+            tool = storage.find_item('tools', tools, tool_id)
+            if not tool:
+                return jsonify({"error": "Tool nicht gefunden"}), 404
+
+            # Überprüfe ob Workspace existiert
+            workspace = storage.find_item('tools', tools, workset_id)
+            if not workspace or workspace.get('type') != 'workspace':
+                return jsonify({"error": "Workspace nicht gefunden"}), 404
+
         # Lade Working Sets
-        working_sets = load_json('working_sets')
-        
-        # Finde oder erstelle Working Set für diesen Workspace
-        working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
-        if not working_set:
-            working_set = {
-                'workspace_id': workset_id,
-                'tools': []
-            }
-            working_sets.append(working_set)
-        
-        # Füge Tool hinzu, falls noch nicht vorhanden
-        if tool_id not in working_set['tools']:
-            working_set['tools'].append(tool_id)
-            save_json('working_sets', working_sets)
-            return jsonify({"success": True, "message": "Tool erfolgreich hinzugefügt"})
-        else:
-            return jsonify({"error": "Tool bereits im Workset vorhanden"}), 400
+        with storage.transaction('working_sets') as working_sets:
+            # Finde oder erstelle Working Set für diesen Workspace
+            working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
+            if not working_set:
+                working_set = {
+                    'workspace_id': workset_id,
+                    'tools': []
+                }
+                working_sets.append(working_set)
+
+            # Füge Tool hinzu, falls noch nicht vorhanden
+            if tool_id not in working_set['tools']:
+                working_set['tools'].append(tool_id)
+                storage.save('working_sets', working_sets)
+                return jsonify({"success": True, "message": "Tool erfolgreich hinzugefügt"})
+            else:
+                return jsonify({"error": "Tool bereits im Workset vorhanden"}), 400
         
     except Exception as e:
         print(f"Fehler in api_add_tool_to_workset: {e}")
@@ -2515,20 +2488,19 @@ def api_add_tool_to_workset(workset_id):
 def api_remove_tool_from_workset(workset_id, tool_id):
     """Tool aus einem Workset entfernen"""
     try:
-        working_sets = load_json('working_sets')
-        
-        # Finde das Working Set
-        working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
-        if not working_set:
-            return jsonify({"error": "Workset nicht gefunden"}), 404
-        
-        # Entferne Tool aus der Liste
-        if tool_id in working_set['tools']:
-            working_set['tools'].remove(tool_id)
-            save_json('working_sets', working_sets)
-            return jsonify({"success": True, "message": "Tool erfolgreich entfernt"})
-        else:
-            return jsonify({"error": "Tool nicht im Workset gefunden"}), 404
+        with storage.transaction('working_sets') as working_sets:
+            # Finde das Working Set
+            working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
+            if not working_set:
+                return jsonify({"error": "Workset nicht gefunden"}), 404
+
+            # Entferne Tool aus der Liste
+            if tool_id in working_set['tools']:
+                working_set['tools'].remove(tool_id)
+                storage.save('working_sets', working_sets)
+                return jsonify({"success": True, "message": "Tool erfolgreich entfernt"})
+            else:
+                return jsonify({"error": "Tool nicht im Workset gefunden"}), 404
         
     except Exception as e:
         print(f"Fehler in api_remove_tool_from_workset: {e}")
@@ -0,0 +1,73 @@
+"""
+Änderungs-Feed der Sammlungen für Server-Sent Events (/api/events).
+
+storage.py meldet jede gespeicherte Änderung mit Sammlung, ID, Operation
+und neuer Version der Sammlung. Jede Meldung erhält eine fortlaufende
+Nummer (seq); die letzten HELPTOOL_EVENTS_BACKLOG Meldungen (Standard
+1000) werden im Speicher gehalten, damit sich Clients nach einem
+Verbindungsabbruch ab ihrer letzten Nummer wieder anschließen können.
+Liegt diese Nummer nicht mehr im Puffer (oder stammt sie aus einem
+früheren Prozessstart), erhält der Client stattdessen ein reset und lädt
+seine Daten neu.
+
+Der Feed ist prozesslokal: Änderungen anderer Worker-Prozesse oder von
+außen bearbeitete Dateien erscheinen hier nicht.
+"""
+import os
+import time
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKLOG = int(os.environ.get('HELPTOOL_EVENTS_BACKLOG', '1000'))
+
+
+class ChangeFeed:
+    """Ringpuffer der letzten Änderungen; Leser warten per Condition auf neue."""
+
+    def __init__(self, backlog: int = BACKLOG):
+        self._events: deque = deque(maxlen=backlog)
+        self._cond = threading.Condition(threading.Lock())
+        self._seq = 0
+        # Unterscheidet Nummern verschiedener Prozessstarts (wie storage._EPOCH)
+        self.epoch = format(time.time_ns(), 'x')
+
+    def publish(self, module: str, item_id: Any, op: str, version: int) -> int:
+        """Meldet eine Änderung und weckt wartende Leser; liefert ihre Nummer."""
+        with self._cond:
+            self._seq += 1
+            self._events.append({
+                "seq": self._seq,
+                "module": module,
+                "id": item_id,
+                "op": op,
+                "version": version,
+            })
+            self._cond.notify_all()
+            return self._seq
+
+    def latest(self) -> int:
+        with self._cond:
+            return self._seq
+
+    def since(self, seq: int, timeout: Optional[float] = None) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """Änderungen nach seq; wartet höchstens timeout Sekunden auf die erste.
+
+        Liefert (Änderungen, neue Position, reset). reset ist True, wenn
+        Änderungen nach seq nicht mehr im Puffer sind; die Position springt
+        dann auf die neueste Nummer.
+        """
+        with self._cond:
+            if seq > self._seq:
+                # Nummer aus einem früheren Prozessstart
+                return [], self._seq, True
+            if seq == self._seq and timeout:
+                self._cond.wait_for(lambda: self._seq > seq, timeout)
+            if seq == self._seq:
+                return [], seq, False
+            oldest = self._events[0]["seq"] if self._events else self._seq + 1
+            if seq + 1 < oldest:
+                return [], self._seq, True
+            # Nummern im Puffer sind lückenlos: Position direkt berechnen
+            return list(islice(self._events, seq + 1 - oldest, None)), self._seq, False
@@ -0,0 +1,169 @@
+"""
+Komprimierung der HTTP-Antworten (gzip, brotli sofern installiert).
+
+Die Kodierung wird über Accept-Encoding ausgehandelt. Antworten unter
+min_size Bytes und bereits komprimierte Formate (Bilder, Archive) bleiben
+unverändert; gestreamte Antworten werden stückweise komprimiert.
+Statische Dateien werden einmal mit höchster Stufe komprimiert und im
+Speicher gehalten (Schlüssel: Pfad, ETag der Datei, Kodierung).
+
+Konfiguration über die Umgebung:
+
+    HELPTOOL_COMPRESSION_LEVEL     gzip-Stufe 1-9 für API-Antworten (6)
+    HELPTOOL_COMPRESSION_MIN_SIZE  kleinere Antworten nicht komprimieren (1024)
+
+Das ETag einer komprimierten Antwort erhält die Endung -gzip bzw. -br,
+damit es stark bleiben kann; matches() berücksichtigt diese Varianten.
+"""
+import os
+import zlib
+import threading
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional, Tuple
+
+from flask import request
+
+try:
+    import brotli  # type: ignore
+except ImportError:
+    brotli = None
+
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+COMPRESSIBLE_TYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+}
+
+STATIC_CACHE_ENTRIES = 256
+DEFAULT_MIN_SIZE = 1024
+
+
+def matches(if_none_match, tag: str) -> bool:
+    """Passt If-None-Match auf das ETag tag oder eine seiner komprimierten Varianten?"""
+    return any(if_none_match.contains(variant)
+               for variant in (tag,) + tuple(f"{tag}-{enc}" for enc in ENCODINGS))
+
+
+def compressible(mimetype: Optional[str]) -> bool:
+    """Lohnt sich Komprimierung für diesen Inhaltstyp?"""
+    if not mimetype or mimetype == 'text/event-stream':
+        # Ereignisströme (SSE) nicht puffern oder komprimieren
+        return False
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Komprimiert data vollständig (gzip-Stufe 1-9, bei brotli die Qualität 0-11)."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _compress_stream(chunks: Iterable, encoding: str, level: int) -> Iterator[bytes]:
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level)
+        finish = compressor.finish
+        step = lambda data: compressor.process(data) + compressor.flush()
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+        finish = compressor.flush
+        step = lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if chunk:
+                # Nach jedem Stück leeren, damit der Client sofort Daten erhält
+                yield step(chunk)
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+
+class Compression:
+    """after_request-Hook, der Antworten einer Flask-App komprimiert."""
+
+    def __init__(self, app=None, level: Optional[int] = None, min_size: Optional[int] = None):
+        self.level = level if level is not None else int(os.environ.get('HELPTOOL_COMPRESSION_LEVEL', '6'))
+        self.min_size = min_size if min_size is not None else int(
+            os.environ.get('HELPTOOL_COMPRESSION_MIN_SIZE', str(DEFAULT_MIN_SIZE)))
+        self._static: 'OrderedDict[Tuple[str, str, str], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"static_hits": 0, "static_misses": 0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def _level_for(self, encoding: str, static: bool) -> int:
+        if static:
+            return 11 if encoding == 'br' else 9
+        if encoding == 'br':
+            # gzip-Stufe 1-9 grob auf brotli-Qualität 0-11 abbilden
+            return min(11, max(0, self.level - 2))
+        return self.level
+
+    def after_request(self, response):
+        if (response.status_code != 200
+                or 'Content-Encoding' in response.headers
+                or not compressible(response.mimetype)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None:
+            return response
+
+        tag, weak = response.get_etag()
+        static = response.direct_passthrough and tag is not None
+
+        if response.is_streamed and not static:
+            level = self._level_for(encoding, static=False)
+            response.response = _compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            key = (request.path, tag, encoding)
+            body = None
+            if static:
+                with self._lock:
+                    body = self._static.get(key)
+                    if body is not None:
+                        self._static.move_to_end(key)
+                        self.stats["static_hits"] += 1
+            if body is None:
+                response.direct_passthrough = False
+                data = response.get_data()
+                if len(data) < self.min_size:
+                    return response
+                body = compress(data, encoding, self._level_for(encoding, static))
+                if static:
+                    with self._lock:
+                        self.stats["static_misses"] += 1
+                        self._static[key] = body
+                        while len(self._static) > STATIC_CACHE_ENTRIES:
+                            self._static.popitem(last=False)
+            else:
+                # Treffer: die Datei muss nicht gelesen werden
+                close = getattr(response.response, 'close', None)
+                if close is not None:
+                    close()
+                response.direct_passthrough = False
+            response.set_data(body)
+
+        response.headers['Content-Encoding'] = encoding
+        if tag is not None:
+            encoded_tag = f"{tag}-{encoding}"
+            response.set_etag(encoded_tag, weak=weak)
+            if request.if_none_match.contains(encoded_tag):
+                # send_file kennt nur das ETag der unkomprimierten Datei
+                response.status_code = 304
+                response.set_data(b'')
+                del response.headers['Content-Encoding']
+                response.headers.pop('Content-Length', None)
+        return response
@@ -0,0 +1,237 @@
+"""
+Dateiformate der Sammlungen unter data/ (JSON-Engine).
+
+- pretty:  JSON mit indent=2 (bisheriges Format, gut lesbar)
+- compact: JSON ohne Leerzeichen; nutzt den C-Encoder von json und ist
+           deutlich schneller und kleiner als pretty
+- records: Binärformat mit Längenpräfix: Kopfzeile MAGIC, ein Byte für die
+           Art ('L' Liste, 'O' einzelnes Objekt), dann je Eintrag 4 Byte
+           Länge (big endian) und der Eintrag als kompaktes JSON
+
+Das Format wird je Sammlung konfiguriert: HELPTOOL_STORAGE_FORMAT legt den
+Standard fest (pretty), HELPTOOL_STORAGE_FORMATS überschreibt ihn je
+Sammlung (name=format, kommagetrennt). Ohne Angabe werden die großen,
+häufig geschriebenen Sammlungen tickets, tools und workspace-import
+kompakt gespeichert. Beim Lesen wird das Format am Dateiinhalt erkannt;
+nach einer Umstellung wird eine Datei beim nächsten Schreiben konvertiert.
+
+Umstellen aller Dateien und Vergleich der Formate:
+
+    python app/formats.py convert [--data-dir data] [--to compact] [name ...]
+    python app/formats.py bench [--data-dir data] [--rounds 20] [name ...]
+"""
+import os
+import sys
+import json
+import glob
+import time
+import struct
+import argparse
+from typing import Any, Dict, List, Optional
+
+FORMATS = ('pretty', 'compact', 'records')
+DEFAULT_OVERRIDES = 'tickets=compact,tools=compact,workspace-import=compact'
+
+MAGIC = b'HTREC1\n'
+_LENGTH = struct.Struct('>I')
+
+
+def _parse_overrides(spec: str) -> Dict[str, str]:
+    overrides = {}
+    for part in spec.split(','):
+        name, sep, fmt = part.strip().partition('=')
+        if not sep:
+            continue
+        fmt = fmt.strip().lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"Unbekanntes Speicherformat für {name}: {fmt}")
+        overrides[name.strip()] = fmt
+    return overrides
+
+
+class FormatConfig:
+    """Zuordnung Sammlung -> Dateiformat."""
+
+    def __init__(self, default: Optional[str] = None, overrides: Optional[str] = None):
+        default = (default or os.environ.get('HELPTOOL_STORAGE_FORMAT', 'pretty')).lower()
+        if default not in FORMATS:
+            raise ValueError(f"Unbekanntes Speicherformat: {default}")
+        self.default = default
+        if overrides is None:
+            overrides = os.environ.get('HELPTOOL_STORAGE_FORMATS', DEFAULT_OVERRIDES)
+        self.overrides = _parse_overrides(overrides)
+
+    def format_for(self, name: str) -> str:
+        return self.overrides.get(name, self.default)
+
+
+def encode(data: Any, fmt: str) -> bytes:
+    """Kodiert eine Sammlung im Format fmt."""
+    if fmt == 'pretty':
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    if fmt == 'compact':
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if fmt == 'records':
+        return _encode_records(data)
+    raise ValueError(f"Unbekanntes Speicherformat: {fmt}")
+
+
+def decode(raw: bytes) -> Any:
+    """Dekodiert den Inhalt einer Sammlungsdatei in beliebigem Format.
+
+    Wirft json.JSONDecodeError bei beschädigtem Inhalt.
+    """
+    if raw.startswith(MAGIC):
+        return _decode_records(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def detect(raw: bytes) -> str:
+    """Format eines Dateiinhalts ('pretty' und 'compact' sind nicht unterscheidbar)."""
+    return 'records' if raw.startswith(MAGIC) else 'json'
+
+
+def _encode_records(data: Any) -> bytes:
+    dumps = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False).encode
+    items = data if isinstance(data, list) else [data]
+    parts: List[bytes] = [MAGIC, b'L' if isinstance(data, list) else b'O']
+    for item in items:
+        record = dumps(item).encode('utf-8')
+        parts.append(_LENGTH.pack(len(record)))
+        parts.append(record)
+    return b''.join(parts)
+
+
+def _decode_records(raw: bytes) -> Any:
+    text = raw.decode('utf-8', errors='replace')
+    kind = raw[len(MAGIC):len(MAGIC) + 1]
+    if kind not in (b'L', b'O'):
+        raise json.JSONDecodeError("Unbekannte Art im Datensatz-Kopf", text, len(MAGIC))
+    records: List[bytes] = []
+    pos = len(MAGIC) + 1
+    end = len(raw)
+    while pos < end:
+        if pos + _LENGTH.size > end:
+            raise json.JSONDecodeError("Unvollständige Längenangabe", text, pos)
+        (length,) = _LENGTH.unpack_from(raw, pos)
+        pos += _LENGTH.size
+        if pos + length > end:
+            raise json.JSONDecodeError("Unvollständiger Datensatz", text, pos)
+        records.append(raw[pos:pos + length])
+        pos += length
+    # Ein einziger json.loads über alle Datensätze ist schneller als einer je Eintrag
+    items = json.loads(b'[' + b','.join(records) + b']')
+    if kind == b'O':
+        if len(items) != 1:
+            raise json.JSONDecodeError("Objekt-Datei mit mehreren Datensätzen", text, 0)
+        return items[0]
+    return items
+
+
+# ----------------------------------------------------------------------
+# Kommandozeile
+# ----------------------------------------------------------------------
+
+def _collections(data_dir: str, names: List[str]) -> List[str]:
+    if names:
+        return names
+    return [os.path.splitext(os.path.basename(path))[0]
+            for path in sorted(glob.glob(os.path.join(data_dir, '*.json')))
+            if not os.path.basename(path).startswith('_')]
+
+
+def convert(data_dir: str, names: List[str], to: Optional[str] = None) -> Dict[str, str]:
+    """Schreibt die Sammlungen im Zielformat neu (Standard: konfiguriertes Format)."""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from storage import atomic_write
+
+    config = FormatConfig()
+    converted = {}
+    for name in _collections(data_dir, names):
+        path = os.path.join(data_dir, f"{name}.json")
+        try:
+            with open(path, 'rb') as f:
+                data = decode(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Übersprungen: {name} ({e})")
+            continue
+        fmt = to or config.format_for(name)
+        atomic_write(path, encode(data, fmt))
+        converted[name] = fmt
+        print(f"Konvertiert: {name} -> {fmt}")
+    return converted
+
+
+def _best_of(func, rounds: int) -> float:
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(data_dir: str, names: List[str], rounds: int = 20) -> List[Dict[str, Any]]:
+    """Misst Kodier-/Dekodierzeit und geschriebene Bytes je Änderung und Format.
+
+    Jede Änderung schreibt die ganze Datei neu, die Bytes je Änderung
+    entsprechen also der Dateigröße.
+    """
+    results = []
+    for name in _collections(data_dir, names):
+        try:
+            with open(os.path.join(data_dir, f"{name}.json"), 'rb') as f:
+                data = decode(f.read())
+        except (OSError, ValueError):
+            continue
+        for fmt in FORMATS:
+            raw = encode(data, fmt)
+            results.append({
+                "collection": name,
+                "format": fmt,
+                "encode_ms": _best_of(lambda: encode(data, fmt), rounds) * 1000,
+                "decode_ms": _best_of(lambda: decode(raw), rounds) * 1000,
+                "bytes_per_mutation": len(raw),
+            })
+    return results
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    default_data_dir = os.path.join(base_dir, 'data')
+
+    parser = argparse.ArgumentParser(description="HelpTool Speicherformate")
+    sub = parser.add_subparsers(dest='command', required=True)
+    cmd = sub.add_parser('convert', help="Sammlungen in ein anderes Format umschreiben")
+    cmd.add_argument('--data-dir', default=default_data_dir)
+    cmd.add_argument('--to', choices=FORMATS, help="Standard: konfiguriertes Format je Sammlung")
+    cmd.add_argument('names', nargs='*')
+    cmd = sub.add_parser('bench', help="Formate vergleichen")
+    cmd.add_argument('--data-dir', default=default_data_dir)
+    cmd.add_argument('--rounds', type=int, default=20)
+    cmd.add_argument('names', nargs='*')
+    args = parser.parse_args(argv)
+
+    if args.command == 'convert':
+        converted = convert(args.data_dir, args.names, args.to)
+        print(f"{len(converted)} Sammlungen konvertiert")
+        return 0
+
+    results = bench(args.data_dir, args.names, args.rounds)
+    print(f"{'Sammlung':<24} {'Format':<8} {'encode ms':>10} {'decode ms':>10} {'Bytes':>9}")
+    for row in results:
+        print(f"{row['collection']:<24} {row['format']:<8} {row['encode_ms']:>10.3f} "
+              f"{row['decode_ms']:>10.3f} {row['bytes_per_mutation']:>9}")
+    totals: Dict[str, List[float]] = {}
+    for row in results:
+        total = totals.setdefault(row['format'], [0.0, 0.0, 0])
+        total[0] += row['encode_ms']
+        total[1] += row['decode_ms']
+        total[2] += row['bytes_per_mutation']
+    for fmt, (enc, dec, size) in totals.items():
+        print(f"{'Summe':<24} {fmt:<8} {enc:>10.3f} {dec:>10.3f} {size:>9}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
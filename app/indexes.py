@@ -0,0 +1,182 @@
+"""
+Sekundärindizes über Feldwerte gecachter Sammlungen.
+
+Ein Index bildet Feldwerte auf Eintrags-IDs ab: als Hash (Gleichheit,
+z.B. status) oder sortiert (Bereiche und Reihenfolge, z.B. created_at).
+storage.py baut die Indizes beim ersten Zugriff auf und hält sie bei
+insert_item/update_item/delete_item aktuell; Abfragen laufen über
+storage.select().
+
+Indiziert wird über die ID, nicht die Position, damit Löschungen die
+übrigen Einträge nicht verschieben. Sammlungen mit fehlenden oder
+doppelten IDs lassen sich nicht indizieren; dort sucht storage.select()
+linear.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+class IndexSpec:
+    """Definition eines Index: Art, Feld bzw. Schlüsselfunktion, Normalisierung.
+
+    key liest den Rohwert aus einem Eintrag (Standard: item.get(field)),
+    normalize wird auf Rohwerte und auf Abfragewerte angewendet. Werte,
+    die zu None normalisiert werden, landen nicht im Index.
+    """
+
+    def __init__(self, field: str, kind: str = 'hash',
+                 key: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 normalize: Optional[Callable[[Any], Any]] = None):
+        if kind not in ('hash', 'sorted'):
+            raise ValueError(f"Unbekannte Index-Art: {kind}")
+        self.field = field
+        self.kind = kind
+        self.key = key or (lambda item: item.get(field))
+        self.normalize = normalize or _default_normalize
+
+    def key_of(self, item: Any) -> Any:
+        try:
+            raw = self.key(item)
+        except (AttributeError, TypeError):
+            return None
+        return self.normalize(raw) if raw is not None else None
+
+    def build(self, items: Iterable[Any]) -> Optional['SecondaryIndex']:
+        index = SecondaryIndex(self)
+        pairs = []
+        for item in items:
+            item_id = item.get('id') if isinstance(item, dict) else None
+            try:
+                if item_id is None or item_id in index.keys:
+                    return None
+            except TypeError:
+                return None
+            key = self.key_of(item)
+            index.keys[item_id] = key
+            if key is None:
+                continue
+            if self.kind == 'hash':
+                index.buckets.setdefault(key, set()).add(item_id)
+            else:
+                pairs.append((key, item_id))
+        if pairs:
+            # Einmal sortieren statt einzeln einfügen; stabil, also Sammlungsreihenfolge bei gleichen Werten
+            pairs.sort(key=lambda pair: pair[0])
+            index.sorted_keys = [key for key, _ in pairs]
+            index.sorted_ids = [item_id for _, item_id in pairs]
+        return index
+
+
+def _default_normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def phone_key(value: Any) -> Optional[str]:
+    """Telefonnummer als reine Ziffernfolge, Ländervorwahl +49/0049 als 0.
+
+    "0176 247 08 123", "+49 (0)176 24708123" und "0176/24708123" ergeben
+    denselben Schlüssel.
+    """
+    text = str(value).strip().replace('(0)', '')
+    digits = ''.join(c for c in text if c.isdigit())
+    if text.startswith('+'):
+        digits = '00' + digits
+    if digits.startswith('0049'):
+        digits = '0' + digits[4:]
+    return digits or None
+
+
+class SecondaryIndex:
+    """Feldwert -> IDs, für sortierte Indizes zusätzlich in Schlüsselreihenfolge."""
+
+    __slots__ = ('spec', 'keys', 'buckets', 'sorted_keys', 'sorted_ids')
+
+    def __init__(self, spec: IndexSpec):
+        self.spec = spec
+        self.keys: Dict[Any, Any] = {}
+        self.buckets: Dict[Any, Set[Any]] = {}
+        self.sorted_keys: List[Any] = []
+        self.sorted_ids: List[Any] = []
+
+    def add(self, item_id: Any, item: Any) -> bool:
+        """Nimmt einen Eintrag auf; False bei doppelter oder ungültiger ID."""
+        try:
+            if item_id in self.keys:
+                return False
+        except TypeError:
+            return False
+        key = self.spec.key_of(item)
+        self.keys[item_id] = key
+        if key is None:
+            return True
+        if self.spec.kind == 'hash':
+            self.buckets.setdefault(key, set()).add(item_id)
+        else:
+            pos = bisect_right(self.sorted_keys, key)
+            self.sorted_keys.insert(pos, key)
+            self.sorted_ids.insert(pos, item_id)
+        return True
+
+    def remove(self, item_id: Any):
+        if item_id not in self.keys:
+            return
+        key = self.keys.pop(item_id)
+        if key is None:
+            return
+        if self.spec.kind == 'hash':
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self.buckets[key]
+            return
+        lo = bisect_left(self.sorted_keys, key)
+        hi = bisect_right(self.sorted_keys, key)
+        for pos in range(lo, hi):
+            if self.sorted_ids[pos] == item_id:
+                del self.sorted_keys[pos]
+                del self.sorted_ids[pos]
+                return
+
+    def equal(self, value: Any) -> Set[Any]:
+        """IDs aller Einträge mit dem (normalisierten) Wert value."""
+        key = self.spec.normalize(value) if value is not None else None
+        if key is None:
+            return set()
+        if self.spec.kind == 'hash':
+            return set(self.buckets.get(key, ()))
+        lo = bisect_left(self.sorted_keys, key)
+        hi = bisect_right(self.sorted_keys, key)
+        return set(self.sorted_ids[lo:hi])
+
+    def between(self, low: Any = None, high: Any = None) -> List[Any]:
+        """IDs mit low <= Wert <= high in Schlüsselreihenfolge (nur sortierte Indizes)."""
+        lo = bisect_left(self.sorted_keys, low) if low is not None else 0
+        hi = bisect_right(self.sorted_keys, high) if high is not None else len(self.sorted_keys)
+        return self.sorted_ids[lo:hi]
+
+    def prefixed(self, prefix: Any, limit: Optional[int] = None) -> List[Tuple[Any, Any, int]]:
+        """Verschiedene Schlüssel, die mit prefix beginnen, in Schlüsselreihenfolge.
+
+        Je Schlüssel (Schlüssel, erste ID, Anzahl IDs); nur sortierte Indizes
+        mit Zeichenketten. Kosten O(log n) je gelieferten Schlüssel.
+        """
+        prefix = (self.spec.normalize(prefix) if prefix else None) or ''
+        keys = self.sorted_keys
+        result = []
+        pos = bisect_left(keys, prefix) if prefix else 0
+        while pos < len(keys) and (limit is None or len(result) < limit):
+            key = keys[pos]
+            if not key.startswith(prefix):
+                break
+            end = bisect_right(keys, key, pos)
+            result.append((key, self.sorted_ids[pos], end - pos))
+            pos = end
+        return result
+
+    def missing(self) -> List[Any]:
+        """IDs der Einträge ohne Wert für dieses Feld."""
+        return [item_id for item_id, key in self.keys.items() if key is None]
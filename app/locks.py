@@ -0,0 +1,151 @@
+"""
+Sperren für den gemeinsamen Zugriff auf Dateien unter data/.
+
+RWLock regelt den Zugriff innerhalb eines Prozesses: beliebig viele
+Leser gleichzeitig, Schreiber exklusiv (und bevorzugt, damit sie nicht
+verhungern). FileLock ist eine advisory Sperre per fcntl.flock auf eine
+eigene .lock-Datei, damit mehrere Worker-Prozesse (z.B. gunicorn) sich
+abstimmen können. Ohne fcntl (Windows) wird nur innerhalb des Prozesses
+gesperrt.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    with _thread_locks_guard:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = _thread_locks[path] = threading.Lock()
+        return lock
+
+
+class RWLock:
+    """Leser/Schreiber-Sperre mit Schreiber-Vorrang.
+
+    Leser und Schreiber dürfen die Sperre erneut betreten, der Schreiber
+    auch lesend; Leser dürfen nicht zum Schreiber aufsteigen.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: Dict[int, int] = {}
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                self._readers[me] += 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers[me] = 1
+
+    def release_read(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth -= 1
+                return
+            self._readers[me] -= 1
+            if not self._readers[me]:
+                del self._readers[me]
+                if not self._readers:
+                    self._cond.notify_all()
+
+    def acquire_write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    def is_write_locked_by_me(self) -> bool:
+        return self._writer == threading.get_ident()
+
+    def has_waiting_writers(self) -> bool:
+        return self._waiting_writers > 0
+
+    @contextmanager
+    def read_locked(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class FileLock:
+    """Exklusive (oder geteilte) Sperre auf path, prozess- und threadübergreifend."""
+
+    def __init__(self, path: str, shared: bool = False):
+        self.path = path
+        self.shared = shared
+        self._fd = None
+        self._local = None
+
+    def __enter__(self) -> 'FileLock':
+        if fcntl is None:
+            # Ohne fcntl nur prozessintern; geteilte Sperren sind dann exklusiv
+            self._local = _thread_lock(self.path)
+            self._local.acquire()
+            return self
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX)
+        except BaseException:
+            os.close(self._fd)
+            self._fd = None
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._local is not None:
+            self._local.release()
+            self._local = None
+        if self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        return False
@@ -3,17 +3,36 @@
 HelpTool Backend - Docker-optimierte Version
 Ersetzt das komplexe backend.py (117k Zeichen) durch eine schlanke Flask-App
 """
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory
 from flask_cors import CORS
 import os
+import sys
 import json
 import time
+import threading
 import subprocess
-from typing import Any, Dict, List, Tuple
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Geschwister-Module (storage, ...) auch beim Start als Skript importierbar machen
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import netscan
+import prober
+import search
+import storage
+from assets import AssetTable
+from compression import Compression, matches as etag_matches
+from indexes import phone_key
+from monitor import DeviceMonitor
+from resolver import Resolver
+from ttlcache import TTLCache
+from usage_journal import UsageJournal
 
 # Flask App initialisieren
 app = Flask(__name__)
 CORS(app)
+compression = Compression(app)
 
 # Basis-Konfiguration
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,6 +41,16 @@ STATIC_DIR = os.path.join(BASE_DIR, 'static')
 
 # Sicherstellen, dass Datenverzeichnis existiert
 os.makedirs(DATA_DIR, exist_ok=True)
+storage.configure(DATA_DIR)
+
+# Tool-Nutzung als Append-only-Journal (ersetzt tool_usage_log.json)
+usage_log = UsageJournal(
+    os.path.join(DATA_DIR, 'tool_usage_journal'),
+    legacy_file=os.path.join(DATA_DIR, 'tool_usage_log.json'),
+)
+
+# Statische Dateien einmal hashen und vorkomprimieren (Fingerabdruck-URLs)
+assets = AssetTable(STATIC_DIR)
 
 
 def get_timestamp_iso():
@@ -29,26 +58,90 @@ def get_timestamp_iso():
     return time.strftime('%Y-%m-%dT%H:%M:%S.000Z')
 
 def load_json(filename: str) -> Any:
-    """Lädt JSON-Datei sicher oder gibt leere Liste zurück"""
-    filepath = os.path.join(DATA_DIR, f"{filename}.json")
+    """Lädt JSON-Datei sicher (über den Sammlungs-Cache) oder gibt leere Liste zurück"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return storage.load(filename)
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Warnung: {filename}.json nicht gefunden oder beschädigt: {e}")
         return []
 
 def save_json(filename: str, data: Any):
     """Speichert Daten als JSON-Datei"""
-    filepath = os.path.join(DATA_DIR, f"{filename}.json")
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        storage.save(filename, data)
         return True
     except Exception as e:
         print(f"Fehler beim Speichern von {filename}.json: {e}")
         return False
 
+def jsonify_collection(filename: str):
+    """Liefert eine Sammlung unter der Lesesperre als JSON-Antwort aus."""
+    with storage.reading(filename) as data:
+        return jsonify(data)
+
+def stream_collection(filename: str, select=None) -> Response:
+    """Liefert eine Sammlung als JSON-Array Eintrag für Eintrag aus.
+
+    Die Antwort wird nicht als Ganzes aufgebaut; das erste Byte geht
+    unabhängig von der Größe der Sammlung sofort raus.
+    """
+    def encode(obj: Any) -> str:
+        return app.json.dumps(obj, separators=(',', ':'))
+
+    return Response(storage.iter_json(filename, encode, select), mimetype='application/json')
+
+def paginate(filename: str, select=None, items=None):
+    """Antwort für ?limit=&cursor= (optional &total=1), sonst None.
+
+    Ohne limit und cursor liefern die Listen-Routen wie bisher alle Einträge.
+    items ist eine bereits gefilterte Liste, die statt der ganzen Sammlung
+    seitenweise ausgeliefert wird.
+    """
+    args = request.args
+    if 'limit' not in args and 'cursor' not in args:
+        return None
+    try:
+        limit = int(args.get('limit', storage.PAGE_LIMIT_DEFAULT))
+    except ValueError:
+        return jsonify({"error": "Ungültiges limit"}), 400
+    with_total = args.get('total', '').lower() in ('1', 'true')
+    try:
+        if items is not None:
+            result = storage.paginate_list(items, limit, args.get('cursor') or None, with_total)
+        else:
+            result = storage.page(filename, limit, args.get('cursor') or None, select, with_total)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(result)
+
+def conditional(*collections: str, extra: Optional[Callable[[], Any]] = None):
+    """ETag aus den Versionen der Sammlungen für GET-Anfragen.
+
+    Passt If-None-Match, wird 304 geantwortet, ohne die Route aufzurufen
+    und ohne Daten zu laden oder zu serialisieren. extra liefert einen
+    weiteren Bestandteil des ETags für Daten außerhalb der Sammlungen.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != 'GET':
+                return view(*args, **kwargs)
+            # Version vor dem Laden: ändert sich die Sammlung dazwischen,
+            # erhält der Client höchstens eine unnötige volle Antwort.
+            tag = storage.etag(*collections)
+            if extra is not None:
+                tag = f"{tag}-{extra()}"
+            if etag_matches(request.if_none_match, tag):
+                response = Response(status=304)
+                response.set_etag(tag)
+                return response
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(tag)
+            return response
+        return wrapper
+    return decorator
+
 def ensure_list(data: Any) -> List[Dict[str, Any]]:
     """Stellt sicher, dass die geladene JSON-Struktur eine Liste ist."""
     if isinstance(data, list):
@@ -58,28 +151,19 @@ def ensure_list(data: Any) -> List[Dict[str, Any]]:
     return []
 
 
-def assign_incremental_id(items: List[Dict[str, Any]]) -> int:
-    """Ermittelt eine neue fortlaufende ID für Listenobjekte."""
-    return max([item.get('id', 0) for item in items], default=0) + 1
+def assign_incremental_id(name: str, items: List[Dict[str, Any]]) -> int:
+    """Vergibt eine neue fortlaufende ID aus der Sequenz der Sammlung."""
+    return storage.next_id(name, items)
 
 
 def log_tool_usage(tool):
     """Protokolliert Tool-Nutzung"""
-    log_entry = {
+    usage_log.append({
         "timestamp": get_timestamp_iso(),
         "tool_id": tool.get('id'),
         "tool_name": tool.get('name', 'Unbekanntes Tool'),
         "tool_path": tool.get('path', '')
-    }
-
-    log_data = load_json('tool_usage_log')
-    log_data.append(log_entry)
-
-    # Nur die letzten 1000 Einträge behalten
-    if len(log_data) > 1000:
-        log_data = log_data[-1000:]
-
-    save_json('tool_usage_log', log_data)
+    })
 
 # =============================================================================
 # STATIC FILE ROUTES (Ersetzt komplexe Frontend-Logik)
@@ -88,79 +172,86 @@ def log_tool_usage(tool):
 @app.route('/')
 def index():
     """Hauptseite ausliefern"""
-    return send_from_directory(STATIC_DIR, 'index.html')
+    return assets.response('index.html') or send_from_directory(STATIC_DIR, 'index.html')
 
 @app.route('/<path:filename>')
 def static_files(filename):
-    """Statische Dateien ausliefern"""
-    return send_from_directory(STATIC_DIR, filename)
+    """Statische Dateien ausliefern (aus der Asset-Tabelle, sonst vom Dateisystem)"""
+    return assets.response(filename) or send_from_directory(STATIC_DIR, filename)
 
 # =============================================================================
 # TOOLS API (Ersetzt komplexe Tool-Management-Logik)
 # =============================================================================
 
 @app.route('/api/tools', methods=['GET'])
+@conditional('tools')
 def get_tools():
-    """Alle Tools laden"""
-    return jsonify(load_json('tools'))
+    """Alle Tools laden (seitenweise mit ?limit=&cursor=)"""
+    return paginate('tools') or stream_collection('tools')
 
 
 @app.route('/api/tools', methods=['POST'])
 def add_tool():
     """Neues Tool hinzufügen"""
     data = request.get_json(force=True, silent=True) or {}
-    tools = ensure_list(load_json('tools'))
 
-    new_id = assign_incremental_id(tools)
-    data.setdefault('created', get_timestamp_iso())
-    data['id'] = new_id
-    data.setdefault('autostart', False)
-    data.setdefault('requiresAdmin', False)
+    with storage.transaction('tools') as tools:
+        tools = ensure_list(tools)
+        new_id = assign_incremental_id('tools', tools)
+        data.setdefault('created', get_timestamp_iso())
+        data['id'] = new_id
+        data.setdefault('autostart', False)
+        data.setdefault('requiresAdmin', False)
 
-    tools.append(data)
-    save_json('tools', tools)
-
-    return jsonify({"success": True, "tool": data}), 201
+        storage.insert_item('tools', tools, data)
+        return jsonify({"success": True, "tool": data}), 201
 
 
 @app.route('/api/tools/<int:tool_id>', methods=['GET', 'PUT', 'DELETE'])
+@conditional('tools')
 def tool_item(tool_id: int):
     """Tool abrufen, aktualisieren oder löschen."""
-    tools = ensure_list(load_json('tools'))
-    idx = next((i for i, tool in enumerate(tools) if tool.get('id') == tool_id), None)
+    if request.method == 'GET':
+        with storage.reading('tools') as tools:
+            tool = storage.find_item('tools', ensure_list(tools), tool_id)
+            if tool is None:
+                return jsonify({"error": "Tool nicht gefunden"}), 404
+            return jsonify(tool)
 
-    if idx is None:
-        return jsonify({"error": "Tool nicht gefunden"}), 404
+    payload = request.get_json(force=True, silent=True) or {}
+    with storage.transaction('tools') as tools:
+        tools = ensure_list(tools)
+        idx = storage.index_of('tools', tools, tool_id)
 
-    if request.method == 'GET':
-        return jsonify(tools[idx])
+        if idx is None:
+            return jsonify({"error": "Tool nicht gefunden"}), 404
 
-    if request.method == 'DELETE':
-        deleted = tools.pop(idx)
-        save_json('tools', tools)
-        return jsonify({"success": True, "tool": deleted})
+        if request.method == 'DELETE':
+            deleted = storage.delete_item('tools', tools, idx)
+            return jsonify({"success": True, "tool": deleted})
 
-    payload = request.get_json(force=True, silent=True) or {}
-    tools[idx].update(payload)
-    tools[idx]['id'] = tool_id
-    save_json('tools', tools)
-    return jsonify({"success": True, "tool": tools[idx]})
+        tools[idx].update(payload)
+        tools[idx]['id'] = tool_id
+        storage.update_item('tools', tools, tools[idx])
+        return jsonify({"success": True, "tool": tools[idx]})
 
 
-def _update_tool_flag(tool_id: int, field: str, value: bool) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-    tools = ensure_list(load_json('tools'))
-    idx = next((i for i, tool in enumerate(tools) if tool.get('id') == tool_id), None)
-    if idx is None:
-        return {}, tools
-    tools[idx][field] = bool(value)
-    save_json('tools', tools)
-    return tools[idx], tools
+def _update_tool_flag(tool_id: int, field: str, value: bool) -> Dict[str, Any]:
+    with storage.transaction('tools') as tools:
+        tools = ensure_list(tools)
+        idx = storage.index_of('tools', tools, tool_id)
+        if idx is None:
+            return {}
+        tools[idx][field] = bool(value)
+        storage.update_item('tools', tools, tools[idx])
+        # Kopie, da die Antwort erst nach Freigabe der Sperre serialisiert wird
+        return dict(tools[idx])
 
 
 @app.route('/api/tools/<int:tool_id>/autostart', methods=['PUT'])
 def toggle_tool_autostart(tool_id: int):
     payload = request.get_json(force=True, silent=True) or {}
-    tool, _ = _update_tool_flag(tool_id, 'autostart', payload.get('autostart', True))
+    tool = _update_tool_flag(tool_id, 'autostart', payload.get('autostart', True))
     if not tool:
         return jsonify({"error": "Tool nicht gefunden"}), 404
     return jsonify({"success": True, "tool": tool})
@@ -169,7 +260,7 @@ def toggle_tool_autostart(tool_id: int):
 @app.route('/api/tools/<int:tool_id>/admin', methods=['PUT'])
 def toggle_tool_admin(tool_id: int):
     payload = request.get_json(force=True, silent=True) or {}
-    tool, _ = _update_tool_flag(tool_id, 'requiresAdmin', payload.get('admin', payload.get('requiresAdmin', True)))
+    tool = _update_tool_flag(tool_id, 'requiresAdmin', payload.get('admin', payload.get('requiresAdmin', True)))
     if not tool:
         return jsonify({"error": "Tool nicht gefunden"}), 404
     return jsonify({"success": True, "tool": tool})
@@ -199,9 +290,18 @@ def _execute_tool(tool: Dict[str, Any]) -> Dict[str, Any]:
         return {"error": f"Fehler beim Starten: {exc}"}
 
 
+@app.route('/api/tool-usage', methods=['GET'])
+@conditional(extra=usage_log.version)
+def get_tool_usage():
+    """Die letzten Tool-Starts (Standard: 1000)"""
+    limit = request.args.get('limit', 1000, type=int)
+    return jsonify(usage_log.tail(limit))
+
+
 def _find_tool(tool_id: int) -> Dict[str, Any]:
-    tools = ensure_list(load_json('tools'))
-    return next((t for t in tools if t.get('id') == tool_id), {})
+    with storage.reading('tools') as tools:
+        tool = storage.find_item('tools', ensure_list(tools), tool_id)
+        return dict(tool) if tool else {}
 
 
 @app.route('/api/tools/<int:tool_id>/start', methods=['POST'])
@@ -231,221 +331,554 @@ def start_tool_by_body():
 # TICKETS API (Ersetzt komplexes Ticket-System)
 # =============================================================================
 
+def _text_key(value: Any):
+    value = str(value).strip()
+    return value or None
+
+def _status_key(value: Any):
+    value = str(value).strip().lower()
+    # Tickets ohne Status gelten im Frontend als "Offen", neue erhalten "open"
+    return 'offen' if value in ('', 'open') else value
+
+CLOSED_STATUSES = ('gelöst', 'geschlossen')
+
+# Sekundärindizes für die Ticket-Filter, vom Speicher-Layer aktuell gehalten
+storage.register_index('tickets', 'status', key=lambda t: t.get('status') or 'offen',
+                       normalize=_status_key)
+storage.register_index('tickets', 'pkz', normalize=_text_key)
+storage.register_index('tickets', 'created_at', 'sorted',
+                       key=lambda t: t.get('created_at') or t.get('created'), normalize=_text_key)
+storage.register_index('tickets', 'updated', 'sorted', normalize=_text_key)
+# Anruferkennung und ?phone=: normalisierte Rufnummer -> Tickets bzw. Kontakte
+storage.register_index('tickets', 'phone_number', key=lambda t: t.get('phone'), normalize=phone_key)
+storage.register_index('telefonbuch', 'phone_number', key=lambda c: c.get('phone'), normalize=phone_key)
+storage.register_index('telefonbuch', 'mobile_number', key=lambda c: c.get('mobile'), normalize=phone_key)
+
+# Query-Parameter -> Index; ?phone= wird wie bei /api/telefonbuch/lookup normalisiert
+TICKET_FILTERS = {'status': 'status', 'pkz': 'pkz', 'phone': 'phone_number'}
+TICKET_SORTS = ('created_at', 'updated')
+
 @app.route('/api/tickets', methods=['GET'])
+@conditional('tickets')
 def get_tickets():
-    """Alle Tickets laden"""
-    return jsonify(load_json('tickets'))
+    """Tickets laden.
+
+    Filter: ?status=&pkz=&phone=&created_from=&created_to= (ISO-Datum, inklusive),
+    Sortierung: ?sort=created_at|updated&order=asc|desc,
+    seitenweise mit ?limit=&cursor=.
+    """
+    args = request.args
+    equals = {index: args[name] for name, index in TICKET_FILTERS.items() if args.get(name)}
+    created_from = args.get('created_from') or None
+    created_to = args.get('created_to') or None
+    if created_to and len(created_to) == 10:
+        # Reines Datum: der ganze Tag gehört dazu
+        created_to += 'T99'
+    sort = args.get('sort') or None
+    if sort is not None and sort not in TICKET_SORTS:
+        return jsonify({"error": f"Sortierung nach {sort} nicht möglich"}), 400
+
+    if not equals and not created_from and not created_to and sort is None:
+        return paginate('tickets') or stream_collection('tickets')
+
+    between = {'created_at': (created_from, created_to)} if created_from or created_to else {}
+    tickets = storage.select('tickets', equals, between, order_by=sort,
+                             descending=args.get('order', 'asc').lower() == 'desc')
+    return paginate('tickets', items=tickets) or jsonify(tickets)
 
 @app.route('/api/tickets', methods=['POST'])
 def add_ticket():
     """Neues Ticket erstellen"""
     data = request.get_json()
-    tickets = load_json('tickets')
-
-    new_id = max([ticket.get('id', 0) for ticket in tickets], default=0) + 1
-    data.update({
-        'id': new_id,
-        'created': get_timestamp_iso(),
-        'status': data.get('status', 'open')
-    })
 
-    tickets.append(data)
-    save_json('tickets', tickets)
+    with storage.transaction('tickets') as tickets:
+        new_id = assign_incremental_id('tickets', tickets)
+        data.update({
+            'id': new_id,
+            'created': get_timestamp_iso(),
+            'status': data.get('status', 'open')
+        })
 
-    return jsonify({"success": True, "ticket": data}), 201
+        storage.insert_item('tickets', tickets, data)
+        return jsonify({"success": True, "ticket": data}), 201
 
 @app.route('/api/tickets/<int:ticket_id>', methods=['PUT'])
 def update_ticket(ticket_id):
     """Ticket aktualisieren"""
     data = request.get_json()
-    tickets = load_json('tickets')
 
-    for i, ticket in enumerate(tickets):
-        if ticket.get('id') == ticket_id:
-            tickets[i].update(data)
-            tickets[i]['updated'] = get_timestamp_iso()
-            save_json('tickets', tickets)
-            return jsonify({"success": True, "ticket": tickets[i]})
+    with storage.transaction('tickets') as tickets:
+        i = storage.index_of('tickets', tickets, ticket_id)
+        if i is None:
+            return jsonify({"error": "Ticket nicht gefunden"}), 404
 
-    return jsonify({"error": "Ticket nicht gefunden"}), 404
+        tickets[i].update(data)
+        tickets[i]['updated'] = get_timestamp_iso()
+        storage.update_item('tickets', tickets, tickets[i])
+        return jsonify({"success": True, "ticket": tickets[i]})
 
 @app.route('/api/tickets/<int:ticket_id>', methods=['DELETE'])
 def delete_ticket(ticket_id):
     """Ticket löschen"""
-    tickets = load_json('tickets')
-    
-    for i, ticket in enumerate(tickets):
-        if ticket.get('id') == ticket_id:
-            deleted_ticket = tickets.pop(i)
-            save_json('tickets', tickets)
-            return jsonify({"success": True, "deleted_ticket": deleted_ticket})
-    
-    return jsonify({"error": "Ticket nicht gefunden"}), 404
+    with storage.transaction('tickets') as tickets:
+        i = storage.index_of('tickets', tickets, ticket_id)
+        if i is None:
+            return jsonify({"error": "Ticket nicht gefunden"}), 404
+
+        deleted_ticket = storage.delete_item('tickets', tickets, i)
+    return jsonify({"success": True, "deleted_ticket": deleted_ticket})
 
 # =============================================================================
 # CONTACTS API (Ersetzt komplexes Telefonbuch)
 # =============================================================================
 
-def _load_contacts() -> List[Dict[str, Any]]:
-    return ensure_list(load_json('telefonbuch'))
-
-
-def _save_contacts(contacts: List[Dict[str, Any]]):
-    save_json('telefonbuch', contacts)
-
-
 @app.route('/api/telefonbuch', methods=['GET'])
+@conditional('telefonbuch')
 def get_phonebook():
-    return jsonify(_load_contacts())
+    return paginate('telefonbuch', ensure_list) or stream_collection('telefonbuch', ensure_list)
+
+
+@app.route('/api/telefonbuch/lookup', methods=['GET'])
+@conditional('telefonbuch', 'tickets')
+def lookup_phone_number():
+    """Anruferkennung: ?number= -> passende Kontakte und Ticket-IDs.
+
+    Nachschlagen über Hash-Indizes auf der normalisierten Rufnummer, ohne
+    Telefonbuch oder Tickets zu durchsuchen.
+    """
+    number = request.args.get('number', '')
+    normalized = phone_key(number)
+    if normalized is None:
+        return jsonify({"error": "Rufnummer (number) erforderlich"}), 400
+
+    contacts = storage.select('telefonbuch', {'phone_number': normalized})
+    seen = {contact.get('id') for contact in contacts}
+    contacts += [contact for contact in storage.select('telefonbuch', {'mobile_number': normalized})
+                 if contact.get('id') not in seen]
+    tickets = storage.select('tickets', {'phone_number': normalized})
+    return jsonify({
+        "number": number,
+        "normalized": normalized,
+        "contacts": contacts,
+        "tickets": [ticket.get('id') for ticket in tickets],
+        "open_tickets": [ticket.get('id') for ticket in tickets
+                         if _status_key(ticket.get('status') or '') not in CLOSED_STATUSES],
+    })
 
 
 @app.route('/api/telefonbuch', methods=['POST'])
 def add_phonebook_entry():
     data = request.get_json(force=True, silent=True) or {}
-    contacts = _load_contacts()
 
-    new_id = assign_incremental_id(contacts)
-    data['id'] = new_id
-    data.setdefault('created', get_timestamp_iso())
+    with storage.transaction('telefonbuch') as contacts:
+        contacts = ensure_list(contacts)
+        new_id = assign_incremental_id('telefonbuch', contacts)
+        data['id'] = new_id
+        data.setdefault('created', get_timestamp_iso())
 
-    contacts.append(data)
-    _save_contacts(contacts)
-    return jsonify({"success": True, "contact": data}), 201
+        storage.insert_item('telefonbuch', contacts, data)
+        return jsonify({"success": True, "contact": data}), 201
 
 
 @app.route('/api/telefonbuch/<int:contact_id>', methods=['PUT', 'DELETE'])
 def modify_phonebook_entry(contact_id: int):
-    contacts = _load_contacts()
-    idx = next((i for i, contact in enumerate(contacts) if contact.get('id') == contact_id), None)
+    payload = request.get_json(force=True, silent=True) or {}
 
-    if idx is None:
-        return jsonify({"error": "Kontakt nicht gefunden"}), 404
+    with storage.transaction('telefonbuch') as contacts:
+        contacts = ensure_list(contacts)
+        idx = storage.index_of('telefonbuch', contacts, contact_id)
 
-    if request.method == 'DELETE':
-        removed = contacts.pop(idx)
-        _save_contacts(contacts)
-        return jsonify({"success": True, "contact": removed})
+        if idx is None:
+            return jsonify({"error": "Kontakt nicht gefunden"}), 404
 
-    payload = request.get_json(force=True, silent=True) or {}
-    contacts[idx].update(payload)
-    contacts[idx]['id'] = contact_id
-    _save_contacts(contacts)
-    return jsonify({"success": True, "contact": contacts[idx]})
+        if request.method == 'DELETE':
+            removed = storage.delete_item('telefonbuch', contacts, idx)
+            return jsonify({"success": True, "contact": removed})
+
+        contacts[idx].update(payload)
+        contacts[idx]['id'] = contact_id
+        storage.update_item('telefonbuch', contacts, contacts[idx])
+        return jsonify({"success": True, "contact": contacts[idx]})
 
 
 @app.route('/api/contacts', methods=['GET'])
 def get_contacts_alias():
     """Alias für Legacy-Frontend-Aufrufe."""
-    return jsonify(_load_contacts())
+    return get_phonebook()
 
 
 @app.route('/api/contacts', methods=['POST'])
 def create_contact_alias():
     return add_phonebook_entry()
 
+# =============================================================================
+# BULK API (viele Änderungen mit einem Lade- und einem Schreibvorgang)
+# =============================================================================
+
+BULK_MODULES = ('tickets', 'telefonbuch', 'tools', 'faq')
+BULK_ALIASES = {'contacts': 'telefonbuch'}
+BULK_OPS = ('create', 'update', 'delete')
+BULK_MAX = 5000
+
+
+def _bulk_prepare(module: str, op: str, item: Dict[str, Any], now: str):
+    """Vorbelegung wie bei den Einzel-Routen (POST bzw. PUT)."""
+    if op == 'create':
+        if module == 'tickets':
+            item['created'] = now
+            item['status'] = item.get('status', 'open')
+        elif module == 'faq':
+            item['created'] = now
+        else:
+            item.setdefault('created', now)
+        if module == 'tools':
+            item.setdefault('autostart', False)
+            item.setdefault('requiresAdmin', False)
+    elif op == 'update' and module == 'tickets':
+        item['updated'] = now
+
+
+def _bulk_errors(module: str, items: List[Dict[str, Any]],
+                 operations: List[Any]) -> List[Tuple[int, str]]:
+    """Prüft alle Operationen vorab: (Status, Fehler) je ungültiger, sonst (0, '')."""
+    errors = []
+    deleted = set()
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get('op') not in BULK_OPS:
+            errors.append((400, f"op muss einer von {', '.join(BULK_OPS)} sein"))
+            continue
+        op = operation['op']
+        if op != 'delete' and not isinstance(operation.get('data'), dict):
+            errors.append((400, "data (Objekt) erforderlich"))
+            continue
+        if op == 'create':
+            errors.append((0, ''))
+            continue
+        item_id = operation.get('id')
+        if isinstance(item_id, bool) or not isinstance(item_id, int):
+            errors.append((400, "id (Zahl) erforderlich"))
+        elif item_id in deleted or storage.index_of(module, items, item_id) is None:
+            errors.append((404, f"Eintrag {item_id} nicht gefunden"))
+        else:
+            if op == 'delete':
+                deleted.add(item_id)
+            errors.append((0, ''))
+    return errors
+
+
+@app.route('/api/<module>/bulk', methods=['POST'])
+def bulk_operations(module: str):
+    """Mehrere Änderungen an einer Sammlung als eine Einheit.
+
+    Body: Liste (oder {"operations": [...]}) aus {"op": "create", "data": {...}},
+    {"op": "update", "id": 1, "data": {...}} und {"op": "delete", "id": 1}.
+    Alle Operationen werden vorab geprüft; ist eine ungültig, wird nichts
+    geschrieben (400, status/error je Operation, None bei gültigen). Sonst
+    wird die Sammlung einmal geladen und einmal atomar geschrieben.
+    results enthält je Operation Status und Eintrag.
+    """
+    module = BULK_ALIASES.get(module, module)
+    if module not in BULK_MODULES:
+        return jsonify({"error": f"Bulk-Operationen für {module} nicht verfügbar"}), 404
+    payload = request.get_json(force=True, silent=True)
+    operations = payload.get('operations') if isinstance(payload, dict) else payload
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "Liste von Operationen erforderlich"}), 400
+    if len(operations) > BULK_MAX:
+        return jsonify({"error": f"Höchstens {BULK_MAX} Operationen je Anfrage"}), 400
+
+    with storage.transaction(module) as items:
+        items = ensure_list(items)
+        errors = _bulk_errors(module, items, operations)
+        if any(status for status, _ in errors):
+            return jsonify({"success": False, "results": [
+                {"index": i, "op": op.get('op') if isinstance(op, dict) else None,
+                 "status": status or None, "error": error or None}
+                for i, (op, (status, error)) in enumerate(zip(operations, errors))
+            ]}), 400
+
+        now = get_timestamp_iso()
+        new_ids = iter(storage.next_ids(module, sum(op['op'] == 'create' for op in operations), items))
+        results = []
+        changes = []
+        delete_positions = set()
+        for i, operation in enumerate(operations):
+            op = operation['op']
+            if op == 'create':
+                item = dict(operation['data'])
+                item['id'] = next(new_ids)
+                _bulk_prepare(module, op, item, now)
+                items.append(item)
+                changes.append(('insert', item))
+                results.append({"index": i, "op": op, "status": 201, "item": item})
+                continue
+            pos = storage.index_of(module, items, operation['id'])
+            if op == 'delete':
+                # Erst nach allen anderen Operationen entfernen, damit die Positionen gültig bleiben
+                delete_positions.add(pos)
+                results.append({"index": i, "op": op, "status": 200, "item": items[pos]})
+                continue
+            item = items[pos]
+            item.update(operation['data'])
+            item['id'] = operation['id']
+            _bulk_prepare(module, op, item, now)
+            changes.append(('update', item))
+            results.append({"index": i, "op": op, "status": 200, "item": item})
+
+        if delete_positions:
+            changes.extend(('delete', items[pos]) for pos in delete_positions)
+            items[:] = [item for pos, item in enumerate(items) if pos not in delete_positions]
+        storage.commit_batch(module, items, changes)
+        return jsonify({"success": True, "results": results})
+
 # =============================================================================
 # NETWORK API (Ersetzt komplexe Netzwerk-Funktionen)
 # =============================================================================
 
+# Vorgaben für fehlende Einträge in network_settings.json
+NETWORK_DEFAULTS = {
+    "scan_subnet": "192.168.1.0/24",
+    "network_scan_timeout": 1,
+    "scan_concurrency": 64,
+    "ping_timeout": 1,
+    "ping_cache_ttl": 10,
+    "monitor_interval": 60,
+    "monitor_concurrency": 32,
+    "probe_ports": list(prober.DEFAULT_PORTS),
+}
+
+_scan_lock = threading.Lock()
+
+# Hostnamen der Geräte (Rückwärtsauflösung mit Cache, siehe resolver.py)
+hostnames = Resolver()
+
+# Ping-Ergebnisse je (Host, Anzahl); gleichzeitige Pings desselben Hosts teilen sich eine Prüfung
+ping_cache = TTLCache(ttl=NETWORK_DEFAULTS["ping_cache_ttl"])
+
+
+def network_settings() -> Dict[str, Any]:
+    """Netzwerk-Einstellungen, ergänzt um NETWORK_DEFAULTS (Kopie)."""
+    settings = dict(NETWORK_DEFAULTS)
+    with storage.reading('network_settings', default=dict) as stored:
+        if isinstance(stored, dict):
+            settings.update(stored)
+    return settings
+
+
+# Status aller Geräte, periodisch im Hintergrund geprüft (gestartet in __main__)
+device_monitor = DeviceMonitor(network_settings, get_timestamp_iso)
+
 @app.route('/api/network/settings', methods=['GET'])
+@conditional('network_settings')
 def get_network_settings():
     """Netzwerk-Einstellungen laden"""
-    return jsonify(load_json('network_settings'))
+    return jsonify_collection('network_settings')
 
 @app.route('/api/network/devices', methods=['GET'])
+@conditional('network_devices', extra=lambda: f"{hostnames.generation}-{device_monitor.generation}")
 def get_network_devices():
-    """Netzwerk-Geräte laden"""
-    return jsonify(load_json('network_devices'))
+    """Netzwerk-Geräte mit aktuellem Status aus der Überwachung und Hostnamen aus dem DNS-Cache.
+
+    Es wird weder geprüft noch auf DNS gewartet: noch unbekannte Namen
+    werden im Hintergrund aufgelöst und erscheinen (mit neuem ETag) bei
+    der nächsten Anfrage.
+    """
+    with storage.reading('network_devices') as devices:
+        devices = device_monitor.devices([device for device in ensure_list(devices) if isinstance(device, dict)])
+        names = hostnames.known(netscan.device_address(device) for device in devices)
+        return jsonify([
+            {**device, "hostname": device.get('hostname') or names.get(netscan.device_address(device))}
+            for device in devices
+        ])
+
+@app.route('/api/network/scan', methods=['POST'])
+def scan_network():
+    """Subnetz nach erreichbaren Geräten durchsuchen.
+
+    Body (optional): {"subnet": "192.168.1.0/24", "concurrency": 64};
+    Standard aus network_settings (scan_subnet, scan_concurrency,
+    network_scan_timeout, probe_ports). Die Antwort ist ein Strom aus
+    JSON-Zeilen: "host" je gefundenem Gerät, regelmäßig "progress" und
+    zum Schluss "done". Gefundene Geräte werden am Ende mit einem
+    Schreibvorgang in network_devices übernommen.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    settings = network_settings()
+    try:
+        addresses = netscan.hosts(payload.get('subnet') or settings['scan_subnet'])
+        concurrency = int(payload.get('concurrency') or settings['scan_concurrency'])
+        timeout = float(settings['network_scan_timeout'])
+        ports = [int(port) for port in settings['probe_ports']]
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Ungültige Scan-Einstellungen: {e}"}), 400
+    if not _scan_lock.acquire(blocking=False):
+        return jsonify({"error": "Es läuft bereits ein Scan"}), 409
+
+    def probe(address: str):
+        result = prober.probe(address, 1, timeout, ports)
+        if not result["reachable"]:
+            return None
+        found = {"method": result["method"], "rtt_ms": result["rtt_ms"]["avg"]}
+        if result.get("port"):
+            found["port"] = result["port"]
+        return found
+
+    def line(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj, ensure_ascii=False) + '\n'
+
+    started = threading.Event()
+
+    def stream():
+        started.set()
+        start = time.monotonic()
+        online: Dict[str, Dict[str, Any]] = {}
+        done = 0
+        last_progress = start
+        complete = False
+        changes: List[Tuple[str, Dict[str, Any]]] = []
+        try:
+            yield line({"type": "start", "total": len(addresses), "concurrency": concurrency})
+            for address, result in netscan.sweep(addresses, probe, concurrency):
+                done += 1
+                if result is not None:
+                    online[address] = result
+                    yield line({"type": "host", "ip": address, **result})
+                now = time.monotonic()
+                if now - last_progress >= 0.5 or done == len(addresses):
+                    last_progress = now
+                    yield line({"type": "progress", "done": done, "total": len(addresses), "found": len(online)})
+            complete = True
+        finally:
+            try:
+                # Nur ein vollständiger Scan markiert nicht gefundene Geräte als offline
+                with storage.transaction('network_devices') as devices:
+                    devices = ensure_list(devices)
+                    changes = netscan.merge_devices(devices, online, addresses if complete else online,
+                                                    get_timestamp_iso())
+                    if changes:
+                        storage.commit_batch('network_devices', devices, changes)
+            finally:
+                _scan_lock.release()
+        yield line({
+            "type": "done",
+            "found": len(online),
+            "added": sum(op == 'insert' for op, _ in changes),
+            "updated": sum(op == 'update' for op, _ in changes),
+            "duration_ms": round((time.monotonic() - start) * 1000),
+        })
+
+    def release_unstarted():
+        # Bricht der Client vor dem ersten Lesen ab, läuft stream() nie und
+        # sein finally gibt die Sperre nicht frei
+        if not started.is_set():
+            _scan_lock.release()
+
+    response = Response(stream(), mimetype='application/x-ndjson',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(release_unstarted)
+    return response
 
 @app.route('/api/network/ping', methods=['POST'])
 def ping_device():
-    """Gerät anpingen (Docker-kompatibel)"""
-    data = request.get_json()
-    host = data.get('host', '')
+    """Gerät auf Erreichbarkeit prüfen (ICMP, sonst TCP; siehe prober.py).
+
+    Body: {"host": ..., "count": 1}; "deviceId" bzw. "target" der älteren
+    Frontends werden ebenfalls akzeptiert. Wartezeit je Antwort und
+    TCP-Ports stammen aus network_settings (ping_timeout, probe_ports).
+    Ergebnisse werden ping_cache_ttl Sekunden zwischengespeichert
+    ("cached": true); gleichzeitige Anfragen für denselben Host warten auf
+    dieselbe Prüfung.
+    """
+    data = request.get_json(force=True, silent=True) or {}
+    host = str(data.get('host') or data.get('deviceId') or data.get('target') or '').strip()
 
     if not host:
         return jsonify({"error": "Host-Parameter fehlt"}), 400
 
+    settings = network_settings()
     try:
-        # Vereinfachter Ping für Docker
-        result = subprocess.run(['ping', '-c', '1', host],
-                              capture_output=True, text=True, timeout=5)
-
-        success = result.returncode == 0
-        return jsonify({
-            "success": success,
-            "host": host,
-            "message": "Ping erfolgreich" if success else "Ping fehlgeschlagen",
-            "output": result.stdout[:200]
-        })
-
-    except subprocess.TimeoutExpired:
-        return jsonify({"error": "Ping Zeitüberschreitung"}), 500
+        count = min(max(int(data.get('count') or 1), 1), 10)
+        timeout = float(settings['ping_timeout'])
+        ports = [int(port) for port in settings['probe_ports']]
+        result, source = ping_cache.fetch(
+            (host.lower(), count),
+            lambda: prober.probe(host, count, timeout, ports),
+            ttl=float(settings['ping_cache_ttl']))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": f"Ungültige Ping-Parameter: {e}"}), 400
     except Exception as e:
         return jsonify({"error": f"Ping-Fehler: {str(e)}"}), 500
 
+    success = result["reachable"]
+    return jsonify({
+        **result,
+        "cached": source != 'miss',
+        "success": success,
+        "message": "Ping erfolgreich" if success else "Ping fehlgeschlagen",
+        "output": prober.summary(result),
+    })
+
 # =============================================================================
 # FAQ API (Ersetzt komplexe FAQ-Verwaltung)
 # =============================================================================
 
 @app.route('/api/faq', methods=['GET'])
+@conditional('faq')
 def get_faq():
-    """FAQ-Einträge laden"""
-    return jsonify(load_json('faq'))
+    """FAQ-Einträge laden (seitenweise mit ?limit=&cursor=)"""
+    return paginate('faq') or jsonify_collection('faq')
 
 @app.route('/api/faq', methods=['POST'])
 def add_faq():
     """FAQ-Eintrag hinzufügen"""
     data = request.get_json()
-    faq = load_json('faq')
-
-    new_id = max([item.get('id', 0) for item in faq], default=0) + 1
-    data.update({
-        'id': new_id,
-        'created': get_timestamp_iso()
-    })
 
-    faq.append(data)
-    save_json('faq', faq)
+    with storage.transaction('faq') as faq:
+        new_id = assign_incremental_id('faq', faq)
+        data.update({
+            'id': new_id,
+            'created': get_timestamp_iso()
+        })
 
-    return jsonify({"success": True, "faq_item": data}), 201
+        storage.insert_item('faq', faq, data)
+        return jsonify({"success": True, "faq_item": data}), 201
 
 # =============================================================================
 # WORKSPACES API (Ersetzt komplexe Workspace-Verwaltung)
 # =============================================================================
 
 @app.route('/api/workspaces', methods=['GET'])
+@conditional('tools', 'working_sets')
 def get_workspaces():
     """Alle Workspaces mit ihren zugeordneten Tools abrufen"""
     try:
         print("DEBUG: get_workspaces called")
-        tools = load_json('tools')
-        working_sets = load_json('working_sets')
-        print(f"DEBUG: Loaded {len(tools)} tools")
+        with storage.reading('tools') as tools, storage.reading('working_sets') as working_sets:
+            print(f"DEBUG: Loaded {len(tools)} tools")
         
-        # Filtere nur Workspaces
-        workspaces = [tool for tool in tools if tool.get('type') == 'workspace']
-        print(f"DEBUG: Found {len(workspaces)} workspaces")
+            # Filtere nur Workspaces (Kopien, da die Tools aus dem Cache stammen)
+            workspaces = [dict(tool) for tool in tools if tool.get('type') == 'workspace']
+            print(f"DEBUG: Found {len(workspaces)} workspaces")
         
-        # Füge zugeordnete Tools zu jedem Workspace hinzu
-        for workspace in workspaces:
-            workspace_id = workspace.get('id')
-            # Finde das entsprechende Working Set
-            working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workspace_id), None)
-            if working_set and 'tools' in working_set:
-                # Lade die vollständigen Tool-Informationen
-                tool_ids = working_set['tools']
-                workspace_tools = []
-                for tool_id in tool_ids:
-                    tool = next((t for t in tools if t.get('id') == tool_id), None)
-                    if tool:
-                        workspace_tools.append(tool)
-                workspace['tools'] = workspace_tools
-            else:
-                workspace['tools'] = []
+            # Füge zugeordnete Tools zu jedem Workspace hinzu
+            for workspace in workspaces:
+                workspace_id = workspace.get('id')
+                # Finde das entsprechende Working Set
+                working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workspace_id), None)
+                if working_set and 'tools' in working_set:
+                    # Lade die vollständigen Tool-Informationen
+                    tool_ids = working_set['tools']
+                    workspace_tools = []
+                    for tool_id in tool_ids:
+                        tool = storage.find_item('tools', tools, tool_id)
+                        if tool:
+                            workspace_tools.append(tool)
+                    workspace['tools'] = workspace_tools
+                else:
+                    workspace['tools'] = []
         
-        print(f"DEBUG: Returning {len(workspaces)} workspaces")
-        return jsonify(workspaces)
+            print(f"DEBUG: Returning {len(workspaces)} workspaces")
+            return jsonify(workspaces)
     except Exception as e:
         print(f"Fehler in get_workspaces: {e}")
         return jsonify({"error": str(e)}), 500
@@ -454,18 +887,16 @@ def get_workspaces():
 def create_workspace():
     """Workspace erstellen"""
     data = request.get_json()
-    workspaces = load_json('workspaces')
-
-    new_id = max([ws.get('id', 0) for ws in workspaces], default=0) + 1
-    data.update({
-        'id': new_id,
-        'created': get_timestamp_iso()
-    })
 
-    workspaces.append(data)
-    save_json('workspaces', workspaces)
+    with storage.transaction('workspaces') as workspaces:
+        new_id = assign_incremental_id('workspaces', workspaces)
+        data.update({
+            'id': new_id,
+            'created': get_timestamp_iso()
+        })
 
-    return jsonify({"success": True, "workspace": data}), 201
+        storage.insert_item('workspaces', workspaces, data)
+        return jsonify({"success": True, "workspace": data}), 201
 
 
 # =============================================================================
@@ -473,30 +904,32 @@ def create_workspace():
 # =============================================================================
 
 @app.route('/api/worksets', methods=['GET'])
+@conditional('tools', 'worksets')
 def get_worksets():
     """Alle Worksets mit ihren zugeordneten Tools abrufen"""
     try:
         print("DEBUG: get_worksets called")
-        tools = load_json('tools')
-        worksets = load_json('worksets')
-        print(f"DEBUG: Loaded {len(tools)} tools and {len(worksets)} worksets")
+        with storage.reading('tools') as tools, storage.reading('worksets') as worksets:
+            # Kopien, da die Worksets aus dem Cache stammen und 'tools' ersetzt wird
+            worksets = [dict(ws) for ws in worksets]
+            print(f"DEBUG: Loaded {len(tools)} tools and {len(worksets)} worksets")
         
-        # Füge zugeordnete Tools zu jedem Workset hinzu
-        for workset in worksets:
-            if 'tools' in workset and workset['tools']:
-                # Lade die vollständigen Tool-Informationen
-                tool_ids = workset['tools']
-                workset_tools = []
-                for tool_id in tool_ids:
-                    tool = next((t for t in tools if t.get('id') == tool_id), None)
-                    if tool:
-                        workset_tools.append(tool)
-                workset['tools'] = workset_tools
-            else:
-                workset['tools'] = []
+            # Füge zugeordnete Tools zu jedem Workset hinzu
+            for workset in worksets:
+                if 'tools' in workset and workset['tools']:
+                    # Lade die vollständigen Tool-Informationen
+                    tool_ids = workset['tools']
+                    workset_tools = []
+                    for tool_id in tool_ids:
+                        tool = storage.find_item('tools', tools, tool_id)
+                        if tool:
+                            workset_tools.append(tool)
+                    workset['tools'] = workset_tools
+                else:
+                    workset['tools'] = []
         
-        print(f"DEBUG: Returning {len(worksets)} worksets")
-        return jsonify(worksets)
+            print(f"DEBUG: Returning {len(worksets)} worksets")
+            return jsonify(worksets)
     except Exception as e:
         print(f"Fehler in get_worksets: {e}")
         return jsonify({"error": str(e)}), 500
@@ -505,19 +938,17 @@ def get_worksets():
 def create_workset():
     """Workset erstellen"""
     data = request.get_json()
-    worksets = load_json('worksets')
-
-    new_id = max([ws.get('id', 0) for ws in worksets], default=0) + 1
-    data.update({
-        'id': new_id,
-        'created': get_timestamp_iso(),
-        'tools': data.get('tools', [])  # Liste der zugewiesenen Tool-IDs
-    })
 
-    worksets.append(data)
-    save_json('worksets', worksets)
+    with storage.transaction('worksets') as worksets:
+        new_id = assign_incremental_id('worksets', worksets)
+        data.update({
+            'id': new_id,
+            'created': get_timestamp_iso(),
+            'tools': data.get('tools', [])  # Liste der zugewiesenen Tool-IDs
+        })
 
-    return jsonify({"success": True, "workset": data}), 201
+        storage.insert_item('worksets', worksets, data)
+        return jsonify({"success": True, "workset": data}), 201
 
 @app.route('/api/worksets/<int:workset_id>/tools', methods=['POST'])
 def add_tool_to_workset(workset_id: int):
@@ -528,51 +959,163 @@ def add_tool_to_workset(workset_id: int):
     if not tool_id:
         return jsonify({"error": "tool_id erforderlich"}), 400
     
-    worksets = load_json('worksets')
-    workset = next((ws for ws in worksets if ws.get('id') == workset_id), None)
-    
-    if not workset:
-        return jsonify({"error": "Workset nicht gefunden"}), 404
-    
-    if 'tools' not in workset:
-        workset['tools'] = []
-    
-    if tool_id not in workset['tools']:
-        workset['tools'].append(tool_id)
-        save_json('worksets', worksets)
-    
-    return jsonify({"success": True, "workset": workset})
+    with storage.transaction('worksets') as worksets:
+        workset = storage.find_item('worksets', worksets, workset_id)
+
+        if not workset:
+            return jsonify({"error": "Workset nicht gefunden"}), 404
+
+        if 'tools' not in workset:
+            workset['tools'] = []
+
+        if tool_id not in workset['tools']:
+            workset['tools'].append(tool_id)
+            storage.update_item('worksets', worksets, workset)
+
+        return jsonify({"success": True, "workset": workset})
 
 @app.route('/api/worksets/<int:workset_id>/tools/<int:tool_id>', methods=['DELETE'])
 def remove_tool_from_workset(workset_id: int, tool_id: int):
     """Tool aus Workset entfernen"""
-    worksets = load_json('worksets')
-    workset = next((ws for ws in worksets if ws.get('id') == workset_id), None)
-    
-    if not workset:
-        return jsonify({"error": "Workset nicht gefunden"}), 404
-    
-    if 'tools' in workset and tool_id in workset['tools']:
-        workset['tools'].remove(tool_id)
-        save_json('worksets', worksets)
-    
-    return jsonify({"success": True, "workset": workset})
+    with storage.transaction('worksets') as worksets:
+        workset = storage.find_item('worksets', worksets, workset_id)
+
+        if not workset:
+            return jsonify({"error": "Workset nicht gefunden"}), 404
+
+        if 'tools' in workset and tool_id in workset['tools']:
+            workset['tools'].remove(tool_id)
+            storage.update_item('worksets', worksets, workset)
+
+        return jsonify({"success": True, "workset": workset})
 
 
 @app.route('/api/drucker', methods=['GET'])
+@conditional('drucker')
 def get_printers_legacy():
     """Liefert Drucker-Daten für das Frontend."""
-    return jsonify(load_json('drucker'))
+    return jsonify_collection('drucker')
 
 
 @app.route('/api/printers', methods=['GET'])
+@conditional('printers')
 def get_printers():
-    return jsonify(load_json('printers'))
+    return jsonify_collection('printers')
 
 
 @app.route('/api/netzwerk', methods=['GET'])
+@conditional('netzwerk')
 def get_netzwerk():
-    return jsonify(load_json('netzwerk'))
+    return jsonify_collection('netzwerk')
+
+# =============================================================================
+# SUCHE API (Volltext über Tickets, FAQ, Telefonbuch, Tools)
+# =============================================================================
+
+search.register()
+
+@app.route('/api/search', methods=['GET'])
+@conditional(*search.SOURCES)
+def api_search():
+    """Volltextsuche: ?q=&type=tickets,faq,telefonbuch,tools&limit="""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"error": "Suchbegriff (q) erforderlich"}), 400
+    types = [t for t in request.args.get('type', '').split(',') if t] or None
+    if types and any(t not in search.SOURCES for t in types):
+        return jsonify({"error": f"Unbekannter Typ, erlaubt: {', '.join(search.SOURCES)}"}), 400
+    try:
+        limit = int(request.args.get('limit', search.LIMIT_DEFAULT))
+    except ValueError:
+        return jsonify({"error": "Ungültiges limit"}), 400
+    limit = max(1, min(limit, search.LIMIT_MAX))
+    return jsonify(search.search(query, types, limit))
+
+@app.route('/api/autocomplete', methods=['GET'])
+@conditional(*search.COMPLETIONS)
+def api_autocomplete():
+    """Vorschläge für Eingabefelder: ?field=&q=&type=&limit=
+
+    Felder: name, group, department (Telefonbuch), pkz, headerText
+    (Tickets), phone (beide).
+    """
+    field = request.args.get('field', '')
+    if not any(field in fields for fields in search.COMPLETIONS.values()):
+        allowed = sorted({f for fields in search.COMPLETIONS.values() for f in fields})
+        return jsonify({"error": f"Unbekanntes Feld, erlaubt: {', '.join(allowed)}"}), 400
+    types = [t for t in request.args.get('type', '').split(',') if t] or None
+    if types and any(t not in search.COMPLETIONS for t in types):
+        return jsonify({"error": f"Unbekannter Typ, erlaubt: {', '.join(search.COMPLETIONS)}"}), 400
+    try:
+        limit = int(request.args.get('limit', search.COMPLETE_LIMIT_DEFAULT))
+    except ValueError:
+        return jsonify({"error": "Ungültiges limit"}), 400
+    limit = max(1, min(limit, search.COMPLETE_LIMIT_MAX))
+    return jsonify(search.complete(field, request.args.get('q', ''), types, limit))
+
+# =============================================================================
+# EVENTS API (Server-Sent Events statt Polling)
+# =============================================================================
+
+EVENTS_HEARTBEAT = float(os.environ.get('HELPTOOL_EVENTS_HEARTBEAT', '15'))
+
+
+def _event_position(value: str):
+    """Position aus Last-Event-ID bzw. ?since= ("<epoch>-<seq>" oder "<seq>"); None wenn ungültig."""
+    epoch, _, seq = value.rpartition('-')
+    if epoch and epoch != storage.feed.epoch:
+        # Aus einem früheren Prozessstart: alles nachladen
+        return -1
+    try:
+        return int(seq)
+    except ValueError:
+        return None
+
+
+@app.route('/api/events', methods=['GET'])
+def api_events():
+    """Änderungen an Sammlungen als Server-Sent Events.
+
+    Jede Änderung kommt als "change" mit module, id, op und version.
+    Ab einer bestimmten Position fortsetzen: Last-Event-ID (setzt
+    EventSource beim Wiederverbinden selbst) oder ?since=; ohne Angabe
+    nur neue Änderungen. ?modules=tickets,faq filtert. Lässt sich nicht
+    lückenlos fortsetzen, folgt "reset" (Client lädt neu). Ohne Änderungen
+    hält alle HELPTOOL_EVENTS_HEARTBEAT Sekunden (15) ein Kommentar die
+    Verbindung offen.
+    """
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    position = storage.feed.latest() if not since else _event_position(since)
+    if position is None:
+        return jsonify({"error": "Ungültige Position (since)"}), 400
+    modules = {m for m in request.args.get('modules', '').split(',') if m} or None
+    feed = storage.feed
+
+    def reset_event(seq: int) -> str:
+        return f"id: {feed.epoch}-{seq}\nevent: reset\ndata: {{}}\n\n"
+
+    def stream():
+        seq = position
+        yield "retry: 3000\n\n"
+        if seq < 0:
+            seq = feed.latest()
+            yield reset_event(seq)
+        while True:
+            events, seq, reset = feed.since(seq, EVENTS_HEARTBEAT)
+            if reset:
+                yield reset_event(seq)
+                continue
+            sent = False
+            for event in events:
+                if modules is None or event['module'] in modules:
+                    sent = True
+                    yield (f"id: {feed.epoch}-{event['seq']}\nevent: change\n"
+                           f"data: {json.dumps(event, ensure_ascii=False)}\n\n")
+            if not sent:
+                yield ": heartbeat\n\n"
+
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 # =============================================================================
 # SYSTEM INFO API (Ersetzt komplexe System-Checks)
@@ -587,6 +1130,11 @@ def get_system_info():
         "data_dir": DATA_DIR,
         "base_dir": BASE_DIR,
         "uptime": get_timestamp_iso(),
+        "cache": storage.cache_stats(),
+        "compression": dict(compression.stats),
+        "ping_cache": ping_cache.stats(),
+        "dns_cache": hostnames.stats(),
+        "device_monitor": device_monitor.stats(),
         "features": {
             "tools": True,
             "tickets": True,
@@ -612,26 +1160,26 @@ def internal_error(error):
 # =============================================================================
 
 @app.route('/api/worksets/<int:workset_id>/tools', methods=['GET'])
+@conditional('tools', 'working_sets')
 def api_get_workset_tools(workset_id):
     """Tools eines bestimmten Worksets abrufen"""
     try:
-        tools = load_json('tools')
-        working_sets = load_json('working_sets')
+        with storage.reading('tools') as tools, storage.reading('working_sets') as working_sets:
         
-        # Finde das Working Set
-        working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
-        if not working_set:
-            return jsonify([])
+            # Finde das Working Set
+            working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
+            if not working_set:
+                return jsonify([])
         
-        # Lade die vollständigen Tool-Informationen
-        tool_ids = working_set.get('tools', [])
-        workset_tools = []
-        for tool_id in tool_ids:
-            tool = next((t for t in tools if t.get('id') == tool_id), None)
-            if tool:
-                workset_tools.append(tool)
+            # Lade die vollständigen Tool-Informationen
+            tool_ids = working_set.get('tools', [])
+            workset_tools = []
+            for tool_id in tool_ids:
+                tool = storage.find_item('tools', tools, tool_id)
+                if tool:
+                    workset_tools.append(tool)
         
-        return jsonify(workset_tools)
+            return jsonify(workset_tools)
     except Exception as e:
         print(f"Fehler in api_get_workset_tools: {e}")
         return jsonify({"error": str(e)}), 500
@@ -646,36 +1194,35 @@ def api_add_tool_to_workset(workset_id):
         if not tool_id:
             return jsonify({"error": "Tool-ID erforderlich"}), 400
         
-        # Überprüfe ob Tool existiert
-        tools = load_json('tools')
-        tool = next((t for t in tools if t.get('id') == tool_id), None)
-        if not tool:
-            return jsonify({"error": "Tool nicht gefunden"}), 404
-        
-        # Überprüfe ob Workspace existiert
-        workspace = next((t for t in tools if t.get('id') == workset_id and t.get('type') == 'workspace'), None)
-        if not workspace:
-            return jsonify({"error": "Workspace nicht gefunden"}), 404
-        
+        with storage.reading('tools') as tools:
+            # Überprüfe ob Tool existiert
+            tool = storage.find_item('tools', tools, tool_id)
+            if not tool:
+                return jsonify({"error": "Tool nicht gefunden"}), 404
+
+            # Überprüfe ob Workspace existiert
+            workspace = storage.find_item('tools', tools, workset_id)
+            if not workspace or workspace.get('type') != 'workspace':
+                return jsonify({"error": "Workspace nicht gefunden"}), 404
+
         # Lade Working Sets
-        working_sets = load_json('working_sets')
-        
-        # Finde oder erstelle Working Set für diesen Workspace
-        working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
-        if not working_set:
-            working_set = {
-                'workspace_id': workset_id,
-                'tools': []
-            }
-            working_sets.append(working_set)
-        
-        # Füge Tool hinzu, falls noch nicht vorhanden
-        if tool_id not in working_set['tools']:
-            working_set['tools'].append(tool_id)
-            save_json('working_sets', working_sets)
-            return jsonify({"success": True, "message": "Tool erfolgreich hinzugefügt"})
-        else:
-            return jsonify({"error": "Tool bereits im Workset vorhanden"}), 400
+        with storage.transaction('working_sets') as working_sets:
+            # Finde oder erstelle Working Set für diesen Workspace
+            working_set = next((ws for ws in working_sets if ws.get('workspace_id') == workset_id), None)
+            if not working_set:
+                working_set = {
+                    'workspace_id': workset_id,
+                    'tools': []
+                }
+                working_sets.append(working_set)
+
+            # Füge Tool hinzu, falls noch nicht vorhanden
+            if tool_id not in working_set['tools']:
+                working_set['tools'].append(tool_id)
+                storage.save('working_sets', working_sets)
+                return jsonify({"success": True, "message": "Tool erfolgreich hinzugefügt"})
+            else:
+                return jsonify({"error": "Tool bereits im Workset vorhanden"}), 400
         
     except Exception as e:
         print(f"Fehler in api_add_tool_to_workset: {e}")
@@ -696,6 +1243,8 @@ if __name__ == '__main__':
     print("🚀 Server startet auf http://0.0.0.0:5411")
     print("=" * 60)
 
+    device_monitor.start()
+
     # Entwicklung: debug=True, Produktion: debug=False
     app.run(
         host='0.0.0.0',
@@ -0,0 +1,186 @@
+"""
+Hintergrund-Überwachung der Geräte aus network_devices.
+
+Ein Thread prüft alle monitor_interval Sekunden jedes bekannte Gerät mit
+höchstens monitor_concurrency gleichzeitigen Proben (prober.probe über
+netscan.sweep). Der aktuelle Status (is_online, last_seen, rtt_ms,
+checked_at) wird im Speicher gehalten und von devices() über die
+gespeicherte Liste gelegt; GET /api/network/devices muss dafür weder
+prüfen noch die Datei lesen.
+
+devices() liefert den zuletzt veröffentlichten Stand. Er wird nur ersetzt
+(und generation erhöht), wenn sich bei einem Gerät is_online oder die
+Latenzstufe (LATENCY_BUCKETS) ändert, Geräte hinzukommen oder wegfallen
+oder der Durchlauf gespeichert hat. Unveränderte Durchläufe lassen das
+ETag der Geräteliste gleich, Clients erhalten weiter 304.
+
+Je Durchlauf wird höchstens einmal geschrieben (storage.commit_batch):
+Geräte, deren is_online sich geändert hat, sowie online gebliebene Geräte,
+deren last_seen seit PERSIST_LAST_SEEN Sekunden nicht mehr gespeichert
+wurde. Über den Änderungs-Feed (/api/events) erfahren die Clients davon.
+
+Die Einstellungen werden vor jedem Durchlauf neu gelesen; ein Intervall
+von 0 schaltet die Überwachung ab, bis es wieder gesetzt wird.
+"""
+import time
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import netscan
+import prober
+import storage
+
+DEFAULT_INTERVAL = 60
+DEFAULT_CONCURRENCY = 32
+PERSIST_LAST_SEEN = 600
+# Wartezeit bis zur nächsten Prüfung der Einstellungen bei abgeschalteter Überwachung
+IDLE_RECHECK = 30
+# Grenzen der Latenzstufen in ms; nur ein Wechsel der Stufe gilt als Änderung
+LATENCY_BUCKETS = (1, 5, 20, 100, 500)
+
+
+def _signature(status: Dict[str, Any]):
+    """Die für Clients sichtbaren Bestandteile eines Status."""
+    rtt = status.get('rtt_ms')
+    return status.get('is_online'), None if rtt is None else bisect.bisect(LATENCY_BUCKETS, rtt)
+
+
+class DeviceMonitor:
+    """Prüft die Geräte periodisch und hält ihren Status im Speicher."""
+
+    def __init__(self, settings: Callable[[], Dict[str, Any]], timestamp: Callable[[], str],
+                 probe: Callable[..., Dict[str, Any]] = prober.probe):
+        self._settings = settings
+        self._timestamp = timestamp
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._status: Dict[str, Dict[str, Any]] = {}
+        # Von devices() ausgelieferter Stand, nur bei sichtbaren Änderungen ersetzt
+        self._published: Dict[str, Dict[str, Any]] = {}
+        # Zeitpunkt (monotonic), zu dem last_seen eines Geräts zuletzt gespeichert wurde
+        self._persisted: Dict[str, float] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Zählt die veröffentlichten Stände; Bestandteil des ETags der Geräteliste
+        self.generation = 0
+        self._stats = {"cycles": 0, "probes": 0, "writes": 0, "changes": 0, "last_cycle_ms": None}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='device-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                interval = float(self._settings().get('monitor_interval', DEFAULT_INTERVAL))
+            except (TypeError, ValueError):
+                interval = DEFAULT_INTERVAL
+            if interval > 0:
+                try:
+                    self.run_cycle()
+                except Exception as e:
+                    print(f"Fehler in der Geräteüberwachung: {e}")
+            self._stop.wait(interval if interval > 0 else IDLE_RECHECK)
+
+    def run_cycle(self) -> Dict[str, Any]:
+        """Ein Durchlauf: alle Geräte prüfen, Status übernehmen, Änderungen speichern."""
+        start = time.monotonic()
+        settings = self._settings()
+        timeout = float(settings.get('ping_timeout', 1))
+        ports = [int(port) for port in settings.get('probe_ports', prober.DEFAULT_PORTS)]
+        concurrency = int(settings.get('monitor_concurrency', DEFAULT_CONCURRENCY))
+
+        with storage.reading('network_devices', default=list) as devices:
+            targets = {}
+            stored = {}
+            for device in devices if isinstance(devices, list) else []:
+                if not isinstance(device, dict) or device.get('id') is None:
+                    continue
+                address = netscan.device_address(device)
+                if address:
+                    targets[str(device['id'])] = address
+                    stored[str(device['id'])] = (device.get('is_online'), device.get('last_seen'))
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for address, result in netscan.sweep(sorted(set(targets.values())),
+                                             lambda address: self._probe(address, 1, timeout, ports),
+                                             concurrency):
+            results[address] = result or {}
+
+        now = self._timestamp()
+        dirty: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            previous = self._status
+            self._status = {}
+            for device_id, address in targets.items():
+                result = results.get(address, {})
+                online = bool(result.get('reachable'))
+                last = previous.get(device_id, {})
+                status = {
+                    "is_online": online,
+                    "last_seen": now if online else last.get('last_seen', stored[device_id][1]),
+                    "rtt_ms": (result.get('rtt_ms') or {}).get('avg'),
+                    "checked_at": now,
+                }
+                self._status[device_id] = status
+                stale = start - self._persisted.get(device_id, float('-inf')) >= PERSIST_LAST_SEEN
+                if stored[device_id][0] != online or (online and stale):
+                    dirty[device_id] = status
+            self._persisted = {device_id: at for device_id, at in self._persisted.items() if device_id in targets}
+            published = self._published
+            if dirty or published.keys() != self._status.keys() or any(
+                    _signature(published[device_id]) != _signature(status)
+                    for device_id, status in self._status.items()):
+                self._published = self._status
+                self.generation += 1
+            self._stats["cycles"] += 1
+            self._stats["probes"] += len(results)
+
+        if dirty:
+            self._flush(dirty, start)
+        with self._lock:
+            self._stats["last_cycle_ms"] = round((time.monotonic() - start) * 1000)
+        return {"devices": len(targets), "changed": len(dirty)}
+
+    def _flush(self, dirty: Dict[str, Dict[str, Any]], checked: float):
+        """Schreibt die geänderten Geräte mit einem Schreibvorgang."""
+        with storage.transaction('network_devices', default=list) as devices:
+            changes = []
+            for device in devices:
+                status = dirty.get(str(device.get('id'))) if isinstance(device, dict) else None
+                if status is None:
+                    continue
+                device['is_online'] = status['is_online']
+                if status['last_seen'] is not None:
+                    device['last_seen'] = status['last_seen']
+                changes.append(('update', device))
+            if changes:
+                storage.commit_batch('network_devices', devices, changes)
+        with self._lock:
+            for device_id, status in dirty.items():
+                if status['is_online']:
+                    self._persisted[device_id] = checked
+            self._stats["writes"] += 1
+            self._stats["changes"] += len(changes)
+
+    def devices(self, devices: List[Any]) -> List[Any]:
+        """Die gespeicherten Geräte mit dem aktuellen Status aus dem Speicher."""
+        with self._lock:
+            status = self._published
+        return [{**device, **status[str(device.get('id'))]}
+                if isinstance(device, dict) and str(device.get('id')) in status else device
+                for device in devices]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, devices=len(self._status), generation=self.generation,
+                        running=self._thread is not None and self._thread.is_alive())
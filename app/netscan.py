@@ -0,0 +1,103 @@
+"""
+Netzwerk-Scan: Erreichbarkeit aller Adressen eines Subnetzes (CIDR).
+
+Die Adressen werden in einem Thread-Pool mit begrenzter Parallelität
+geprüft; sweep() liefert die Ergebnisse in Abschlussreihenfolge, damit
+die aufrufende Route den Fortschritt sofort weitergeben kann. Die
+Prüfung selbst übernimmt der Aufrufer, üblicherweise prober.probe().
+
+merge_devices() überträgt das Ergebnis auf network_devices, damit die
+Route alle Änderungen mit einem Schreibvorgang speichern kann.
+"""
+import ipaddress
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAX_HOSTS = 4096
+MAX_CONCURRENCY = 256
+
+
+def hosts(cidr: str, limit: int = MAX_HOSTS) -> List[str]:
+    """Adressen eines Subnetzes (ohne Netz- und Broadcast-Adresse).
+
+    Wirft ValueError bei ungültiger Angabe oder mehr als limit Adressen.
+    """
+    network = ipaddress.ip_network(str(cidr).strip(), strict=False)
+    if network.num_addresses > limit + 2:
+        raise ValueError(f"Subnetz {network} zu groß (höchstens {limit} Adressen)")
+    return [str(address) for address in network.hosts()]
+
+
+def sweep(addresses: List[str], probe: Callable[[str], Optional[Dict[str, Any]]],
+          concurrency: int = 64) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+    """Prüft alle Adressen mit höchstens concurrency gleichzeitigen Proben.
+
+    Liefert (Adresse, Ergebnis der Probe) in Abschlussreihenfolge. Wird der
+    Generator vorzeitig geschlossen, werden noch nicht begonnene Proben
+    verworfen.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, MAX_CONCURRENCY)),
+                              thread_name_prefix='netscan')
+    try:
+        futures = {pool.submit(probe, address): address for address in addresses}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Fehler beim Prüfen von {futures[future]}: {e}")
+                result = None
+            yield futures[future], result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _address_key(address: str):
+    parsed = ipaddress.ip_address(address)
+    return parsed.version, parsed
+
+
+def device_address(device: Dict[str, Any]) -> Optional[str]:
+    """Adresse, unter der ein Eintrag aus network_devices erreichbar ist (ip, sonst id)."""
+    address = device.get('ip') or device.get('id')
+    return str(address) if address is not None else None
+
+
+def merge_devices(devices: List[Dict[str, Any]], online: Dict[str, Dict[str, Any]],
+                  scanned: Iterable[str], now: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """Überträgt ein Scan-Ergebnis auf die Geräteliste (in devices).
+
+    Erreichbare Adressen werden angelegt bzw. als online markiert, bekannte
+    Geräte mit einer geprüften, nicht erreichbaren Adresse als offline.
+    Liefert die Änderungen für storage.commit_batch.
+    """
+    scanned = set(scanned)
+    changes: List[Tuple[str, Dict[str, Any]]] = []
+    known = set()
+    for device in devices:
+        if not isinstance(device, dict):
+            continue
+        address = device_address(device)
+        if address not in scanned:
+            continue
+        known.add(address)
+        is_online = address in online
+        if device.get('is_online') == is_online and not is_online:
+            continue
+        device['is_online'] = is_online
+        if is_online:
+            device['ip'] = address
+            device['last_seen'] = now
+        changes.append(('update', device))
+
+    for address in sorted(set(online) - known, key=_address_key):
+        device = {
+            "id": address,
+            "name": f"Device {address}",
+            "ip": address,
+            "is_online": True,
+            "last_seen": now,
+            "network_path": f"\\\\{address}\\c$",
+        }
+        devices.append(device)
+        changes.append(('insert', device))
+    return changes
@@ -0,0 +1,335 @@
+"""
+Erreichbarkeitsprüfung von Geräten ohne ping-Prozess.
+
+Bevorzugt wird ICMP-Echo über Datagramm-Sockets (SOCK_DGRAM mit
+IPPROTO_ICMP). Unter Linux brauchen diese keine Root-Rechte, sofern die
+Gruppe des Prozesses in net.ipv4.ping_group_range liegt; der Kernel
+vergibt die Kennung und stellt dem Socket nur die eigenen Antworten zu.
+Sind ICMP-Sockets nicht erlaubt oder antwortet der Rechner nicht auf
+ICMP (Windows-Firewall), wird per TCP-Verbindungsaufbau auf typische
+Ports (SMB, RDP, SSH) geprüft: alle Ports gleichzeitig, mit einem
+gemeinsamen Timeout; eine Verbindung oder eine Ablehnung (RST) zeigt,
+dass der Rechner antwortet.
+
+probe() liefert ein strukturiertes Ergebnis statt Programmausgabe:
+
+    {"host", "address", "reachable", "method": "icmp"|"tcp"|None,
+     "sent", "received", "loss", "rtt_ms": {"min", "avg", "max"} | None,
+     "port" (nur tcp), "error" (nur bei Fehlern)}
+
+Vergleich mit dem bisherigen ping-Aufruf je Anfrage:
+
+    python app/prober.py probe [--count 4] [--timeout 1] host
+    python app/prober.py bench [--rounds 50] [host]
+"""
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import struct
+import argparse
+import selectors
+import subprocess
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_PORTS = (445, 3389, 22)
+
+# Verbindungsaufbau abgelehnt: der Rechner ist erreichbar, nur der Port ist zu
+_REFUSED = (errno.ECONNREFUSED, errno.ECONNRESET)
+_IN_PROGRESS = (errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, 'WSAEWOULDBLOCK', -1))
+
+# (Adressfamilie, Protokoll, Echo-Request, Echo-Reply)
+_ICMP = {
+    socket.AF_INET: (socket.IPPROTO_ICMP, 8, 0),
+    socket.AF_INET6: (getattr(socket, 'IPPROTO_ICMPV6', 58), 128, 129),
+}
+
+# Familien, für die ICMP-Sockets nicht erlaubt sind (einmal festgestellt)
+_icmp_denied = set()
+
+
+def resolve(host: str) -> Optional[str]:
+    """Erste Adresse zu host (IP-Adressen unverändert); None, wenn unbekannt."""
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError, OSError):
+        return None
+    return infos[0][4][0] if infos else None
+
+
+def _family(address: str) -> int:
+    return socket.AF_INET6 if ':' in address else socket.AF_INET
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b'\0'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _result(host: str, address: Optional[str], method: Optional[str], sent: int,
+            rtts: List[float], **extra) -> Dict[str, Any]:
+    result = {
+        "host": host,
+        "address": address,
+        "reachable": bool(rtts),
+        "method": method,
+        "sent": sent,
+        "received": len(rtts),
+        "loss": round(1 - len(rtts) / sent, 3) if sent else 1.0,
+        "rtt_ms": {
+            "min": round(min(rtts), 2),
+            "avg": round(sum(rtts) / len(rtts), 2),
+            "max": round(max(rtts), 2),
+        } if rtts else None,
+    }
+    result.update(extra)
+    return result
+
+
+def icmp_available(family: int = socket.AF_INET) -> bool:
+    """Dürfen ICMP-Datagramm-Sockets dieser Familie geöffnet werden?"""
+    if family in _icmp_denied:
+        return False
+    try:
+        socket.socket(family, socket.SOCK_DGRAM, _ICMP[family][0]).close()
+    except OSError:
+        _icmp_denied.add(family)
+        return False
+    return True
+
+
+def icmp_rtts(address: str, count: int = 1, timeout: float = 1.0, interval: float = 0.2) -> List[float]:
+    """Sendet count Echo-Requests und liefert die Laufzeiten der Antworten (ms).
+
+    Die Anfragen gehen im Abstand interval hinaus; nach der letzten wird
+    höchstens timeout Sekunden auf Antworten gewartet. Wirft OSError, wenn
+    der ICMP-Socket nicht geöffnet werden darf.
+    """
+    family = _family(address)
+    proto, request_type, reply_type = _ICMP[family]
+    sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+    selector = selectors.DefaultSelector()
+    token = os.urandom(8)
+    sent_at: Dict[int, float] = {}
+    rtts: Dict[int, float] = {}
+    try:
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+        next_send = time.perf_counter()
+        deadline = None
+        while True:
+            now = time.perf_counter()
+            if len(sent_at) < count and now >= next_send:
+                seq = len(sent_at) + 1
+                header = struct.pack('!BBHHH', request_type, 0, 0, 0, seq)
+                packet = struct.pack('!BBHHH', request_type, 0, _checksum(header + token), 0, seq) + token
+                sent_at[seq] = now
+                try:
+                    sock.sendto(packet, (address, 0))
+                except OSError:
+                    # z.B. Netz nicht erreichbar: zählt als verlorene Anfrage
+                    pass
+                next_send = now + interval
+                if len(sent_at) == count:
+                    deadline = now + timeout
+            if len(rtts) == count or (deadline is not None and now >= deadline):
+                break
+            wait = (deadline if deadline is not None else next_send) - now
+            for _ in selector.select(max(0.0, wait)):
+                while True:
+                    try:
+                        data = sock.recv(1024)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        # ICMP-Fehlermeldung (z.B. Host nicht erreichbar)
+                        break
+                    received = time.perf_counter()
+                    if family == socket.AF_INET and data and data[0] >> 4 == 4:
+                        # Manche Systeme (macOS) liefern den IP-Kopf mit
+                        data = data[(data[0] & 0x0F) * 4:]
+                    if len(data) < 8 + len(token) or data[0] != reply_type or data[8:8 + len(token)] != token:
+                        continue
+                    seq = struct.unpack('!H', data[6:8])[0]
+                    if seq in sent_at and seq not in rtts:
+                        rtts[seq] = (received - sent_at[seq]) * 1000
+    finally:
+        selector.close()
+        sock.close()
+    return list(rtts.values())
+
+
+def tcp_probe(host: str, ports: Iterable[int] = DEFAULT_PORTS, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+    """Verbindungsaufbau zu allen Ports gleichzeitig; None, wenn keiner antwortet.
+
+    Sonst {"port": antwortender Port, "rtt_ms": Zeit bis zur Antwort}.
+    """
+    selector = selectors.DefaultSelector()
+    sockets = []
+    start = time.perf_counter()
+    try:
+        for port in ports:
+            sock = socket.socket(_family(host), socket.SOCK_STREAM)
+            sock.setblocking(False)
+            sockets.append(sock)
+            code = sock.connect_ex((host, int(port)))
+            if code == 0 or code in _REFUSED:
+                return {"port": int(port), "rtt_ms": round((time.perf_counter() - start) * 1000, 2)}
+            if code in _IN_PROGRESS:
+                selector.register(sock, selectors.EVENT_WRITE, int(port))
+
+        deadline = start + timeout
+        while selector.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return None
+            for key, _ in selector.select(remaining):
+                code = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if code == 0 or code in _REFUSED:
+                    return {"port": key.data, "rtt_ms": round((time.perf_counter() - start) * 1000, 2)}
+                # Unerreichbar o.ä.: diesen Port nicht weiter beobachten
+                selector.unregister(key.fileobj)
+        return None
+    except OSError:
+        return None
+    finally:
+        selector.close()
+        for sock in sockets:
+            sock.close()
+
+
+def probe(host: str, count: int = 1, timeout: float = 1.0,
+          ports: Iterable[int] = DEFAULT_PORTS, icmp: bool = True) -> Dict[str, Any]:
+    """Prüft, ob host erreichbar ist: ICMP-Echo, sonst TCP auf ports.
+
+    timeout gilt je Antwort (ICMP: nach der letzten Anfrage, TCP: je
+    Versuch). Antwortet bei TCP kein Port, unterbleiben weitere Versuche.
+    """
+    host = str(host).strip()
+    count = max(1, int(count))
+    address = resolve(host)
+    if address is None:
+        return _result(host, None, None, 0, [], error="Host nicht gefunden")
+
+    if icmp and icmp_available(_family(address)):
+        try:
+            rtts = icmp_rtts(address, count, timeout)
+        except OSError as e:
+            if e.errno in (errno.EACCES, errno.EPERM, errno.EPROTONOSUPPORT):
+                _icmp_denied.add(_family(address))
+            rtts = []
+        if rtts:
+            return _result(host, address, 'icmp', count, rtts)
+
+    ports = list(ports)
+    if not ports:
+        return _result(host, address, 'icmp' if icmp else None, count, [])
+    rtts: List[float] = []
+    port = None
+    sent = 0
+    for _ in range(count):
+        sent += 1
+        answer = tcp_probe(address, ports, timeout)
+        if answer is None:
+            if not rtts:
+                break
+            continue
+        port = answer["port"]
+        rtts.append(answer["rtt_ms"])
+    return _result(host, address, 'tcp', sent, rtts, port=port)
+
+
+def summary(result: Dict[str, Any]) -> str:
+    """Einzeilige Zusammenfassung eines probe()-Ergebnisses für die Anzeige."""
+    if result.get("error"):
+        return f"{result['host']}: {result['error']}"
+    text = (f"{result['host']} ({result['address']}): {result['received']}/{result['sent']} Antworten"
+            f" per {result['method'] or '-'}, {result['loss'] * 100:.0f}% Verlust")
+    if result.get("port"):
+        text += f", Port {result['port']}"
+    rtt = result.get("rtt_ms")
+    if rtt:
+        text += f", Zeit min/avg/max {rtt['min']}/{rtt['avg']}/{rtt['max']} ms"
+    return text
+
+
+def _ping_subprocess(host: str, timeout: float) -> bool:
+    """Bisheriger Weg (ein ping-Prozess je Anfrage), nur für bench()."""
+    if os.name == 'nt':
+        command = ['ping', '-n', '1', '-w', str(int(timeout * 1000)), host]
+    else:
+        command = ['ping', '-c', '1', '-W', str(max(1, int(timeout))), host]
+    result = subprocess.run(command, capture_output=True, text=True, timeout=timeout + 5)
+    return result.returncode == 0
+
+
+def bench(host: str = '127.0.0.1', rounds: int = 50, timeout: float = 1.0,
+          ports: Iterable[int] = DEFAULT_PORTS) -> List[Dict[str, Any]]:
+    """Prüfungen je Sekunde: probe() gegenüber einem ping-Prozess je Prüfung."""
+    ports = list(ports)
+    variants = [('prober', lambda: probe(host, 1, timeout, ports)["reachable"])]
+    if icmp_available(_family(resolve(host) or host)):
+        variants.append(('prober tcp', lambda: probe(host, 1, timeout, ports, icmp=False)["reachable"]))
+    variants.append(('subprocess', lambda: _ping_subprocess(host, timeout)))
+
+    results = []
+    for name, run in variants:
+        reachable = 0
+        start = time.perf_counter()
+        try:
+            for _ in range(rounds):
+                reachable += bool(run())
+        except (OSError, subprocess.SubprocessError) as e:
+            results.append({"variant": name, "error": str(e)})
+            continue
+        elapsed = time.perf_counter() - start
+        results.append({
+            "variant": name,
+            "probes_per_s": rounds / elapsed if elapsed else float('inf'),
+            "ms_per_probe": elapsed * 1000 / rounds,
+            "reachable": reachable,
+        })
+    return results
+
+
+def _port_list(text: str) -> List[int]:
+    return [int(port) for port in text.split(',') if port.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HelpTool Erreichbarkeitsprüfung")
+    sub = parser.add_subparsers(dest='command', required=True)
+    cmd = sub.add_parser('probe', help="Einen Rechner prüfen")
+    cmd.add_argument('--count', type=int, default=4)
+    cmd.add_argument('--timeout', type=float, default=1.0)
+    cmd.add_argument('--ports', type=_port_list, default=list(DEFAULT_PORTS), help="kommagetrennt")
+    cmd.add_argument('host')
+    cmd = sub.add_parser('bench', help="probe() mit ping-Prozessen vergleichen")
+    cmd.add_argument('--rounds', type=int, default=50)
+    cmd.add_argument('--timeout', type=float, default=1.0)
+    cmd.add_argument('--ports', type=_port_list, default=list(DEFAULT_PORTS), help="kommagetrennt")
+    cmd.add_argument('host', nargs='?', default='127.0.0.1')
+    args = parser.parse_args(argv)
+
+    if args.command == 'probe':
+        print(json.dumps(probe(args.host, args.count, args.timeout, args.ports), indent=2))
+        return 0
+
+    print(f"{'Variante':<12} {'Prüfungen/s':>12} {'ms/Prüfung':>11} {'erreichbar':>11}")
+    for row in bench(args.host, args.rounds, args.timeout, args.ports):
+        if "error" in row:
+            print(f"{row['variant']:<12} nicht verfügbar: {row['error']}")
+            continue
+        print(f"{row['variant']:<12} {row['probes_per_s']:>12.1f} {row['ms_per_probe']:>11.3f} "
+              f"{row['reachable']:>8}/{args.rounds}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
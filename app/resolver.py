@@ -0,0 +1,129 @@
+"""
+Rückwärtsauflösung (PTR) von Geräteadressen zu Hostnamen mit Cache.
+
+Jede Abfrage läuft in einem Thread-Pool mit begrenzter Größe; der
+Aufrufer wartet höchstens timeout Sekunden und erhält danach None, auch
+wenn socket.gethostbyaddr selbst (je nach System) deutlich länger
+braucht. Die laufende Abfrage bleibt im Cache, spätere Aufrufe für
+dieselbe Adresse warten auf sie statt eine neue zu starten.
+
+Gefundene Namen bleiben HELPTOOL_DNS_TTL Sekunden gültig (300), fehlende
+Einträge HELPTOOL_DNS_NEGATIVE_TTL Sekunden (60). HELPTOOL_DNS_TIMEOUT
+legt die Wartezeit je Abfrage fest (2), HELPTOOL_DNS_WORKERS die Zahl
+gleichzeitiger Abfragen (8).
+
+known() blockiert nie: es liefert die bereits bekannten Namen und stößt
+für die übrigen Adressen eine Abfrage im Hintergrund an. Während eine
+abgelaufene Adresse neu aufgelöst wird, liefert es den bisherigen Namen;
+generation ändert sich nur, wenn sich ein Name tatsächlich ändert.
+"""
+import os
+import time
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_TTL = float(os.environ.get('HELPTOOL_DNS_TTL', '300'))
+DEFAULT_NEGATIVE_TTL = float(os.environ.get('HELPTOOL_DNS_NEGATIVE_TTL', '60'))
+DEFAULT_TIMEOUT = float(os.environ.get('HELPTOOL_DNS_TIMEOUT', '2'))
+DEFAULT_WORKERS = int(os.environ.get('HELPTOOL_DNS_WORKERS', '8'))
+MAX_ENTRIES = 4096
+
+
+def _gethostbyaddr(address: str) -> Optional[str]:
+    try:
+        return socket.gethostbyaddr(address)[0]
+    except (OSError, UnicodeError, ValueError):
+        # socket.herror/gaierror sind Unterklassen von OSError
+        return None
+
+
+def _result(future: Future) -> Optional[str]:
+    """Name aus einer abgeschlossenen Abfrage (None bei Abbruch oder Fehler)."""
+    return None if future.cancelled() or future.exception() else future.result()
+
+
+class _Entry:
+    __slots__ = ('future', 'expires', 'previous')
+
+    def __init__(self, future: Future, previous: Optional[str] = None):
+        self.future = future
+        # Ergebnis der abgelaufenen Abfrage, bis diese abgeschlossen ist
+        self.previous = previous
+        # Erst gesetzt, wenn die Abfrage abgeschlossen ist
+        self.expires: Optional[float] = None
+
+
+class Resolver:
+    """Hostnamen zu Adressen mit positivem/negativem TTL-Cache."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 timeout: float = DEFAULT_TIMEOUT, workers: int = DEFAULT_WORKERS,
+                 max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='resolver')
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "timeouts": 0, "not_found": 0}
+        # Zählt geänderte Namen; ändert sich, sobald known() etwas anderes liefert
+        self.generation = 0
+
+    def _entry(self, address: str) -> _Entry:
+        """Abfrage für address aus dem Cache oder neu gestartet."""
+        with self._lock:
+            entry = self._entries.get(address)
+            if entry is not None and (entry.expires is None or entry.expires > time.monotonic()):
+                self._entries.move_to_end(address)
+                self._stats["hits"] += 1
+                return entry
+            self._stats["misses"] += 1
+            previous = _result(entry.future) if entry is not None else None
+            entry = self._entries[address] = _Entry(self._pool.submit(_gethostbyaddr, address), previous)
+            self._entries.move_to_end(address)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        entry.future.add_done_callback(lambda future: self._finished(entry, future))
+        return entry
+
+    def _finished(self, entry: _Entry, future: Future):
+        name = _result(future)
+        with self._lock:
+            entry.expires = time.monotonic() + (self.ttl if name else self.negative_ttl)
+            if not name:
+                self._stats["not_found"] += 1
+            if name != entry.previous:
+                self.generation += 1
+            entry.previous = None
+
+    def lookup(self, address: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Hostname zu address; None, wenn unbekannt oder nach timeout Sekunden."""
+        return self.resolve_many([address], timeout).get(address)
+
+    def resolve_many(self, addresses: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """Löst alle Adressen gleichzeitig auf; gemeinsame Wartezeit timeout."""
+        futures = {address: self._entry(address).future for address in dict.fromkeys(addresses) if address}
+        done, pending = wait(futures.values(), self.timeout if timeout is None else timeout)
+        if pending:
+            with self._lock:
+                self._stats["timeouts"] += len(pending)
+        return {address: (future.result() if future in done else None)
+                for address, future in futures.items()}
+
+    def known(self, addresses: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Bereits aufgelöste Namen, ohne zu warten; fehlende werden angefragt."""
+        result = {}
+        for address in dict.fromkeys(addresses):
+            if not address:
+                continue
+            entry = self._entry(address)
+            result[address] = _result(entry.future) if entry.future.done() else entry.previous
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), generation=self.generation)
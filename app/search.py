@@ -0,0 +1,308 @@
+"""
+Volltextsuche über Tickets, FAQ, Telefonbuch und Tools.
+
+Je Sammlung wird ein invertierter Index (Begriff -> {ID: gewichtete
+Häufigkeit}) als Sekundärindex im Speicher-Layer geführt. Er wird beim
+ersten Suchen aufgebaut und danach von insert_item/update_item/
+delete_item eintragsweise nachgeführt; nur ein save() der ganzen
+Sammlung (oder eine von außen geänderte Datei) baut ihn neu auf.
+
+Tokenisierung für deutsche Texte: HTML-Tags entfernen, Kleinschreibung,
+Umlaute falten (ä -> ae, ß -> ss, sonstige Akzente entfernen),
+Stoppwörter auslassen und gängige Endungen abschneiden (Drucker,
+Druckers -> druck). Telefonnummern werden zusätzlich als reine
+Ziffernfolge indiziert. Anfragen durchlaufen dieselbe Verarbeitung;
+gefunden wird jeder Eintrag mit mindestens einem Begriff, gerankt nach
+BM25 (Einträge mit mehr passenden Begriffen stehen also weiter oben).
+
+Für die Autovervollständigung der Eingabefelder (complete()) werden
+einzelne Felder zusätzlich als sortierte Präfixindizes geführt: gefaltete
+Feldwerte bzw. Ziffernfolgen bei Rufnummern, per Binärsuche durchsucht.
+"""
+import re
+import math
+import heapq
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import storage
+from indexes import IndexSpec, SecondaryIndex, phone_key
+
+INDEX_NAME = 'volltext'
+
+# Sammlung -> {Feld: Gewicht}; Titelfelder zählen doppelt
+SOURCES: Dict[str, Dict[str, float]] = {
+    'tickets': {'headerText': 2.0, 'description': 1.0},
+    'faq': {'question': 2.0, 'answer': 1.0, 'tags': 1.5},
+    'telefonbuch': {'name': 2.0, 'department': 1.0, 'phone': 1.0},
+    'tools': {'name': 2.0, 'tags': 1.5},
+}
+TITLE_FIELDS = {'tickets': 'headerText', 'faq': 'question', 'telefonbuch': 'name', 'tools': 'name'}
+
+# Sammlung -> Felder mit Präfixindex für die Autovervollständigung
+COMPLETIONS: Dict[str, Tuple[str, ...]] = {
+    'telefonbuch': ('name', 'group', 'department', 'phone'),
+    'tickets': ('pkz', 'phone', 'headerText'),
+}
+PHONE_FIELDS = ('phone',)
+
+LIMIT_DEFAULT = 20
+LIMIT_MAX = 100
+COMPLETE_LIMIT_DEFAULT = 10
+COMPLETE_LIMIT_MAX = 50
+
+# BM25-Parameter (Standardwerte)
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset("""
+aber alle als am an auch auf aus bei bin bis bitte da dann das dass dem den der des die
+dies diese dieser du durch ein eine einem einen einer eines er es fuer hat ich ihr im in
+ist ja kann man mit nach nicht noch nur ob oder sich sie sind so um und uns von vom vor
+war was wie wir wird wo zu zum zur
+""".split())
+
+_TAG = re.compile(r'<[^>]*>')
+_WORD = re.compile(r'\w+')
+_PHONE = re.compile(r'^[\d\s\-/+().]+$')
+_FOLD = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+
+
+def fold(text: str) -> str:
+    """Kleinschreibung und Umlautfaltung (Müller -> mueller, Café -> cafe)."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    text = text.translate(_FOLD)
+    return ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+
+
+def stem(word: str) -> str:
+    """Leichtes Abschneiden deutscher Flexionsendungen."""
+    if word.isdigit():
+        return word
+    while True:
+        if len(word) > 5 and word[-2:] in ('em', 'er'):
+            word = word[:-2]
+        elif len(word) > 4 and word[-1] in 'esn' and word[-2] != word[-1]:
+            word = word[:-1]
+        else:
+            return word
+
+
+@lru_cache(maxsize=65536)
+def _term(word: str) -> Optional[str]:
+    # Wortschatz ist überschaubar: Stoppwortprüfung und Stemming je Wort nur einmal
+    return None if word in STOPWORDS else stem(word)
+
+
+def tokenize(text: Any) -> List[str]:
+    """Suchbegriffe eines Feldwerts (Zeichenkette oder Liste, z.B. tags)."""
+    if isinstance(text, (list, tuple)):
+        return [term for part in text for term in tokenize(part)]
+    if text is None or isinstance(text, (dict, bool)):
+        return []
+    text = str(text)
+    terms = [term for term in map(_term, _WORD.findall(fold(_TAG.sub(' ', text)))) if term]
+    if _PHONE.match(text):
+        digits = ''.join(c for c in text if c.isdigit())
+        if len(digits) > 1 and digits not in terms:
+            # "0176 247 08 123" auch als 017624708123 auffindbar
+            terms.append(digits)
+    return terms
+
+
+class TextIndexSpec:
+    """Definition des Volltextindex einer Sammlung (für storage.register_index)."""
+
+    kind = 'text'
+
+    def __init__(self, fields: Dict[str, float]):
+        self.field = INDEX_NAME
+        self.fields = fields
+
+    def terms_of(self, item: Any) -> Dict[str, float]:
+        """Begriff -> gewichtete Häufigkeit in einem Eintrag."""
+        counts: Dict[str, float] = {}
+        if not isinstance(item, dict):
+            return counts
+        for field, weight in self.fields.items():
+            for term in tokenize(item.get(field)):
+                counts[term] = counts.get(term, 0.0) + weight
+        return counts
+
+    def build(self, items: Iterable[Any]) -> Optional['TextIndex']:
+        index = TextIndex(self)
+        for item in items:
+            item_id = item.get('id') if isinstance(item, dict) else None
+            if item_id is None or not index.add(item_id, item):
+                return None
+        return index
+
+
+class TextIndex:
+    """Invertierter Index einer Sammlung samt Dokumentlängen für BM25."""
+
+    __slots__ = ('spec', 'keys', 'lengths', 'postings', 'total_length')
+
+    def __init__(self, spec: TextIndexSpec):
+        self.spec = spec
+        # ID -> (Begriff -> Häufigkeit), auch zum Austragen bei Änderungen
+        self.keys: Dict[Any, Dict[str, float]] = {}
+        self.lengths: Dict[Any, float] = {}
+        self.postings: Dict[str, Dict[Any, float]] = {}
+        self.total_length = 0.0
+
+    def add(self, item_id: Any, item: Any) -> bool:
+        """Nimmt einen Eintrag auf; False bei doppelter oder ungültiger ID."""
+        try:
+            if item_id is None or item_id in self.keys:
+                return False
+        except TypeError:
+            return False
+        counts = self.spec.terms_of(item)
+        self.keys[item_id] = counts
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[item_id] = count
+        self.lengths[item_id] = sum(counts.values())
+        self.total_length += self.lengths[item_id]
+        return True
+
+    def remove(self, item_id: Any):
+        counts = self.keys.pop(item_id, None)
+        if counts is None:
+            return
+        for term in counts:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(item_id, None)
+                if not posting:
+                    del self.postings[term]
+        self.total_length -= self.lengths.pop(item_id)
+
+    def scores(self, terms: List[str]) -> Dict[Any, float]:
+        """BM25-Score je ID für alle Einträge mit mindestens einem der Begriffe."""
+        total = len(self.keys)
+        if not terms or not total:
+            return {}
+        average = self.total_length / total or 1.0
+        lengths = self.lengths
+        scores: Dict[Any, float] = {}
+        for term in dict.fromkeys(terms):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (total - len(posting) + 0.5) / (len(posting) + 0.5))
+            for item_id, tf in posting.items():
+                norm = 1 - B + B * lengths[item_id] / average
+                scores[item_id] = scores.get(item_id, 0.0) + idf * tf * (K1 + 1) / (tf + K1 * norm)
+        return scores
+
+
+def _prefix_key(value: Any) -> Optional[str]:
+    if isinstance(value, (list, dict)):
+        return None
+    value = fold(str(value).strip())
+    return value or None
+
+
+def _prefix_spec(field: str) -> IndexSpec:
+    return IndexSpec(f'prefix_{field}', 'sorted', key=lambda item: item.get(field),
+                     normalize=phone_key if field in PHONE_FIELDS else _prefix_key)
+
+
+def register():
+    """Meldet Volltext- und Präfixindizes aller durchsuchbaren Sammlungen an."""
+    for name, fields in SOURCES.items():
+        storage.register_index(name, INDEX_NAME, spec=TextIndexSpec(fields))
+    for name, fields in COMPLETIONS.items():
+        for field in fields:
+            storage.register_index(name, f'prefix_{field}', spec=_prefix_spec(field))
+
+
+def search(query: str, types: Optional[Iterable[str]] = None,
+           limit: int = LIMIT_DEFAULT) -> Dict[str, Any]:
+    """Durchsucht die Sammlungen (types: Auswahl aus SOURCES, Standard alle).
+
+    Liefert die besten limit Treffer über alle gewählten Sammlungen und je
+    Sammlung die Anzahl der Treffer (facets, unabhängig von types).
+    """
+    terms = tokenize(query)
+    types = [name for name in (types or SOURCES) if name in SOURCES]
+    facets: Dict[str, int] = {}
+    hits: List[Tuple[float, str, Dict[str, Any]]] = []
+    for name in SOURCES:
+        with storage.reading(name) as data:
+            index = storage.secondary_index(name, data, INDEX_NAME)
+            if index is None:
+                # Nicht indizierbar (fehlende/doppelte IDs): nur für diese Anfrage aufbauen
+                index = TextIndex(TextIndexSpec(SOURCES[name]))
+                for item in data if isinstance(data, list) else ():
+                    index.add(item.get('id') if isinstance(item, dict) else None, item)
+            scores = index.scores(terms)
+            facets[name] = len(scores)
+            if name not in types:
+                continue
+            for item_id, score in heapq.nlargest(limit, scores.items(), key=lambda hit: hit[1]):
+                item = storage.find_item(name, data, item_id)
+                if item is not None:
+                    hits.append((score, name, dict(item)))
+
+    hits.sort(key=lambda hit: -hit[0])
+    return {
+        "query": query,
+        "terms": terms,
+        "total": sum(facets[name] for name in types),
+        "facets": facets,
+        "results": [{
+            "type": name,
+            "id": item.get('id'),
+            "title": item.get(TITLE_FIELDS[name]),
+            "score": round(score, 4),
+            "item": item,
+        } for score, name, item in hits[:limit]],
+    }
+
+
+
+def complete(field: str, prefix: str, types: Optional[Iterable[str]] = None,
+             limit: int = COMPLETE_LIMIT_DEFAULT) -> List[Dict[str, Any]]:
+    """Vorschläge für ein Eingabefeld: verschiedene Werte, die mit prefix beginnen.
+
+    Durchsucht das Feld in allen Sammlungen aus types (Standard: alle, die
+    es führen). Je Vorschlag der Wert des ersten passenden Eintrags, dessen
+    Typ und ID sowie die Anzahl der Einträge mit diesem Wert.
+    """
+    index_name = f'prefix_{field}'
+    suggestions: Dict[Any, Dict[str, Any]] = {}
+    for name in (types or COMPLETIONS):
+        if field not in COMPLETIONS.get(name, ()):
+            continue
+        with storage.reading(name) as data:
+            index = storage.secondary_index(name, data, index_name)
+            if index is None:
+                index = _unindexed(name, field, data)
+            for key, item_id, count in index.prefixed(prefix, limit):
+                if key in suggestions:
+                    suggestions[key]["count"] += count
+                    continue
+                item = storage.find_item(name, data, item_id) if item_id is not None else None
+                suggestions[key] = {
+                    "value": item.get(field) if item is not None else key,
+                    "type": name,
+                    "id": item_id,
+                    "count": count,
+                }
+    return [suggestions[key] for key in sorted(suggestions)[:limit]]
+
+
+def _unindexed(name: str, field: str, data: Any) -> SecondaryIndex:
+    """Präfixindex nur für diese Anfrage (Sammlung mit fehlenden/doppelten IDs)."""
+    spec = _prefix_spec(field)
+    index = SecondaryIndex(spec)
+    pairs = sorted(((spec.key_of(item), item.get('id')) for item in (data if isinstance(data, list) else ())
+                    if isinstance(item, dict)), key=lambda pair: str(pair[0]))
+    index.sorted_keys = [key for key, _ in pairs if key is not None]
+    index.sorted_ids = [item_id for key, item_id in pairs if key is not None]
+    return index
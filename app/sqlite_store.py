@@ -0,0 +1,304 @@
+"""
+SQLite-Speicher-Engine für die Sammlungen unter data/.
+
+Jede Sammlung (tools, tickets, telefonbuch, ...) liegt als eigene Tabelle
+col_<name> mit einer Zeile pro Eintrag vor: die Spalte id enthält die
+JSON-kodierte ID, doc den Eintrag als JSON-Dokument. Die Reihenfolge der
+Einträge bleibt über die Spalte pos erhalten, damit die REST-Antworten
+identisch zu den JSON-Dateien bleiben. Sammlungen, die keine Liste sind
+(z.B. network_settings), werden als einzelnes Dokument in _collections
+abgelegt.
+
+Einzelne Änderungen (insert/update/delete) schreiben nur die betroffene
+Zeile. Jede Änderung erhöht die Versionsnummer der Sammlung in
+_collections, über die der Cache in storage.py veraltete Einträge erkennt.
+Die zuletzt vergebene ID steht in _collections.last_id.
+
+Einmalige Migration der bestehenden JSON-Dateien:
+
+    python app/sqlite_store.py migrate [--data-dir data] [--db data/helptool.db]
+"""
+import os
+import sys
+import json
+import glob
+import sqlite3
+import argparse
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import formats
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS _collections (
+    name    TEXT PRIMARY KEY,
+    kind    TEXT NOT NULL,
+    doc     TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    last_id INTEGER
+)
+"""
+
+
+def _table(name: str) -> str:
+    return '"col_' + name.replace('"', '""') + '"'
+
+
+def _key(item: Any) -> Optional[str]:
+    """JSON-kodierte ID eines Eintrags (1 und "1" bleiben unterscheidbar)."""
+    if isinstance(item, dict) and item.get('id') is not None:
+        return json.dumps(item['id'])
+    return None
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+class SqliteEngine:
+    """Speichert Sammlungen als Tabellen von JSON-Dokumenten in SQLite."""
+
+    name = 'sqlite'
+    # _collections.version ist dauerhaft und steigt mit jeder Änderung
+    versioned = True
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._known_tables = set()
+        with self._transaction() as conn:
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(_collections)")}
+            if 'last_id' not in columns:
+                # Datenbanken aus der Zeit vor der ID-Sequenz
+                conn.execute("ALTER TABLE _collections ADD COLUMN last_id INTEGER")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, immediate: bool = True):
+        return _Transaction(self._conn(), immediate)
+
+    def _ensure_table(self, conn: sqlite3.Connection, name: str):
+        if name in self._known_tables:
+            return
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {_table(name)} ("
+            "pos INTEGER PRIMARY KEY AUTOINCREMENT, id TEXT UNIQUE, doc TEXT NOT NULL)"
+        )
+        self._known_tables.add(name)
+
+    def _kind(self, conn: sqlite3.Connection, name: str) -> Optional[str]:
+        row = conn.execute("SELECT kind FROM _collections WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _bump(self, conn: sqlite3.Connection, name: str) -> Tuple[int]:
+        conn.execute("UPDATE _collections SET version = version + 1 WHERE name = ?", (name,))
+        row = conn.execute("SELECT version FROM _collections WHERE name = ?", (name,)).fetchone()
+        return (row[0],)
+
+    # ------------------------------------------------------------------
+    # Engine-Schnittstelle (siehe storage.JsonFileEngine)
+    # ------------------------------------------------------------------
+
+    def signature(self, name: str) -> Optional[Tuple[int]]:
+        row = self._conn().execute(
+            "SELECT version FROM _collections WHERE name = ?", (name,)
+        ).fetchone()
+        return (row[0],) if row else None
+
+    def read(self, name: str) -> Tuple[Any, Optional[Tuple[int]]]:
+        with self._transaction(immediate=False) as conn:
+            row = conn.execute(
+                "SELECT kind, doc, version FROM _collections WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                raise FileNotFoundError(f"Sammlung '{name}' nicht in {self.db_path}")
+            kind, doc, version = row
+            if kind != 'list':
+                return json.loads(doc), (version,)
+            self._ensure_table(conn, name)
+            items = [json.loads(d) for (d,) in conn.execute(
+                f"SELECT doc FROM {_table(name)} ORDER BY pos"
+            )]
+            return items, (version,)
+
+    def write(self, name: str, data: Any) -> Tuple[int]:
+        with self._transaction() as conn:
+            return self._write(conn, name, data)
+
+    def _write(self, conn: sqlite3.Connection, name: str, data: Any) -> Tuple[int]:
+        self._ensure_table(conn, name)
+        conn.execute(f"DELETE FROM {_table(name)}")
+        if isinstance(data, list):
+            conn.execute(
+                "INSERT INTO _collections (name, kind, doc) VALUES (?, 'list', NULL) "
+                "ON CONFLICT(name) DO UPDATE SET kind = 'list', doc = NULL",
+                (name,),
+            )
+            rows = []
+            seen = set()
+            for item in data:
+                key = _key(item)
+                # Doppelte IDs sind in den JSON-Dateien möglich; nur die erste
+                # Zeile bleibt per ID adressierbar.
+                if key in seen:
+                    key = None
+                elif key is not None:
+                    seen.add(key)
+                rows.append((key, _dumps(item)))
+            conn.executemany(f"INSERT INTO {_table(name)} (id, doc) VALUES (?, ?)", rows)
+        else:
+            conn.execute(
+                "INSERT INTO _collections (name, kind, doc) VALUES (?, 'object', ?) "
+                "ON CONFLICT(name) DO UPDATE SET kind = 'object', doc = excluded.doc",
+                (name, _dumps(data)),
+            )
+        return self._bump(conn, name)
+
+    def insert(self, name: str, data: Any, item: Dict[str, Any]) -> Tuple[int]:
+        with self._transaction() as conn:
+            if self._kind(conn, name) != 'list':
+                return self._write(conn, name, data)
+            self._ensure_table(conn, name)
+            try:
+                conn.execute(
+                    f"INSERT INTO {_table(name)} (id, doc) VALUES (?, ?)",
+                    (_key(item), _dumps(item)),
+                )
+            except sqlite3.IntegrityError:
+                return self._write(conn, name, data)
+            return self._bump(conn, name)
+
+    def update(self, name: str, data: Any, item: Dict[str, Any]) -> Tuple[int]:
+        key = _key(item)
+        with self._transaction() as conn:
+            if key is None or self._kind(conn, name) != 'list':
+                return self._write(conn, name, data)
+            self._ensure_table(conn, name)
+            cur = conn.execute(
+                f"UPDATE {_table(name)} SET doc = ? WHERE id = ?", (_dumps(item), key)
+            )
+            if cur.rowcount != 1:
+                return self._write(conn, name, data)
+            return self._bump(conn, name)
+
+    def delete(self, name: str, data: Any, item: Dict[str, Any]) -> Tuple[int]:
+        key = _key(item)
+        with self._transaction() as conn:
+            if key is None or self._kind(conn, name) != 'list':
+                return self._write(conn, name, data)
+            self._ensure_table(conn, name)
+            cur = conn.execute(f"DELETE FROM {_table(name)} WHERE id = ?", (key,))
+            if cur.rowcount != 1:
+                return self._write(conn, name, data)
+            return self._bump(conn, name)
+
+    def allocate_id(self, name: str, seed: Callable[[], int], floor: int = 0, count: int = 1) -> int:
+        # seed wird nicht benötigt: die höchste ID wird direkt per SQL ermittelt.
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT kind, last_id FROM _collections WHERE name = ?", (name,)
+            ).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO _collections (name, kind, doc) VALUES (?, 'list', NULL)", (name,)
+                )
+                row = ('list', None)
+            kind, last = row
+            if last is None:
+                last = self._max_id(conn, name) if kind == 'list' else 0
+            first = max(last, floor) + 1
+            conn.execute("UPDATE _collections SET last_id = ? WHERE name = ?", (first + count - 1, name))
+            return first
+
+    def _max_id(self, conn: sqlite3.Connection, name: str) -> int:
+        self._ensure_table(conn, name)
+        row = conn.execute(
+            f"SELECT MAX(CAST(json_extract(doc, '$.id') AS INTEGER)) FROM {_table(name)} "
+            "WHERE json_type(doc, '$.id') IN ('integer', 'real')"
+        ).fetchone()
+        return row[0] or 0
+
+    def set_last_id(self, name: str, last_id: int):
+        with self._transaction() as conn:
+            conn.execute("UPDATE _collections SET last_id = ? WHERE name = ?", (last_id, name))
+
+
+class _Transaction:
+    """BEGIN/COMMIT bzw. ROLLBACK um einen with-Block."""
+
+    def __init__(self, conn: sqlite3.Connection, immediate: bool):
+        self.conn = conn
+        self.immediate = immediate
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute('BEGIN IMMEDIATE' if self.immediate else 'BEGIN')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def migrate(data_dir: str, db_path: str) -> Dict[str, int]:
+    """Übernimmt alle data/*.json-Dateien in die SQLite-Datenbank.
+
+    Bereits vorhandene Sammlungen werden überschrieben. Leere oder
+    beschädigte Dateien werden übersprungen. ID-Sequenzen aus
+    _sequences.json werden übernommen, alle übrigen beim ersten Zugriff
+    aus der höchsten ID initialisiert. Gibt die Anzahl der übernommenen
+    Einträge je Sammlung zurück.
+    """
+    engine = SqliteEngine(db_path)
+    migrated = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name.startswith('_'):
+            continue
+        try:
+            with open(path, 'rb') as f:
+                data = formats.decode(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Übersprungen: {name}.json ({e})")
+            continue
+        engine.write(name, data)
+        migrated[name] = len(data) if isinstance(data, list) else 1
+        print(f"Migriert: {name}.json ({migrated[name]} Einträge)")
+
+    try:
+        with open(os.path.join(data_dir, '_sequences.json'), 'r', encoding='utf-8') as f:
+            sequences = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        sequences = {}
+    for name, last_id in sequences.items():
+        if name in migrated and isinstance(last_id, int):
+            engine.set_last_id(name, last_id)
+    return migrated
+
+
+def main(argv=None):
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    default_data_dir = os.path.join(base_dir, 'data')
+
+    parser = argparse.ArgumentParser(description="HelpTool SQLite-Speicher")
+    sub = parser.add_subparsers(dest='command', required=True)
+    cmd = sub.add_parser('migrate', help="data/*.json in die SQLite-Datenbank übernehmen")
+    cmd.add_argument('--data-dir', default=default_data_dir)
+    cmd.add_argument('--db', default=None, help="Standard: <data-dir>/helptool.db")
+    args = parser.parse_args(argv)
+
+    db_path = args.db or os.path.join(args.data_dir, 'helptool.db')
+    migrated = migrate(args.data_dir, db_path)
+    print(f"{len(migrated)} Sammlungen nach {db_path} migriert")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,1054 @@
+"""
+Speicherschicht für die JSON-Sammlungen unter data/.
+
+Geparste Sammlungen werden im Prozess vorgehalten. Vor jeder Auslieferung
+wird per os.stat geprüft (mtime_ns, Größe, Inode), ob die Datei seit dem
+letzten Lesen verändert wurde - nur dann wird sie neu gelesen und geparst.
+save() schreibt die Datei und übernimmt die Daten direkt in den Cache.
+
+Geschrieben wird atomar (temporäre Datei, fsync, os.replace), Leser sehen
+also nie eine halb geschriebene Datei. Treffen mehrere Schreiber auf
+dieselbe Sammlung, werden ihre Änderungen zu einem Schreibvorgang
+zusammengefasst (Group Commit, höchstens HELPTOOL_GROUP_COMMIT_MS
+Millisekunden, Standard 20); jeder Schreiber kehrt erst zurück, wenn sein
+Stand auf dem Datenträger ist.
+
+Wichtig: load() liefert das gecachte Objekt selbst, keine Kopie. Wer eine
+geladene Sammlung verändert, muss sie anschließend mit save() speichern;
+reine Lese-Routen dürfen die Einträge nicht verändern.
+
+Das Dateiformat der JSON-Engine (eingerückt, kompakt oder binär mit
+Längenpräfix) wird je Sammlung konfiguriert, siehe formats.py.
+
+Die Ablage übernimmt eine Engine, ausgewählt über HELPTOOL_STORAGE_ENGINE:
+'json' (Standard, eine Datei pro Sammlung) oder 'sqlite' (siehe
+sqlite_store.py, Pfad über HELPTOOL_SQLITE_PATH). Einzelne Einträge
+werden mit insert_item/update_item/delete_item geschrieben; die
+SQLite-Engine schreibt dann nur die betroffene Zeile. commit_batch()
+speichert viele Änderungen mit einem einzigen Schreibvorgang.
+
+Für gecachte Listen wird zusätzlich ein Index id -> Position geführt
+(index_of/find_item), den insert_item, update_item und delete_item
+aktuell halten. Einzelabrufe per ID kommen so ohne lineare Suche aus.
+Sekundärindizes über Feldwerte (register_index, siehe indexes.py) werden
+ebenso nachgeführt; select() filtert und sortiert darüber, search.py
+führt so seinen Volltextindex.
+
+Neue IDs vergibt next_id() aus einer persistenten Sequenz je Sammlung
+(JSON: data/_sequences.json, SQLite: Spalte _collections.last_id). Die
+Sequenz wird beim ersten Zugriff einmalig aus der höchsten vorhandenen
+ID initialisiert; danach ist die Vergabe unabhängig von der Größe der
+Sammlung und durch eine Dateisperre auch zwischen Prozessen eindeutig.
+
+version(name) liefert eine monoton steigende Versionsnummer je Sammlung,
+ohne die Sammlung zu laden; etag() bildet daraus ETags für bedingte
+GET-Anfragen. Jede Änderung wird zusätzlich in feed gemeldet (Sammlung,
+ID, Operation, Version; siehe changefeed.py).
+
+Nebenläufigkeit: Jede Sammlung hat eine Leser/Schreiber-Sperre im Prozess
+und eine advisory Dateisperre (data/<name>.json.lock) für mehrere
+Worker-Prozesse. Lese-Routen serialisieren innerhalb von reading(),
+Änderungen laufen vollständig in transaction() ab:
+
+    with storage.transaction('tickets') as tickets:
+        ticket = {...}
+        ticket['id'] = storage.next_id('tickets', tickets)
+        storage.insert_item('tickets', tickets, ticket)
+"""
+import os
+import json
+import time
+import base64
+import shutil
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import formats
+from changefeed import ChangeFeed
+from indexes import IndexSpec, SecondaryIndex
+from locks import FileLock, RWLock
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+
+Signature = Tuple[int, ...]
+
+# Höchstens so lange (Sekunden) bleibt eine Gruppe von Schreibvorgängen
+# offen, bevor sie gemeinsam auf die Platte geschrieben wird.
+GROUP_COMMIT_WINDOW = float(os.environ.get('HELPTOOL_GROUP_COMMIT_MS', '20')) / 1000.0
+
+# Signatur gecachter Sammlungen, deren Stand noch nicht geschrieben ist
+_PENDING: Signature = (-1,)
+
+
+class JsonFileEngine:
+    """Eine JSON-Datei pro Sammlung; jede Änderung schreibt die ganze Datei."""
+
+    name = 'json'
+    # Schreibvorgänge werden in storage zu Gruppen zusammengefasst (_write_locked)
+    group_commit = True
+
+    def __init__(self, format_config: Optional[formats.FormatConfig] = None):
+        self.formats = format_config or formats.FormatConfig()
+
+    def signature(self, name: str) -> Optional[Signature]:
+        return _signature(collection_path(name))
+
+    def read(self, name: str) -> Tuple[Any, Optional[Signature]]:
+        path = collection_path(name)
+        with _file_locked(name, shared=True):
+            before = _signature(path)
+            with open(path, 'rb') as f:
+                data = formats.decode(f.read())
+        # Wurde die Datei während des Lesens ersetzt, wird nicht gecacht.
+        after = _signature(path)
+        return data, (after if before == after else None)
+
+    def encode(self, name: str, data: Any) -> bytes:
+        return formats.encode(data, self.formats.format_for(name))
+
+    def write(self, name: str, data: Any) -> Optional[Signature]:
+        return self.write_encoded(name, self.encode(name, data))
+
+    def write_encoded(self, name: str, raw: bytes) -> Optional[Signature]:
+        path = collection_path(name)
+        atomic_write(path, raw)
+        return _signature(path)
+
+    def insert(self, name: str, data: Any, item: Dict[str, Any]) -> Optional[Signature]:
+        return self.write(name, data)
+
+    def update(self, name: str, data: Any, item: Dict[str, Any]) -> Optional[Signature]:
+        return self.write(name, data)
+
+    def delete(self, name: str, data: Any, item: Dict[str, Any]) -> Optional[Signature]:
+        return self.write(name, data)
+
+    def allocate_id(self, name: str, seed: Callable[[], int], floor: int = 0, count: int = 1) -> int:
+        path = sequences_path()
+        with FileLock(path + '.lock'):
+            sequences = read_sequences()
+            last = sequences.get(name)
+            if last is None:
+                last = seed()
+            last = max(last, floor)
+            sequences[name] = last + count
+            # Ohne fsync: geht die Sequenz bei einem Absturz verloren, zieht
+            # next_id() sie über die Kollisionsprüfung wieder nach.
+            atomic_write(path, json.dumps(sequences, indent=2, sort_keys=True), durable=False)
+        return last + 1
+
+
+def atomic_write(path: str, content: Union[str, bytes], durable: bool = True):
+    """Schreibt content über eine temporäre Datei und os.replace nach path.
+
+    Leser sehen so immer entweder den alten oder den neuen vollständigen
+    Inhalt. Mit durable=True werden Datei und Verzeichnis vor bzw. nach dem
+    Umbenennen per fsync auf den Datenträger gebracht.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_dir(os.path.dirname(path))
+
+
+def _fsync_dir(directory: str):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # z.B. Windows: Verzeichnisse lassen sich nicht öffnen
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class _CacheEntry:
+    """Geparste Sammlung samt Signatur, (lazy) Primärschlüssel- und Sekundärindizes."""
+
+    __slots__ = ('data', 'signature', 'index', 'secondary')
+
+    def __init__(self, data: Any, signature: Signature):
+        self.data = data
+        self.signature = signature
+        self.index: Optional[Dict[Any, int]] = None
+        # Index-Name -> Index; None, wenn die Sammlung nicht indizierbar ist
+        self.secondary: Dict[str, Optional[SecondaryIndex]] = {}
+
+    def secondary_index(self, name: str, spec: IndexSpec) -> Optional[SecondaryIndex]:
+        if name not in self.secondary:
+            self.secondary[name] = spec.build(self.data) if isinstance(self.data, list) else None
+        return self.secondary[name]
+
+    def reindex(self, old_id: Any, item: Optional[Dict[str, Any]]):
+        """Sekundärindizes nach einer Änderung nachführen (item=None: gelöscht)."""
+        for name, index in list(self.secondary.items()):
+            if index is None:
+                continue
+            index.remove(old_id)
+            if item is not None and not index.add(item.get('id'), item):
+                # Doppelte ID: Index beim nächsten Zugriff neu aufbauen
+                del self.secondary[name]
+
+    def build_index(self) -> Dict[Any, int]:
+        index: Dict[Any, int] = {}
+        for pos, item in enumerate(self.data):
+            try:
+                item_id = item.get('id')
+                if item_id is not None:
+                    # Erster Treffer gewinnt - wie bei der bisherigen linearen Suche
+                    index.setdefault(item_id, pos)
+            except (AttributeError, TypeError):
+                continue
+        self.index = index
+        return index
+
+
+_cache: Dict[str, _CacheEntry] = {}
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+_engine: Any = JsonFileEngine()
+
+_collection_locks: Dict[str, RWLock] = {}
+_index_specs: Dict[str, Dict[str, IndexSpec]] = {}
+_held_file_locks = threading.local()
+
+
+class _Batch:
+    """Gemeinsamer Schreibvorgang einer Gruppe; wartende Schreiber hängen an event."""
+
+    __slots__ = ('event', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error: Optional[BaseException] = None
+
+
+class _GroupCommit:
+    """Noch nicht geschriebener Stand einer Sammlung (JSON-Engine).
+
+    Solange Schreiber auf die Sammlung warten, gibt der aktuelle Schreiber
+    die Sperre weiter, ohne selbst zu schreiben; die Dateisperre bleibt für
+    die ganze Gruppe gehalten. Der letzte Schreiber der Gruppe (oder der
+    erste nach GROUP_COMMIT_WINDOW) schreibt den zuletzt übergebenen Stand
+    einmal atomar mit fsync. Alle Schreiber der Gruppe kehren erst danach
+    zurück.
+    """
+
+    __slots__ = ('file_lock', 'pending', 'opened', 'batch')
+
+    def __init__(self):
+        self.file_lock: Optional[FileLock] = None
+        self.pending: Optional[bytes] = None
+        self.opened = 0.0
+        self.batch = _Batch()
+
+
+_groups: Dict[str, _GroupCommit] = {}
+
+# Gespeicherte Änderungen für /api/events
+feed = ChangeFeed()
+
+# JSON-Engine: Name -> [Version, Signatur der Datei zu dieser Version]
+_versions: Dict[str, List[Any]] = {}
+# Unterscheidet die Versionszähler verschiedener Prozessstarts im ETag
+_EPOCH = format(time.time_ns(), 'x')
+
+
+def configure(data_dir: str, engine: Optional[str] = None):
+    """Setzt Datenverzeichnis und Engine und leert den Cache.
+
+    Ohne Angabe wird die Engine aus HELPTOOL_STORAGE_ENGINE gelesen.
+    """
+    global DATA_DIR, _engine
+    DATA_DIR = data_dir
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+    engine = (engine or os.environ.get('HELPTOOL_STORAGE_ENGINE', 'json')).lower()
+    if engine == 'sqlite':
+        from sqlite_store import SqliteEngine
+        db_path = os.environ.get('HELPTOOL_SQLITE_PATH') or os.path.join(DATA_DIR, 'helptool.db')
+        _engine = SqliteEngine(db_path)
+    elif engine == 'json':
+        _engine = JsonFileEngine()
+    else:
+        raise ValueError(f"Unbekannte Speicher-Engine: {engine}")
+    invalidate()
+
+
+def engine_name() -> str:
+    """Name der aktiven Speicher-Engine."""
+    return _engine.name
+
+
+def collection_path(name: str) -> str:
+    """Pfad der JSON-Datei einer Sammlung."""
+    return os.path.join(DATA_DIR, f"{name}.json")
+
+
+def collection_lock(name: str) -> RWLock:
+    """Leser/Schreiber-Sperre einer Sammlung innerhalb des Prozesses."""
+    with _cache_lock:
+        lock = _collection_locks.get(name)
+        if lock is None:
+            lock = _collection_locks[name] = RWLock()
+        return lock
+
+
+def _held() -> Dict[str, int]:
+    held = getattr(_held_file_locks, 'names', None)
+    if held is None:
+        held = _held_file_locks.names = {}
+    return held
+
+
+@contextmanager
+def _file_locked(name: str, shared: bool = False) -> Iterator[None]:
+    """Dateisperre einer Sammlung; hält der Thread sie bereits, wird sie wiederverwendet."""
+    held = _held()
+    if name in held:
+        held[name] += 1
+        try:
+            yield
+        finally:
+            held[name] -= 1
+        return
+    with FileLock(collection_path(name) + '.lock', shared=shared):
+        held[name] = 1
+        try:
+            yield
+        finally:
+            del held[name]
+
+
+@contextmanager
+def _write_locked(name: str) -> Iterator[None]:
+    lock = collection_lock(name)
+    if not getattr(_engine, 'group_commit', False) or lock.is_write_locked_by_me():
+        with lock.write_locked(), _file_locked(name):
+            try:
+                yield
+            except BaseException:
+                # Schreiben fehlgeschlagen: gecachte Daten entsprechen nicht mehr der Ablage
+                invalidate(name)
+                raise
+        return
+
+    with _cache_lock:
+        group = _groups.setdefault(name, _GroupCommit())
+    held = _held()
+    batch = None
+    lock.acquire_write()
+    try:
+        if group.file_lock is None:
+            file_lock = FileLock(collection_path(name) + '.lock')
+            file_lock.__enter__()
+            group.file_lock = file_lock
+        pending = group.pending
+        held[name] = 1
+        try:
+            yield
+        except BaseException:
+            invalidate(name)
+            try:
+                # Der zuletzt übergebene Stand der Gruppe bleibt gültig
+                _flush(name, group)
+            except Exception as e:
+                print(f"Fehler beim Speichern von {name}: {e}")
+            raise
+        finally:
+            del held[name]
+
+        if group.pending is not pending:
+            batch = group.batch
+        if (group.pending is not None and lock.has_waiting_writers()
+                and time.monotonic() - group.opened < GROUP_COMMIT_WINDOW):
+            return  # der nächste Schreiber übernimmt die Gruppe
+        _flush(name, group)
+    finally:
+        lock.release_write()
+        if batch is not None:
+            batch.event.wait()
+            if batch.error is not None:
+                raise batch.error
+
+
+def _flush(name: str, group: _GroupCommit):
+    """Schreibt den offenen Stand einer Gruppe und gibt die Dateisperre frei."""
+    batch, raw = group.batch, group.pending
+    group.batch, group.pending = _Batch(), None
+    try:
+        if raw is not None:
+            signature = _engine.write_encoded(name, raw)
+            with _cache_lock:
+                entry = _cache.get(name)
+                if entry is not None and entry.signature is _PENDING:
+                    entry.signature = signature
+                state = _versions.get(name)
+                if state is not None and state[1] is _PENDING:
+                    state[1] = signature
+    except BaseException as e:
+        invalidate(name)
+        with _cache_lock:
+            if name in _versions:
+                _versions[name][1] = None
+        batch.error = e
+        raise
+    finally:
+        batch.event.set()
+        file_lock, group.file_lock = group.file_lock, None
+        if file_lock is not None:
+            file_lock.__exit__(None, None, None)
+
+
+def _commit(name: str, data: Any, op: str, item: Any = None) -> Optional[_CacheEntry]:
+    """Übergibt eine Änderung an die Engine und aktualisiert den Cache.
+
+    Bei der JSON-Engine wird nur der neue Stand kodiert; geschrieben wird
+    er gemeinsam mit der Gruppe beim Verlassen von _write_locked.
+    """
+    if getattr(_engine, 'group_commit', False):
+        group = _groups[name]
+        if group.pending is None:
+            group.opened = time.monotonic()
+        group.pending = _engine.encode(name, data)
+        with _cache_lock:
+            state = _versions.setdefault(name, [0, None])
+            state[0] += 1
+            state[1] = _PENDING
+        return _remember(name, data, _PENDING)
+    if op == 'write':
+        return _remember(name, data, _engine.write(name, data))
+    return _remember(name, data, getattr(_engine, op)(name, data, item))
+
+
+def sequences_path() -> str:
+    """Pfad der ID-Sequenzen der JSON-Engine."""
+    return os.path.join(DATA_DIR, '_sequences.json')
+
+
+def read_sequences() -> Dict[str, int]:
+    """Zuletzt vergebene ID je Sammlung (JSON-Engine)."""
+    try:
+        with open(sequences_path(), 'r', encoding='utf-8') as f:
+            sequences = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return sequences if isinstance(sequences, dict) else {}
+
+
+def _signature(path: str) -> Optional[Signature]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def load(name: str) -> Any:
+    """Lädt eine Sammlung aus dem Cache oder über die Engine.
+
+    Wirft FileNotFoundError bzw. json.JSONDecodeError wie json.load();
+    fehlende oder beschädigte Sammlungen werden nicht gecacht.
+    """
+    signature = _engine.signature(name)
+    with _cache_lock:
+        entry = _cache.get(name)
+        if entry is not None and (entry.signature is _PENDING
+                                  or (signature is not None and entry.signature == signature)):
+            _stats["hits"] += 1
+            return entry.data
+        _stats["misses"] += 1
+
+    data, signature = _engine.read(name)
+    if signature is not None:
+        with _cache_lock:
+            _cache[name] = _CacheEntry(data, signature)
+    return data
+
+
+def _remember(name: str, data: Any, signature: Optional[Signature]) -> Optional[_CacheEntry]:
+    with _cache_lock:
+        if signature is None:
+            _cache.pop(name, None)
+            return None
+        entry = _cache.get(name)
+        if entry is not None and entry.data is data:
+            entry.signature = signature
+        else:
+            entry = _CacheEntry(data, signature)
+            _cache[name] = entry
+        return entry
+
+
+def _entry_for(name: str, items: Any) -> Optional[_CacheEntry]:
+    """Cache-Eintrag, sofern items die gecachte Liste selbst ist."""
+    with _cache_lock:
+        entry = _cache.get(name)
+    if entry is None or entry.data is not items or not isinstance(items, list):
+        return None
+    return entry
+
+
+def index_of(name: str, items: List[Dict[str, Any]], item_id: Any) -> Optional[int]:
+    """Position des Eintrags mit der ID item_id in der geladenen Sammlung.
+
+    Für gecachte Listen über den Primärschlüssel-Index (O(1)), sonst per
+    linearer Suche.
+    """
+    entry = _entry_for(name, items)
+    if entry is None:
+        return next((i for i, item in enumerate(items) if item.get('id') == item_id), None)
+
+    try:
+        index = entry.index if entry.index is not None else entry.build_index()
+        pos = index.get(item_id)
+    except TypeError:
+        return None
+    if pos is not None and pos < len(items) and items[pos].get('id') == item_id:
+        return pos
+    if pos is None and len(index) == len(items):
+        return None
+    # Index passt nicht mehr zur Liste (z.B. direkt veränderte Liste): neu aufbauen
+    pos = entry.build_index().get(item_id)
+    return pos
+
+
+def find_item(name: str, items: List[Dict[str, Any]], item_id: Any) -> Optional[Dict[str, Any]]:
+    """Eintrag mit der ID item_id oder None."""
+    pos = index_of(name, items, item_id)
+    return items[pos] if pos is not None else None
+
+
+@contextmanager
+def reading(name: str, default: Callable[[], Any] = list) -> Iterator[Any]:
+    """Sammlung unter der Lesesperre; Leser blockieren sich nicht gegenseitig.
+
+    Die Antwort sollte innerhalb des Blocks serialisiert werden (jsonify),
+    damit kein Schreiber die Einträge währenddessen verändert. Fehlende oder
+    beschädigte Sammlungen liefern default().
+    """
+    with collection_lock(name).read_locked():
+        try:
+            data = load(name)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Warnung: {name} nicht gefunden oder beschädigt: {e}")
+            data = default()
+        yield data
+
+
+def preserve_corrupt(name: str) -> Optional[str]:
+    """Legt eine Kopie einer beschädigten Sammlungsdatei an, bevor sie überschrieben wird."""
+    path = collection_path(name)
+    backup = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+    try:
+        shutil.copy2(path, backup)
+    except OSError as e:
+        print(f"Fehler beim Sichern von {path}: {e}")
+        return None
+    print(f"Warnung: beschädigte Datei gesichert als {backup}")
+    return backup
+
+
+@contextmanager
+def transaction(name: str, default: Callable[[], Any] = list) -> Iterator[Any]:
+    """Lesen, Ändern und Schreiben einer Sammlung als atomare Einheit.
+
+    Hält die Schreibsperre im Prozess und die Dateisperre für andere
+    Worker; die Sammlung wird nach Erhalt der Sperren frisch validiert.
+    Bricht der Block mit einer Ausnahme ab, wird der Cache der Sammlung
+    verworfen, damit halb angewendete Änderungen nicht ausgeliefert werden.
+    Eine beschädigte Datei wird vor dem Überschreiben gesichert.
+    """
+    with _write_locked(name):
+        try:
+            data = load(name)
+        except FileNotFoundError as e:
+            print(f"Warnung: {name} nicht gefunden: {e}")
+            data = default()
+        except json.JSONDecodeError as e:
+            print(f"Warnung: {name} beschädigt: {e}")
+            if engine_name() == 'json':
+                preserve_corrupt(name)
+            data = default()
+        try:
+            yield data
+        except BaseException:
+            invalidate(name)
+            raise
+
+
+STREAM_BATCH = 256
+
+
+def iter_json(name: str, encode: Callable[[Any], str],
+              select: Optional[Callable[[Any], Any]] = None,
+              batch: int = STREAM_BATCH) -> Iterator[str]:
+    """Kodiert eine Liste stückweise als JSON-Array (für Streaming-Antworten).
+
+    Beim Start wird die Liste der Einträge unter der Lesesperre festgehalten
+    (nur Verweise, keine Kopie der Einträge); danach wird jeweils ein Stapel
+    von batch Einträgen unter der Lesesperre mit encode kodiert und
+    ausgegeben. Schreiber werden so nur für die Dauer eines Stapels
+    blockiert, nicht für die ganze Übertragung. select kann die geladenen
+    Daten vorher umformen (z.B. ensure_list); alles außer Listen wird als
+    Ganzes kodiert.
+    """
+    lock = collection_lock(name)
+    with reading(name) as data:
+        if select is not None:
+            data = select(data)
+        if isinstance(data, list):
+            snapshot = list(data)
+        else:
+            snapshot, whole = None, encode(data)
+    if snapshot is None:
+        yield whole
+        return
+
+    yield '['
+    for start in range(0, len(snapshot), batch):
+        with lock.read_locked():
+            chunk = ','.join(encode(item) for item in snapshot[start:start + batch])
+        yield chunk if start == 0 else ',' + chunk
+    yield ']'
+
+
+PAGE_LIMIT_DEFAULT = 50
+PAGE_LIMIT_MAX = 1000
+
+
+def encode_cursor(item_id: Any, pos: int) -> str:
+    """Undurchsichtiger Cursor hinter dem Eintrag item_id an Position pos."""
+    raw = json.dumps([item_id, pos], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Umkehrung von encode_cursor; wirft ValueError bei ungültigen Cursorn."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        item_id, pos = json.loads(raw.decode('utf-8'))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Ungültiger Cursor")
+    if not isinstance(pos, int) or pos < 0:
+        raise ValueError("Ungültiger Cursor")
+    return item_id, pos
+
+
+def page(name: str, limit: int = PAGE_LIMIT_DEFAULT, cursor: Optional[str] = None,
+         select: Optional[Callable[[Any], Any]] = None,
+         with_total: bool = False) -> Dict[str, Any]:
+    """Eine Seite einer Liste: {"items", "next_cursor"[, "total"]}.
+
+    Der Cursor verweist auf die ID des letzten gelieferten Eintrags und
+    wird über den Primärschlüssel-Index aufgelöst, bleibt also stabil,
+    wenn davor Einträge hinzukommen oder wegfallen. Wurde der Eintrag
+    selbst gelöscht, wird an seiner letzten Position fortgesetzt. Die
+    Einträge werden flach kopiert, damit sie außerhalb der Lesesperre
+    serialisiert werden können. Wirft ValueError bei ungültigem limit oder
+    Cursor und wenn die Sammlung keine Liste ist.
+    """
+    if limit < 1:
+        raise ValueError("limit muss mindestens 1 sein")
+    with reading(name) as data:
+        if select is not None:
+            data = select(data)
+        if not isinstance(data, list):
+            raise ValueError(f"{name} ist keine Liste")
+        return paginate_list(data, limit, cursor, with_total,
+                             lambda item_id: index_of(name, data, item_id))
+
+
+def paginate_list(items: List[Any], limit: int, cursor: Optional[str] = None,
+                  with_total: bool = False,
+                  locate: Optional[Callable[[Any], Optional[int]]] = None) -> Dict[str, Any]:
+    """Seite aus einer bereits geladenen oder gefilterten Liste (siehe page()).
+
+    locate bildet eine ID auf ihre Position in items ab (Standard: Suche
+    über ein Wörterbuch der IDs).
+    """
+    if limit < 1:
+        raise ValueError("limit muss mindestens 1 sein")
+    limit = min(limit, PAGE_LIMIT_MAX)
+    start = 0
+    if cursor:
+        item_id, hint = decode_cursor(cursor)
+        if locate is None:
+            positions = {}
+            for pos, item in enumerate(items):
+                if isinstance(item, dict):
+                    try:
+                        positions.setdefault(item.get('id'), pos)
+                    except TypeError:
+                        continue
+            locate = positions.get
+        try:
+            pos = locate(item_id) if item_id is not None else None
+        except TypeError:
+            pos = None
+        start = pos + 1 if pos is not None else min(hint + (item_id is None), len(items))
+    chunk = items[start:start + limit]
+    end = start + len(chunk)
+    result: Dict[str, Any] = {
+        "items": [dict(item) if isinstance(item, dict) else item for item in chunk],
+        "next_cursor": None,
+    }
+    if end < len(items) and chunk:
+        last = chunk[-1]
+        result["next_cursor"] = encode_cursor(
+            last.get('id') if isinstance(last, dict) else None, end - 1)
+    if with_total:
+        result["total"] = len(items)
+    return result
+
+
+def register_index(name: str, index_name: str, kind: str = 'hash',
+                   key: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                   normalize: Optional[Callable[[Any], Any]] = None,
+                   spec: Any = None):
+    """Meldet einen Sekundärindex einer Sammlung an (siehe indexes.py).
+
+    Der Index wird beim ersten select() aufgebaut und danach von
+    insert_item/update_item/delete_item nachgeführt. Statt kind/key/
+    normalize kann eine eigene Definition übergeben werden (z.B. der
+    Volltextindex aus search.py); sie braucht build(items), der gebaute
+    Index keys (ID -> Schlüssel), add(id, item) und remove(id).
+    """
+    with _cache_lock:
+        _index_specs.setdefault(name, {})[index_name] = spec or IndexSpec(index_name, kind, key, normalize)
+        entry = _cache.get(name)
+        if entry is not None:
+            entry.secondary.pop(index_name, None)
+
+
+def secondary_index(name: str, items: Any, index_name: str) -> Any:
+    """Angemeldeter Index der geladenen Sammlung items (innerhalb von reading()).
+
+    None, wenn items nicht die gecachte Liste ist oder die Sammlung nicht
+    indizierbar ist.
+    """
+    spec = _index_specs.get(name, {}).get(index_name)
+    if spec is None:
+        raise ValueError(f"Kein Index {index_name} für {name}")
+    entry = _entry_for(name, items)
+    return entry.secondary_index(index_name, spec) if entry is not None else None
+
+
+def select(name: str, equals: Optional[Dict[str, Any]] = None,
+           between: Optional[Dict[str, Tuple[Any, Any]]] = None,
+           order_by: Optional[str] = None, descending: bool = False) -> List[Dict[str, Any]]:
+    """Einträge einer Liste über ihre Sekundärindizes filtern und sortieren.
+
+    equals: {Index: Wert} (Gleichheit), between: {Index: (von, bis)}
+    (inklusive, None = offen), order_by: sortierter Index; Einträge ohne
+    Wert stehen am Ende. Ohne order_by bleibt die Reihenfolge der
+    Sammlung. Alle Namen müssen mit register_index angemeldet sein.
+    Liefert flache Kopien. Ist die Sammlung nicht indizierbar (fehlende
+    oder doppelte IDs), wird linear gesucht.
+    """
+    equals = equals or {}
+    between = between or {}
+    specs = _index_specs.get(name, {})
+    for index_name in list(equals) + list(between) + ([order_by] if order_by else []):
+        if index_name not in specs:
+            raise ValueError(f"Kein Index {index_name} für {name}")
+
+    with reading(name) as data:
+        if not isinstance(data, list):
+            return []
+        entry = _entry_for(name, data)
+        indexes = {}
+        if entry is not None:
+            for index_name in set(equals) | set(between) | ({order_by} if order_by else set()):
+                indexes[index_name] = entry.secondary_index(index_name, specs[index_name])
+        if entry is None or any(index is None for index in indexes.values()):
+            found = _select_scan(data, specs, equals, between, order_by, descending)
+        else:
+            found = _select_indexed(name, entry, indexes, equals, between, order_by, descending)
+        return [dict(item) for item in found]
+
+
+def _select_indexed(name, entry, indexes, equals, between, order_by, descending):
+    data = entry.data
+    positions = entry.index if entry.index is not None else entry.build_index()
+
+    def locate(item_id):
+        pos = positions.get(item_id)
+        if pos is None or pos >= len(data) or data[pos].get('id') != item_id:
+            return index_of(name, data, item_id)
+        return pos
+
+    def by_position(ids):
+        return [i for _, i in sorted((p, i) for p, i in ((locate(i), i) for i in ids) if p is not None)]
+
+    candidates: Optional[set] = None
+    ordered: Optional[List[Any]] = None
+    for index_name, value in sorted(equals.items(), key=lambda kv: len(indexes[kv[0]].keys)):
+        ids = indexes[index_name].equal(value)
+        candidates = ids if candidates is None else candidates & ids
+    for index_name, (low, high) in between.items():
+        spec = indexes[index_name].spec
+        low = spec.normalize(low) if low is not None else None
+        high = spec.normalize(high) if high is not None else None
+        ids = indexes[index_name].between(low, high)
+        if index_name == order_by and candidates is None and ordered is None:
+            ordered = ids
+        candidates = set(ids) if candidates is None else candidates & set(ids)
+
+    if order_by:
+        index = indexes[order_by]
+        if ordered is not None and len(ordered) == len(candidates):
+            result_ids = list(ordered)
+        elif candidates is None:
+            result_ids = index.sorted_ids + by_position(index.missing())
+        else:
+            keyed = by_position(i for i in candidates if index.keys.get(i) is not None)
+            keyed.sort(key=index.keys.__getitem__)
+            result_ids = keyed + by_position(i for i in candidates if index.keys.get(i) is None)
+        if descending:
+            with_key = [i for i in result_ids if index.keys.get(i) is not None]
+            result_ids = with_key[::-1] + result_ids[len(with_key):]
+    elif candidates is None:
+        return list(data)
+    else:
+        result_ids = by_position(candidates)
+    return [data[pos] for pos in map(locate, result_ids) if pos is not None]
+
+
+def _select_scan(data, specs, equals, between, order_by, descending):
+    def matches(item):
+        if not isinstance(item, dict):
+            return False
+        for index_name, value in equals.items():
+            spec = specs[index_name]
+            if value is None or spec.key_of(item) != spec.normalize(value):
+                return False
+        for index_name, (low, high) in between.items():
+            spec = specs[index_name]
+            key = spec.key_of(item)
+            if key is None:
+                return False
+            if low is not None and key < spec.normalize(low):
+                return False
+            if high is not None and key > spec.normalize(high):
+                return False
+        return True
+
+    found = [item for item in data if matches(item)]
+    if order_by:
+        spec = specs[order_by]
+        keyed = [item for item in found if spec.key_of(item) is not None]
+        keyed.sort(key=spec.key_of, reverse=descending)
+        found = keyed + [item for item in found if spec.key_of(item) is None]
+    return found
+
+
+def _publish(name: str, changes: List[Tuple[str, Any]]):
+    """Meldet Änderungen (op, ID) mit der aktuellen Version der Sammlung im Feed."""
+    current = version(name)
+    for op, item_id in changes:
+        feed.publish(name, item_id, op, current)
+
+
+def save(name: str, data: Any):
+    """Schreibt eine komplette Sammlung und aktualisiert den Cache."""
+    with _write_locked(name):
+        entry = _commit(name, data, 'write')
+        if entry is not None:
+            # Beliebige Änderungen möglich: Sekundärindizes neu aufbauen
+            entry.secondary = {}
+        _publish(name, [('write', None)])
+
+
+def insert_item(name: str, items: List[Dict[str, Any]], item: Dict[str, Any]):
+    """Hängt einen Eintrag an die (geladene) Sammlung an und speichert ihn."""
+    with _write_locked(name):
+        items.append(item)
+        entry = _commit(name, items, 'insert', item)
+        if entry is not None and entry.index is not None:
+            try:
+                entry.index.setdefault(item.get('id'), len(items) - 1)
+            except TypeError:
+                entry.index = None
+        if entry is not None and entry.secondary:
+            entry.reindex(None, item)
+        _publish(name, [('insert', item.get('id'))])
+
+
+def update_item(name: str, items: List[Dict[str, Any]], item: Dict[str, Any]):
+    """Speichert einen bereits in der Sammlung geänderten Eintrag."""
+    with _write_locked(name):
+        entry = _commit(name, items, 'update', item)
+        if entry is not None and entry.index is not None:
+            # Hat sich die ID geändert, wird der Index beim nächsten Zugriff neu aufgebaut
+            try:
+                pos = entry.index.get(item.get('id'))
+            except TypeError:
+                pos = None
+            if pos is None or items[pos] is not item:
+                entry.index = None
+        if entry is not None and entry.secondary:
+            item_id = item.get('id')
+            if any(index is not None and item_id not in index.keys
+                   for index in entry.secondary.values()):
+                # ID geändert: die alte ID ist unbekannt, Indizes neu aufbauen
+                entry.secondary = {}
+            else:
+                entry.reindex(item_id, item)
+        _publish(name, [('update', item.get('id'))])
+
+
+def delete_item(name: str, items: List[Dict[str, Any]], index: int) -> Dict[str, Any]:
+    """Entfernt den Eintrag an Position index und speichert die Löschung."""
+    with _write_locked(name):
+        removed = items.pop(index)
+        entry = _commit(name, items, 'delete', removed)
+        if entry is not None and entry.index is not None:
+            positions = entry.index
+            if positions.get(removed.get('id')) == index:
+                del positions[removed.get('id')]
+            # Nachfolgende Einträge rücken um eine Position auf
+            for key, pos in positions.items():
+                if pos > index:
+                    positions[key] = pos - 1
+            if len(positions) != len(items):
+                # Doppelte IDs: ein verdeckter Eintrag kann nachrücken
+                entry.index = None
+        if entry is not None and entry.secondary:
+            entry.reindex(removed.get('id'), None)
+        _publish(name, [('delete', removed.get('id'))])
+    return removed
+
+
+def commit_batch(name: str, items: List[Dict[str, Any]], changes: List[Tuple[str, Dict[str, Any]]]):
+    """Speichert mehrere bereits in items angewendete Änderungen auf einmal.
+
+    changes enthält je Änderung (op, Eintrag) mit op 'insert', 'update'
+    oder 'delete' (Eintrag: der entfernte Eintrag); IDs dürfen sich nicht
+    geändert haben. Die Sammlung wird einmal geschrieben, die
+    Sekundärindizes werden eintragsweise nachgeführt.
+    """
+    with _write_locked(name):
+        entry = _commit(name, items, 'write')
+        _publish(name, [(op, item.get('id')) for op, item in changes])
+        if entry is None:
+            return
+        # Positionen haben sich durch Löschungen verschoben: beim nächsten Zugriff neu aufbauen
+        entry.index = None
+        if entry.secondary:
+            for op, item in changes:
+                entry.reindex(None if op == 'insert' else item.get('id'), None if op == 'delete' else item)
+
+
+def max_id(items: Any) -> int:
+    """Höchste numerische ID einer Sammlung (0 bei leerer Sammlung)."""
+    if not isinstance(items, list):
+        return 0
+    return int(max((item.get('id') for item in items
+                    if isinstance(item, dict)
+                    and isinstance(item.get('id'), (int, float))
+                    and not isinstance(item.get('id'), bool)), default=0))
+
+
+def next_id(name: str, items: Optional[List[Dict[str, Any]]] = None) -> int:
+    """Vergibt die nächste ID einer Sammlung aus ihrer persistenten Sequenz.
+
+    Ist items (die geladene Sammlung) angegeben, wird die vergebene ID
+    über den Primärschlüssel-Index gegen die Sammlung geprüft. Ist sie dort
+    bereits belegt (etwa nach manuellen Änderungen an der Datei), wird die
+    Sequenz auf die höchste vorhandene ID vorgezogen.
+    """
+    return next_ids(name, 1, items)[0]
+
+
+def next_ids(name: str, count: int, items: Optional[List[Dict[str, Any]]] = None) -> List[int]:
+    """Vergibt count aufeinanderfolgende IDs mit einem Zugriff auf die Sequenz (wie next_id)."""
+    if count < 1:
+        return []
+
+    def seed() -> int:
+        if items is not None:
+            return max_id(items)
+        try:
+            return max_id(load(name))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+
+    first = _engine.allocate_id(name, seed, count=count)
+    if items is not None and any(index_of(name, items, first + i) is not None for i in range(count)):
+        first = _engine.allocate_id(name, seed, floor=max_id(items), count=count)
+    return list(range(first, first + count))
+
+
+def version(name: str) -> int:
+    """Monoton steigende Version einer Sammlung, ohne sie zu laden.
+
+    Jede Änderung über storage erhöht die Version. Bei der JSON-Engine wird
+    sie im Prozess gezählt und zusätzlich erhöht, wenn sich die Datei von
+    außen geändert hat (Signatur per os.stat); die SQLite-Engine führt sie
+    dauerhaft in _collections.version.
+    """
+    signature = _engine.signature(name)
+    if getattr(_engine, 'versioned', False):
+        return signature[0] if signature else 0
+    with _cache_lock:
+        state = _versions.get(name)
+        if state is None:
+            state = _versions[name] = [1, signature]
+        elif state[1] is not _PENDING and state[1] != signature:
+            state[0] += 1
+            state[1] = signature
+        return state[0]
+
+
+def etag(*names: str) -> str:
+    """Starkes ETag (ohne Anführungszeichen) aus den Versionen der Sammlungen.
+
+    Ohne Sammlungen nur Speicher und Epoche (für ETags aus anderen Quellen).
+    """
+    prefix = _engine.name if getattr(_engine, 'versioned', False) else f"{_engine.name}-{_EPOCH}"
+    if not names:
+        return prefix
+    return prefix + '-' + '.'.join(str(version(name)) for name in names)
+
+
+def invalidate(name: Optional[str] = None):
+    """Verwirft den Cache einer Sammlung (oder aller Sammlungen)."""
+    with _cache_lock:
+        if name is None:
+            _cache.clear()
+        else:
+            _cache.pop(name, None)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Trefferzähler des Sammlungs-Caches."""
+    with _cache_lock:
+        hits = _stats["hits"]
+        misses = _stats["misses"]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "engine": _engine.name,
+            "collections": sorted(_cache),
+        }
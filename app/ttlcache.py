@@ -0,0 +1,103 @@
+"""
+Ergebnis-Cache mit Ablaufzeit und Zusammenlegung gleichzeitiger Abfragen.
+
+fetch(key, compute) liefert ein gespeichertes Ergebnis, solange es jünger
+als ttl Sekunden ist. Sonst berechnet genau ein Thread es neu (single
+flight); weitere Threads, die während der Berechnung denselben Schlüssel
+anfragen, warten auf dieses Ergebnis statt selbst zu rechnen. Fehler
+werden an alle Wartenden weitergegeben und nicht gespeichert.
+
+Die Zähler (hits, misses, coalesced, errors) zeigen, wie viele Abfragen
+der Cache eingespart hat.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class _Flight:
+    """Eine laufende Berechnung, auf die weitere Abfragen warten können."""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class TTLCache:
+    """Schlüssel -> Ergebnis für ttl Sekunden, höchstens max_entries Einträge (LRU)."""
+
+    def __init__(self, ttl: float, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def fetch(self, key: Hashable, compute: Callable[[], Any],
+              ttl: Optional[float] = None) -> Tuple[Any, str]:
+        """Ergebnis zu key und seine Herkunft: 'hit', 'coalesced' oder 'miss'.
+
+        ttl überschreibt die Ablaufzeit für ein neu berechnetes Ergebnis;
+        bei 0 wird nichts gespeichert, gleichzeitige Abfragen werden aber
+        weiterhin zusammengelegt.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1], 'hit'
+                del self._entries[key]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, 'coalesced'
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            ttl = self.ttl if ttl is None else ttl
+            with self._lock:
+                del self._inflight[key]
+                if flight.error is not None:
+                    self._stats["errors"] += 1
+                elif ttl > 0:
+                    self._entries[key] = (time.monotonic() + ttl, flight.value)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+            flight.done.set()
+        return flight.value, 'miss'
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Verwirft das Ergebnis zu key (ohne Angabe: alle)."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries),
+                        inflight=len(self._inflight), ttl=self.ttl)
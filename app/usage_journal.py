@@ -0,0 +1,191 @@
+"""
+Append-only Journal für die Tool-Nutzung (NDJSON, eine Zeile pro Eintrag).
+
+Statt tool_usage_log.json bei jedem Tool-Start komplett zu lesen und neu
+zu schreiben, wird jeder Eintrag als einzelne Zeile an das aktive Segment
+angehängt. Ein Segment wird rotiert, sobald es größer als segment_bytes
+oder älter als segment_age Sekunden ist; es bleiben höchstens
+max_segments Segmente erhalten.
+
+Segmentdateien heißen <laufende Nummer>-<Unix-Zeit der Anlage>.jsonl.
+tail(n) liest die Segmente vom neuesten rückwärts und hört auf, sobald n
+Einträge gefunden sind - ältere Segmente werden nicht geladen.
+
+Mehrere Worker-Prozesse dürfen dasselbe Verzeichnis nutzen: Rotationen
+laufen unter einer Dateisperre und lesen das Verzeichnis vorher neu, so
+dass jeder Worker die Segmente der anderen übernimmt. Eine nach einem
+Absturz unvollständige letzte Zeile wird vor dem nächsten Eintrag mit
+einem Zeilenumbruch abgeschlossen.
+"""
+import os
+import json
+import time
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from locks import FileLock
+
+DEFAULT_SEGMENT_BYTES = 256 * 1024
+DEFAULT_SEGMENT_AGE = 24 * 60 * 60
+DEFAULT_MAX_SEGMENTS = 64
+
+
+class UsageJournal:
+    """Segmentiertes NDJSON-Journal mit O(1)-Anhängen."""
+
+    def __init__(self, directory: str, legacy_file: Optional[str] = None,
+                 segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 segment_age: float = DEFAULT_SEGMENT_AGE,
+                 max_segments: int = DEFAULT_MAX_SEGMENTS):
+        self.directory = directory
+        self.legacy_file = legacy_file
+        self.segment_bytes = segment_bytes
+        self.segment_age = segment_age
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._segments: Optional[List[Tuple[int, int]]] = None
+
+    # ------------------------------------------------------------------
+    # Segmente
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, segment: Tuple[int, int]) -> str:
+        return os.path.join(self.directory, f"{segment[0]:06d}-{segment[1]}.jsonl")
+
+    def _scan(self) -> List[Tuple[int, int]]:
+        segments = []
+        for filename in os.listdir(self.directory):
+            stem, ext = os.path.splitext(filename)
+            if ext != '.jsonl':
+                continue
+            try:
+                seq, created = stem.split('-', 1)
+                segments.append((int(seq), int(created)))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _rotation_lock(self) -> FileLock:
+        """Sperrt Anlage und Rotation der Segmente über Worker-Prozesse hinweg."""
+        return FileLock(os.path.join(self.directory, '.rotate.lock'))
+
+    def _ensure_ready(self) -> List[Tuple[int, int]]:
+        """Legt das Verzeichnis an und übernimmt einmalig das alte JSON-Log."""
+        if self._segments is not None:
+            return self._segments
+        os.makedirs(self.directory, exist_ok=True)
+        with self._rotation_lock():
+            self._segments = self._scan()
+            if not self._segments and self.legacy_file and os.path.exists(self.legacy_file):
+                try:
+                    with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"Warnung: {self.legacy_file} konnte nicht übernommen werden: {e}")
+                    entries = []
+                if isinstance(entries, list) and entries:
+                    self._write_lines(self._new_segment(), entries)
+        return self._segments
+
+    def _new_segment(self) -> Tuple[int, int]:
+        """Legt das nächste Segment an (nur unter _rotation_lock aufrufen)."""
+        seq = self._segments[-1][0] + 1 if self._segments else 1
+        segment = (seq, int(time.time()))
+        # Datei sofort anlegen, damit andere Worker das Segment beim Scannen sehen
+        open(self._segment_path(segment), 'a').close()
+        self._segments.append(segment)
+        while len(self._segments) > self.max_segments:
+            oldest = self._segments.pop(0)
+            try:
+                os.remove(self._segment_path(oldest))
+            except FileNotFoundError:
+                pass
+        return segment
+
+    def _due(self, segment: Tuple[int, int]) -> bool:
+        """Muss nach diesem Segment rotiert werden?"""
+        try:
+            size = os.path.getsize(self._segment_path(segment))
+        except FileNotFoundError:
+            # Von einem anderen Worker entfernt
+            return True
+        return size >= self.segment_bytes or time.time() - segment[1] >= self.segment_age
+
+    def _active_segment(self) -> Tuple[int, int]:
+        segments = self._ensure_ready()
+        if segments and not self._due(segments[-1]):
+            return segments[-1]
+        with self._rotation_lock():
+            # Ein anderer Worker hat eventuell schon rotiert: Verzeichnis neu lesen
+            self._segments = self._scan()
+            if self._segments and not self._due(self._segments[-1]):
+                return self._segments[-1]
+            return self._new_segment()
+
+    def _write_lines(self, segment: Tuple[int, int], entries: List[Dict[str, Any]]):
+        data = ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8')
+        with open(self._segment_path(segment), 'a+b') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    # Unvollständige letzte Zeile nach einem Absturz abschließen
+                    data = b'\n' + data
+            f.write(data)
+
+    # ------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # ------------------------------------------------------------------
+
+    def append(self, entry: Dict[str, Any]):
+        """Hängt einen Eintrag an das aktive Segment an."""
+        with self._lock:
+            self._write_lines(self._active_segment(), [entry])
+
+    def version(self) -> str:
+        """Kennung des Journalstands (neuestes Segment und seine Größe).
+
+        Ändert sich mit jedem Eintrag und jeder Rotation, auch wenn ein
+        anderer Worker geschrieben hat; Bestandteil des ETags von tail().
+        """
+        with self._lock:
+            self._ensure_ready()
+            segments = self._segments = self._scan()
+        if not segments:
+            return '0'
+        try:
+            size = os.path.getsize(self._segment_path(segments[-1]))
+        except FileNotFoundError:
+            size = 0
+        return f"{segments[-1][0]}.{size}"
+
+    def tail(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Die letzten limit Einträge, älteste zuerst."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            self._ensure_ready()
+            # Neu lesen: andere Worker können inzwischen rotiert haben
+            segments = self._segments = self._scan()
+
+        collected: List[Dict[str, Any]] = []
+        for segment in reversed(segments):
+            try:
+                with open(self._segment_path(segment), 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            except FileNotFoundError:
+                continue
+            chunk = []
+            for line in reversed(lines):
+                if len(collected) + len(chunk) >= limit:
+                    break
+                try:
+                    chunk.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Unvollständige letzte Zeile nach einem Absturz
+                    continue
+            collected.extend(chunk)
+            if len(collected) >= limit:
+                break
+        collected.reverse()
+        return collected
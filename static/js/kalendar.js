@@ -51,35 +51,38 @@ document.addEventListener('DOMContentLoaded', function() {
     const calendarEl = document.getElementById('fc-calendar');
     if (!calendarEl) return;
 
-    // Events laden und Kalender initialisieren
-    fetch('/api/termine')
-        .then(response => response.json())
-        .then(events => {
-            // Platzhalter entfernen
-            const placeholder = document.getElementById('calendar-placeholder');
-            if (placeholder) placeholder.remove();
+    // Platzhalter entfernen
+    const placeholder = document.getElementById('calendar-placeholder');
+    if (placeholder) placeholder.remove();
 
-            // FullCalendar initialisieren
-            const calendar = new FullCalendar.Calendar(calendarEl, {
-                initialView: 'dayGridMonth',
-                events: events.map(e => ({
+    // FullCalendar initialisieren; Termine je sichtbarem Zeitraum laden (?from=&to=)
+    const calendar = new FullCalendar.Calendar(calendarEl, {
+        initialView: 'dayGridMonth',
+        events: function(info, successCallback, failureCallback) {
+            const params = new URLSearchParams({
+                from: info.startStr.slice(0, 10),
+                to: info.endStr.slice(0, 10)
+            });
+            fetch('/api/termine?' + params)
+                .then(response => response.json())
+                .then(events => successCallback(events.map(e => ({
                     id: e.id,
                     title: e.title || e.name || 'Termin',
                     start: e.start || e.date,
                     end: e.end || e.date,
                     extendedProps: e
-                })),
-                dateClick: function(info) {
-                    showCalendarEventModal(info.dateStr);
-                }
-            });
-            calendar.render();
-            console.log('Kalender erfolgreich gerendert');
-        })
-        .catch(error => {
-            console.error('Fehler beim Laden der Termine:', error);
-            calendarEl.innerHTML = '<div style="color:red; text-align:center; padding:20px;">Fehler beim Laden der Termine</div>';
-        });
+                }))))
+                .catch(error => {
+                    console.error('Fehler beim Laden der Termine:', error);
+                    failureCallback(error);
+                });
+        },
+        dateClick: function(info) {
+            showCalendarEventModal(info.dateStr);
+        }
+    });
+    calendar.render();
+    console.log('Kalender erfolgreich gerendert');
 
     // Event-Speicher-Handler
     const saveBtn = document.getElementById('save-calendar-event-btn');
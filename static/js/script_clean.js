@@ -553,22 +553,78 @@
     }).format(now);
   }
 
+  function setConnectionStatus(online) {
+    if (!state.status) return;
+    state.status.textContent = online ? 'Online' : 'Offline';
+    state.status.classList.toggle('online', online);
+    state.status.classList.toggle('offline', !online);
+  }
+
   async function checkBackend() {
     if (!state.status) return;
     try {
       const response = await fetch('/api/system/info', { cache: 'no-store' });
-      if (response.ok) {
-        state.status.textContent = 'Online';
-        state.status.classList.remove('offline');
-        state.status.classList.add('online');
-      } else {
+      if (!response.ok) {
         throw new Error(`HTTP ${response.status}`);
       }
+      setConnectionStatus(true);
     } catch (error) {
-      state.status.textContent = 'Offline';
-      state.status.classList.remove('online');
-      state.status.classList.add('offline');
+      setConnectionStatus(false);
+    }
+  }
+
+  // Sammlung -> zwischengespeicherte Antworten bzw. Module, die bei Änderungen neu laden
+  const CHANGE_CACHE_KEYS = {
+    tools: ['tools', 'worksets_with_tools'],
+    worksets: ['worksets_with_tools'],
+    working_sets: ['worksets_with_tools'],
+    network_settings: ['network-settings'],
+    network_devices: ['network-devices'],
+    printers: ['printers']
+  };
+  const CHANGE_MODULES = {
+    tools: ['tools', 'worksets', 'working_sets'],
+    tickets: ['tickets'],
+    contacts: ['telefonbuch', 'termine'],
+    network: ['network_settings', 'network_devices', 'printers'],
+    faq: ['faq']
+  };
+  let refreshTimer = null;
+
+  function scheduleRefresh(collection) {
+    const watched = CHANGE_MODULES[state.activeModule] || [];
+    if (collection && !watched.includes(collection)) return;
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(() => {
+      // Nicht neu rendern, während bearbeitet wird (offener Dialog oder Eingabefeld)
+      const editing = document.querySelector('.ticket-modal-overlay')
+        || (state.content && state.content.contains(document.activeElement)
+            && ['INPUT', 'TEXTAREA', 'SELECT'].includes(document.activeElement.tagName));
+      if (!editing && state.activeModule) {
+        loadModule(state.activeModule);
+      }
+    }, 300);
+  }
+
+  function connectEvents() {
+    if (typeof EventSource === 'undefined') {
+      setInterval(checkBackend, 30000);
+      return;
     }
+    // Änderungen anderer Nutzer per Server-Sent Events; EventSource verbindet
+    // sich nach Abbrüchen selbst neu und setzt per Last-Event-ID fort
+    const source = new EventSource('/api/events');
+    source.onopen = () => setConnectionStatus(true);
+    source.onerror = () => setConnectionStatus(false);
+    source.addEventListener('change', event => {
+      const change = JSON.parse(event.data);
+      (CHANGE_CACHE_KEYS[change.module] || []).forEach(key => state.cache.delete(key));
+      scheduleRefresh(change.module);
+    });
+    source.addEventListener('reset', () => {
+      state.cache.clear();
+      scheduleRefresh(null);
+    });
   }
 
   function init() {
@@ -587,10 +643,10 @@
     loadModule('tools');
     
     setInterval(updateClock, 1000);
-    setInterval(checkBackend, 30000);
     
     updateClock();
     checkBackend();
+    connectEvents();
   }
 
   if (document.readyState === 'loading') {